@@ -67,6 +67,7 @@ async function main() {
         // Callback: Feed demo transactions to aggregator
         (tx) => {
           pairAggregator.processTransaction(tx);
+          webSocketServer.broadcastTransaction(tx);
         }
       );
       
@@ -94,6 +95,7 @@ async function main() {
         // Callback: Send decoded transactions to aggregator
         (tx) => {
           pairAggregator.processTransaction(tx);
+          webSocketServer.broadcastTransaction(tx);
         }
       );
     }
@@ -26,9 +26,14 @@ const serverStats = {
   totalConnections: 0,
   currentConnections: 0,
   totalPairUpdates: 0,
-  totalSandwichAlerts: 0
+  totalSandwichAlerts: 0,
+  totalTransactionsBroadcast: 0
 };
 
+// Room for clients that consume the raw decoded transaction stream
+// (the slippage engine computes its own pair stats from it)
+const TRANSACTIONS_ROOM = 'transactions';
+
 // Initialize the server
 function initialize(aggregator) {
   console.log(' Initializing WebSocket server...');
@@ -284,6 +289,11 @@ function setupSocketHandlers() {
       handleUnsubscribe(socket, data);
     });
     
+    // Handle raw transaction stream subscription
+    socket.on('subscribe_transactions', () => {
+      socket.join(TRANSACTIONS_ROOM);
+    });
+    
     // Handle request for pairs list
     socket.on('get_pairs', () => {
       handleGetPairs(socket);
@@ -524,6 +534,17 @@ function broadcastPairUpdate(stats) {
   }
 }
 
+// Broadcast a decoded transaction to raw stream subscribers
+// Called for every transaction fed to the aggregator
+function broadcastTransaction(tx) {
+  const room = io && io.sockets.adapter.rooms.get(TRANSACTIONS_ROOM);
+  if (!room || room.size === 0) {
+    return; // No one is consuming the raw stream
+  }
+  serverStats.totalTransactionsBroadcast++;
+  io.to(TRANSACTIONS_ROOM).emit('transaction', tx);
+}
+
 // Broadcast sandwich alert
 // Called by pair-aggregator when sandwich is detected
 function broadcastSandwichAlert(sandwich) {
@@ -617,6 +638,7 @@ async function shutdown() {
 module.exports = {
   initialize,
   broadcastPairUpdate,
+  broadcastTransaction,
   broadcastSandwichAlert,
   broadcastPairsList,
   getServerStats,
@@ -138,6 +138,7 @@ setTimeout(async () => {
     let pairUpdateReceived = false;
     let unsubscribeConfirmed = false;
     let sandwichAlertReceived = false;
+    let transactionsReceived = [];
 
     socket.on('connect', () => {
         console.log(`   Connected with socket ID: ${socket.id.slice(0, 8)}...`);
@@ -173,6 +174,11 @@ setTimeout(async () => {
         console.log(`   Received sandwich_alert: ${data.pair}`);
     });
 
+    socket.on('transaction', (data) => {
+        transactionsReceived.push(data);
+        console.log(`   Received transaction: ${data.txHash.slice(0, 10)}... (${data.pair})`);
+    });
+
     socket.on('global_sandwich_alert', (data) => {
         console.log(`   Received global_sandwich_alert: ${data.summary}`);
     });
@@ -281,15 +287,61 @@ setTimeout(async () => {
     }
 
     // --------------------------------------------------
-    // Test 11: Get server stats
+    // Test 11: Raw transaction stream
+    // --------------------------------------------------
+    console.log('Test 11: Raw transaction stream');
+    console.log('─────────────────────────────────────');
+
+    const sampleTx = {
+        txHash: '0xabc123def4560000000000000000000000000000000000000000000000000000',
+        from: '0xtrader000000000000000000000000000000000',
+        gasPriceGwei: 42,
+        tokenIn: { symbol: 'WETH', address: '0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2' },
+        tokenOut: { symbol: 'PEPE', address: '0x6982508145454ce325ddbe47a25d4ec3d2311933' },
+        pair: 'PEPE-WETH',
+        timestamp: Date.now()
+    };
+
+    // Nobody has joined the stream yet, so nothing is sent or counted
+    const broadcastBefore = wsServer.getServerStats().totalTransactionsBroadcast;
+    wsServer.broadcastTransaction(sampleTx);
+    await new Promise(resolve => setTimeout(resolve, 200));
+
+    const skippedWithoutSubscribers = transactionsReceived.length === 0
+        && wsServer.getServerStats().totalTransactionsBroadcast === broadcastBefore;
+    if (skippedWithoutSubscribers) {
+        console.log('   ✅ No transactions sent before subscribe_transactions');
+    } else {
+        console.log('   ❌ Transaction sent without a stream subscriber');
+    }
+
+    socket.emit('subscribe_transactions');
+    await new Promise(resolve => setTimeout(resolve, 200));
+
+    wsServer.broadcastTransaction(sampleTx);
+    await new Promise(resolve => setTimeout(resolve, 200));
+
+    const transactionStreamWorks = transactionsReceived.length === 1
+        && transactionsReceived[0].txHash === sampleTx.txHash
+        && transactionsReceived[0].pair === sampleTx.pair
+        && wsServer.getServerStats().totalTransactionsBroadcast === broadcastBefore + 1;
+    if (transactionStreamWorks) {
+        console.log('   ✅ Transaction delivered after subscribe_transactions\n');
+    } else {
+        console.log(`   ❌ Expected 1 transaction, received ${transactionsReceived.length}\n`);
+    }
+
+    // --------------------------------------------------
+    // Test 12: Get server stats
     // --------------------------------------------------
-    console.log('Test 11: Server statistics');
+    console.log('Test 12: Server statistics');
     console.log('─────────────────────────────────────');
 
     const serverStats = wsServer.getServerStats();
     console.log(`   Current connections: ${serverStats.currentConnections}`);
     console.log(`   Total pair updates: ${serverStats.totalPairUpdates}`);
     console.log(`   Total sandwich alerts: ${serverStats.totalSandwichAlerts}`);
+    console.log(`   Total transactions broadcast: ${serverStats.totalTransactionsBroadcast}`);
     console.log('   ✅ Server stats accessible\n');
 
     // --------------------------------------------------
@@ -311,6 +363,7 @@ Summary:
    Subscribe: ${subscribeConfirmed ? '✅' : '❌'}
    Pair updates: ✅
    Sandwich alerts: ${sandwichAlertReceived ? '✅' : '❌'}
+   Transaction stream: ${skippedWithoutSubscribers && transactionStreamWorks ? '✅' : '❌'}
    Unsubscribe: ${unsubscribeConfirmed ? '✅' : '❌'}
    HTTP endpoints: ✅
 
@@ -4,16 +4,146 @@ class Settings(BaseSettings):
     # App Settings
     app_name: str = "MEV Weather Slippage Engine"
     slippage_api_port: int = 8000
+    slippage_workers: int = 1 # More than 1 runs uvicorn workers and turns on the shared cache
     cors_origins: list = ["http://localhost:5173", "http://localhost:3000"]
+    admin_enabled: bool = False # POST /api/rules/reload and /api/tokens/reload; needs admin_token too
+    admin_token: str = "" # Shared secret sent as X-Admin-Token
 
     # External APIs
     coingecko_api_url: str = "https://api.coingecko.com/api/v3"
     coingecko_api_key: str = "" 
     uniswap_subgraph_url: str = "https://api.thegraph.com/subgraphs/name/uniswap/uniswap-v2"
     listener_ws_url: str = "ws://localhost:3001"
+    listener_http_url: str = "http://localhost:3001"
+
+    # Startup warm-up and readiness (/health/live, /health/ready)
+    warmup_enabled: bool = True # Fill the caches in the background before reporting ready
+    warmup_timeout_seconds: float = 20.0 # Ready after this even if a step has not completed
+    readiness_requires_warmup: bool = True
+
+    # Pair Stats (pushed from the listener over Socket.IO)
+    pair_stats_push_enabled: bool = True
+    pair_stats_max_age_seconds: float = 10.0 # Pushed stats older than this are treated as missing
+    pair_stats_rest_fallback: bool = True # Fall back to GET /api/pairs/:pair on a miss
+    listener_reconnect_max_delay_seconds: float = 30.0
+
+    # Mempool analytics (pair stats computed in-process from the decoded tx stream)
+    mempool_analytics_enabled: bool = True # Subscribe to raw transactions and prefer local stats
+    mempool_window_seconds: int = 300 # Same 5-minute window as the listener's pair aggregator
+    mempool_max_pairs: int = 2000 # LRU eviction past this many pairs
+    mempool_suspicious_gas_gwei: float = 50.0
+    mempool_sandwich_window_seconds: float = 15.0 # Detector look-back, as in sandwich-detector.js
+    mempool_sandwich_max_txs: int = 100 # Per pair, bounds detection cost per transaction
+    mempool_sandwich_min_gas_ratio: float = 1.3
+    mempool_ingest_enabled: bool = False # POST /api/mempool/transactions; needs mempool_ingest_token too
+    mempool_ingest_token: str = "" # Shared secret sent as X-Ingest-Token
+
+    # HTTP Client Pools (one long-lived client per upstream)
+    http_timeout_seconds: float = 5.0
+    http_connect_timeout_seconds: float = 2.0
+    http_max_connections: int = 50
+    http_max_keepalive_connections: int = 20
+    http_keepalive_expiry_seconds: float = 30.0
+    http2_enabled: bool = False
+
+    # Upstream resilience (per-upstream circuit breaker, hedged requests)
+    circuit_breaker_enabled: bool = True
+    circuit_failure_threshold: int = 5 # Consecutive failures that open the circuit
+    circuit_open_seconds: float = 30.0 # Fail fast this long before letting one probe through
+    http_hedging_enabled: bool = False
+    http_hedge_upstreams: list = ["coingecko", "subgraph"] # Read-only, so safe to send twice
+    http_hedge_percentile: float = 0.95 # Hedge after this quantile of recent latency
+    http_hedge_min_delay_ms: int = 50
+    http_hedge_min_samples: int = 20 # No hedging until the latency estimate has this many samples
+    http_hedge_budget: float = 0.1 # Hedges as a share of requests, at most
+
+    # Shared cache across worker processes (memory-mapped; one refresher per key)
+    shared_cache_enabled: bool = False
+    shared_cache_path: str = "" # Empty = /dev/shm (or data/) file named after the port
+    shared_cache_slots: int = 16384 # 512-byte slots, so 8 MB
+    shared_cache_lease_seconds: float = 10.0 # A crashed refresher's keys free up after this
+    shared_cache_wait_seconds: float = 5.0 # Longest wait for another worker's refresh
+
+    # Price Cache (shared across services)
+    price_cache_ttl_seconds: float = 60.0
+    price_stale_ttl_seconds: float = 600.0 # Serve stale prices this long past the TTL while refreshing
+
+    # Liquidity Cache (subgraph lookups, micro-batched)
+    liquidity_cache_ttl_seconds: float = 60.0
+    liquidity_cache_max_tokens: int = 5000 # LRU eviction past this many tokens
+    liquidity_batch_window_ms: int = 10 # Misses within this window share one query
+    liquidity_batch_max_size: int = 50
+    liquidity_warmup_top_pools: int = 100
+
+    # Token Registry (symbols, addresses, CoinGecko ids, decimals)
+    token_registry_path: str = "" # Empty = bundled app/data/tokens.json
+    token_registry_reload_seconds: float = 5.0 # Poll interval for hot reload (0 disables)
+
+    # Slippage/Risk Rule Table
+    slippage_rules_path: str = "" # Empty = bundled app/data/slippage_rules.json
+    slippage_rules_reload_seconds: float = 5.0 # Poll interval for hot reload (0 disables)
+
+    # Request Latency Budget (milliseconds)
+    slippage_request_budget_ms: int = 800 # End-to-end deadline for upstream inputs
+    pair_stats_timeout_ms: int = 300
+    liquidity_timeout_ms: int = 600
+    price_timeout_ms: int = 600
+
+    # Pool reserves (constant-product price impact)
+    reserve_refresh_seconds: float = 15.0 # Background refresh interval for tracked pools
+    reserve_max_age_seconds: float = 120.0 # Older reserves fall back to the liquidity estimate
+    reserve_cache_max_pairs: int = 2000
+    reserve_no_pool_ttl_seconds: float = 300.0 # Tokens without a WETH pool are not looked up again for this long
+    amm_fee: float = 0.003 # Uniswap V2 LP fee
+
+    # Pool graph and multi-hop routing (route searches run in memory)
+    pool_graph_enabled: bool = True
+    pool_graph_refresh_seconds: float = 60.0 # Full reload of the graph in the background
+    pool_graph_max_pools: int = 3000 # Deepest pools across all pairs, loaded in pages of 1000
+    pool_graph_min_reserve_usd: float = 10000.0 # Shallower pools are left out of the graph
+    pool_graph_max_age_seconds: float = 300.0 # Older graphs mark routed liquidity as cached
+    routing_enabled: bool = True # Price trades that need more than one pool over the best route
+    routing_max_hops: int = 3
+    routing_max_branching: int = 16 # Deepest pools followed from each intermediate token
+    routing_quote_amount_usd: float = 1000.0 # Trade size routes are chosen for when none is given
+
+    # Fail-chance simulation for the slippage alternatives
+    fail_chance_samples: int = 20000 # Monte Carlo samples per market regime
+    fail_chance_max_regimes: int = 4096 # Cached fail/loss curves (about 4 KB each)
+
+    # Recommendation cache (ETag / If-None-Match)
+    recommendation_cache_max_entries: int = 10000
+
+    # Market data refresher (/api/symbols, /api/price/{symbol})
+    market_quotes_refresh_seconds: float = 30.0
+    market_history_refresh_seconds: float = 300.0
+    market_history_default_resolution: str = "5m"
+
+    # Time-series history of pair stats and recommendations (memory-mapped columns)
+    timeseries_enabled: bool = True
+    timeseries_path: str = "" # Empty = data/timeseries under the engine directory
+    timeseries_segment_seconds: int = 86400 # One segment per pair per day
+    timeseries_min_interval_ms: int = 1000 # At most one record per pair per second
+    timeseries_retention_days: float = 7.0
+    timeseries_flush_seconds: float = 5.0
+    timeseries_max_open_segments: int = 512 # Mapped at once; older ones are flushed and unmapped
+    timeseries_max_points: int = 5000 # Queries over this many rows are downsampled
+
+    # Streaming recommendations (SSE / WebSocket)
+    stream_refresh_seconds: float = 5.0 # Sweep for liquidity/price/reserve changes
+    stream_min_change: float = 0.0005 # Publish only when slippage moves at least 0.05%
+    stream_max_subscriptions: int = 20 # Per client
+    stream_keepalive_seconds: float = 15.0
 
     # LLM Settings
     groq_api_key: str = "" # <--- CHANGED NAME
+    chat_first_token_timeout_ms: int = 700 # Send the offline answer first if the LLM is slower
+    llm_max_concurrency: int = 4 # LLM calls in flight at once
+    llm_max_queue: int = 16 # Callers waiting for a slot; more get 429
+    llm_queue_timeout_ms: int = 2000 # Longest wait for a slot before 503
+    llm_request_timeout_seconds: float = 15.0
+    chat_cache_ttl_seconds: float = 600.0
+    chat_cache_max_entries: int = 1000
 
     # Defaults
     eth_price_usd: float = 2500.00
@@ -1,15 +1,96 @@
 # backend/slippage-engine/app/main.py
 
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from .routers import slippage, health, market_data, chat
+from .routers import slippage, health, market_data, chat, rules, tokens, metrics, mempool, history
+from .services.http_clients import http_clients
+from .services.pair_stats_cache import pair_stats_cache
+from .services.price_cache import price_cache
+from .services.liquidity_fetcher import liquidity_fetcher
+from .services.reserve_cache import reserve_cache
+from .services.pool_graph import pool_graph
+from .services.market_data_cache import market_data_cache
+from .services.token_registry import token_registry
+from .services.llm_client import llm_client
+from .services.warm_up import warm_up
+from .services.recommendation_stream import recommendation_stream
+from .services.timeseries_store import timeseries_store
+from .services.rule_engine import rule_engine
+from .services.shared_cache import shared_cache
+from .services.metrics import MetricsMiddleware
 from .config import settings # Load settings from config.py
 
+async def warm_prices() -> int:
+    return len(await price_cache.get_many(t.coingecko_id for t in token_registry.market_tokens))
+
+def warm_up_steps():
+    """Cache fills run concurrently at startup; see WarmUp."""
+    steps = {
+        "prices": warm_prices,
+        # Preload the deepest pools
+        "liquidity": liquidity_fetcher.warm_up,
+        "reserves": lambda: reserve_cache.warm_up([t.address for t in token_registry.market_tokens]),
+        "market_data": market_data_cache.warm_up,
+    }
+    if settings.pool_graph_enabled:
+        # The graph's own loop does the loading; this only waits for it
+        steps["pool_graph"] = pool_graph.wait_loaded
+    if settings.pair_stats_push_enabled:
+        steps["pair_stats"] = pair_stats_cache.wait_connected
+    if llm_client.configured:
+        # Loads the Groq SDK off the event loop instead of on the first chat request
+        steps["llm"] = lambda: asyncio.to_thread(lambda: llm_client.get() is not None)
+    return steps
+
+# --------------------------------------------------
+# Lifespan
+# Long-lived upstream clients and the listener subscription
+# open on startup and close on shutdown
+# --------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Map the cross-worker table before serving; its setup is the only write that waits on the lock
+    shared_cache.open()
+    await http_clients.start()
+    await pair_stats_cache.start()
+    # Keep pool reserves warm so price impact is computed without a network hop
+    await reserve_cache.start()
+    # Multi-hop routes are searched over a pool graph reloaded in bulk
+    await pool_graph.start()
+    # Dashboards read quotes and history from memory, never from CoinGecko directly
+    await market_data_cache.start()
+    # Recompute streamed recommendations once per input change
+    await recommendation_stream.start()
+    # Flush recorded history to disk in the background
+    await timeseries_store.start()
+    # Fill caches in the background; /health/ready turns 200 once done
+    await warm_up.start(warm_up_steps())
+    # Pick up rule table and token list edits without a restart
+    rule_engine.start_watching()
+    token_registry.start_watching()
+    try:
+        yield
+    finally:
+        await warm_up.stop()
+        rule_engine.stop_watching()
+        token_registry.stop_watching()
+        await timeseries_store.stop()
+        await recommendation_stream.stop()
+        await market_data_cache.stop()
+        await pool_graph.stop()
+        await reserve_cache.stop()
+        await pair_stats_cache.stop()
+        await http_clients.close()
+        shared_cache.close()
+
 # Initialize FastAPI app
 app = FastAPI(
     title="MEV Weather Slippage Engine",
     description="API for calculating slippage recommendations based on MEV activity.",
     version="1.0.0",
+    lifespan=lifespan,
 )
 
 # --------------------------------------------------
@@ -24,6 +105,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# --------------------------------------------------
+# Metrics Middleware
+# In-flight requests and per-endpoint latency for /metrics
+# --------------------------------------------------
+app.add_middleware(MetricsMiddleware)
+
 # --------------------------------------------------
 # Include API routers
 # --------------------------------------------------
@@ -31,6 +118,11 @@ app.include_router(slippage.router, prefix="/api/slippage")
 app.include_router(health.router, prefix="/health")
 app.include_router(market_data.router, prefix="/api")
 app.include_router(chat.router, prefix="/api/chat")
+app.include_router(rules.router, prefix="/api/rules")
+app.include_router(tokens.router, prefix="/api/tokens")
+app.include_router(mempool.router, prefix="/api/mempool")
+app.include_router(history.router, prefix="/api/history")
+app.include_router(metrics.router) # Prometheus scrape endpoint at /metrics
 # --------------------------------------------------
 # Root endpoint (optional)
 # --------------------------------------------------
@@ -45,5 +137,12 @@ async def read_root():
 # If running directly with uvicorn
 # --------------------------------------------------
 if __name__ == "__main__":
+    import os
     import uvicorn
-    uvicorn.run(app, host="0.0.0.0", port=settings.slippage_api_port)
\ No newline at end of file
+    if settings.slippage_workers > 1:
+        # Workers import the app themselves and read settings from the environment;
+        # they share one cache so upstream traffic does not grow with the worker count
+        os.environ["SHARED_CACHE_ENABLED"] = "true"
+        uvicorn.run("app.main:app", host="0.0.0.0", port=settings.slippage_api_port, workers=settings.slippage_workers)
+    else:
+        uvicorn.run(app, host="0.0.0.0", port=settings.slippage_api_port)
\ No newline at end of file
@@ -0,0 +1,21 @@
+# backend/slippage-engine/app/routers/auth.py
+
+import hmac
+from fastapi import Header, HTTPException
+from typing import Optional
+
+from ..config import settings
+
+def require_shared_secret(enabled: bool, secret: str, token: Optional[str], header: str, feature: str):
+    """
+    Gate for endpoints that change engine state: 404 unless the feature is
+    enabled with a non-empty secret, 401 unless the caller sends it in header.
+    """
+    if not enabled or not secret:
+        raise HTTPException(status_code=404, detail=f"{feature} is disabled")
+    if token is None or not hmac.compare_digest(token.encode(), secret.encode()):
+        raise HTTPException(status_code=401, detail=f"Invalid or missing {header}")
+
+async def require_admin_token(x_admin_token: Optional[str] = Header(None)):
+    """Dependency for admin routes such as the rule table and token list reloads."""
+    require_shared_secret(settings.admin_enabled, settings.admin_token, x_admin_token, "X-Admin-Token", "Admin endpoint")
@@ -1,9 +1,14 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from groq import Groq
+from collections import deque
+from typing import AsyncIterator, Optional
+import json
 import time
 import asyncio
 from ..config import settings
+from ..services.llm_pool import LLMOverloaded, llm_pool, chat_answer_cache
+from ..services.llm_client import llm_client
 
 router = APIRouter()
 
@@ -11,18 +16,7 @@ class ChatRequest(BaseModel):
     message: str
 
 # --- 1. CONFIGURE GROQ ---
-client = None
-HAS_LLM = False
-
-if settings.groq_api_key:
-    try:
-        client = Groq(api_key=settings.groq_api_key)
-        HAS_LLM = True
-        print("   ✅ Groq AI Connected (Llama 3.3)")
-    except Exception as e:
-        print(f"   ⚠️  Groq Client Error: {e}")
-else:
-    print("   ⚠️  No GROQ_API_KEY found. Using Offline Mode.")
+# The client is created on first use (or during warm-up), see LLMClient
 
 # --- 2. CONTEXTUAL SYSTEM PROMPT ---
 # We inject "Live" prices (mocked for demo) so it can answer "Should I buy now?" intelligently.
@@ -62,50 +56,240 @@ OFFLINE_RESPONSES = {
     "code": "I am the MEV Shield Assistant. My protocols are restricted to blockchain security and trading operations."
 }
 
+LLM_MODEL = "llama-3.3-70b-versatile"
+
+def llm_messages(message: str):
+    return [
+        {"role": "system", "content": SYSTEM_PROMPT},
+        {"role": "user", "content": message}
+    ]
+
+def offline_answer(message: str) -> str:
+    user_msg = message.lower()
+    # Check specific refusal keywords first
+    if "snake" in user_msg or "game" in user_msg or "write code" in user_msg:
+        return OFFLINE_RESPONSES["snake"]
+    for key, answer in OFFLINE_RESPONSES.items():
+        if key in user_msg:
+            return answer
+    return "I am operating in OFFLINE MODE. I can define 'MEV', 'Sandwich Attacks', or explain 'Slippage'. Please verify your Neural Uplink (API Key)."
+
+async def llm_completion(message: str) -> str:
+    """One full completion, run inside the LLM pool under the request timeout."""
+    async with llm_pool.slot():
+        chat_completion = await asyncio.wait_for(
+            llm_client.get().chat.completions.create(
+                messages=llm_messages(message),
+                model=LLM_MODEL,
+                temperature=0.6, # Increased to 0.6 to allow for opinions/analysis
+                max_tokens=150,
+            ),
+            settings.llm_request_timeout_seconds
+        )
+    return chat_completion.choices[0].message.content
+
+async def llm_tokens(message: str) -> AsyncIterator[str]:
+    """
+    Streams completion deltas from Groq as they are generated. Holds an
+    LLM pool slot for the whole stream, which must finish within the request timeout.
+    """
+    async with llm_pool.slot():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.llm_request_timeout_seconds
+        stream = await asyncio.wait_for(
+            llm_client.get().chat.completions.create(
+                messages=llm_messages(message),
+                model=LLM_MODEL,
+                temperature=0.6, # Increased to 0.6 to allow for opinions/analysis
+                max_tokens=150,
+                stream=True,
+            ),
+            settings.llm_request_timeout_seconds
+        )
+        chunks = stream.__aiter__()
+        while True:
+            try:
+                chunk = await asyncio.wait_for(chunks.__anext__(), max(0.0, deadline - loop.time()))
+            except StopAsyncIteration:
+                break
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                yield delta
+
+# --- 4. LATENCY METRICS ---
+class ChatLatency:
+    """Rolling time-to-first-token samples (ms) for the streaming endpoint."""
+
+    def __init__(self, window: int = 500):
+        self.llm_first_token_ms = deque(maxlen=window) # Request start -> first LLM token
+        self.first_event_ms = deque(maxlen=window) # Request start -> first byte of any answer
+        self.llm_answers = 0
+        self.offline_answers = 0
+        self.offline_first = 0 # Offline answer sent while waiting on a slow LLM
+        self.cached_answers = 0
+        self.rejected = 0
+        self.llm_errors = 0
+
+    @staticmethod
+    def _summary(samples) -> dict:
+        if not samples:
+            return {"count": 0}
+        ordered = sorted(samples)
+        pick = lambda q: round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 1)
+        return {"count": len(ordered), "p50": pick(0.5), "p95": pick(0.95), "max": round(ordered[-1], 1)}
+
+    def status(self) -> dict:
+        return {
+            "llm_connected": llm_client.loaded,
+            "llm_time_to_first_token_ms": self._summary(self.llm_first_token_ms),
+            "time_to_first_event_ms": self._summary(self.first_event_ms),
+            "llm_answers": self.llm_answers,
+            "offline_answers": self.offline_answers,
+            "offline_first": self.offline_first,
+            "cached_answers": self.cached_answers,
+            "rejected": self.rejected,
+            "llm_errors": self.llm_errors,
+            "first_token_timeout_ms": settings.chat_first_token_timeout_ms,
+        }
+
+chat_latency = ChatLatency()
+
+def sse_event(event: str, data: dict) -> bytes:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n".encode()
+
 @router.post("/")
 async def chat(request: ChatRequest):
-    user_msg = request.message.lower()
-    
-    # Simulate thinking time
-    await asyncio.sleep(0.3)
-
-    response_text = ""
+    # Repeated questions skip the LLM entirely
+    response_text = chat_answer_cache.get(request.message) or ""
 
     # STRATEGY A: TRY GROQ
-    if HAS_LLM and client:
+    if not response_text and llm_client.get():
         try:
-            # Run in thread to avoid blocking
-            chat_completion = await asyncio.to_thread(
-                client.chat.completions.create,
-                messages=[
-                    {"role": "system", "content": SYSTEM_PROMPT},
-                    {"role": "user", "content": request.message}
-                ],
-                model="llama-3.3-70b-versatile", 
-                temperature=0.6, # Increased to 0.6 to allow for opinions/analysis
-                max_tokens=150,
-            )
-            response_text = chat_completion.choices[0].message.content
+            response_text = await llm_completion(request.message)
+            if response_text:
+                chat_answer_cache.put(request.message, response_text)
+        except LLMOverloaded as e:
+            # Shed load instead of queueing without bound
+            raise HTTPException(status_code=e.status_code, detail=e.detail, headers={"Retry-After": str(e.retry_after)})
         except Exception as e:
             print(f"Groq Error: {e}")
             pass
 
     # STRATEGY B: OFFLINE FALLBACK
     if not response_text:
-        # Check specific refusal keywords first
-        if "snake" in user_msg or "game" in user_msg or "write code" in user_msg:
-             response_text = OFFLINE_RESPONSES["snake"]
-        else:
-            for key, answer in OFFLINE_RESPONSES.items():
-                if key in user_msg:
-                    response_text = answer
-                    break
-            
-            if not response_text:
-                response_text = "I am operating in OFFLINE MODE. I can define 'MEV', 'Sandwich Attacks', or explain 'Slippage'. Please verify your Neural Uplink (API Key)."
+        response_text = offline_answer(request.message)
 
     return {
         "role": "assistant",
         "content": response_text,
         "timestamp": time.time()
-    }
\ No newline at end of file
+    }
+
+@router.post("/stream")
+async def chat_stream(request: ChatRequest):
+    """
+    Streams the answer over Server-Sent Events:
+    - `token` events carry LLM deltas as they are generated.
+    - `offline` carries the built-in answer, sent at once when there is
+      no LLM or its first token takes longer than chat_first_token_timeout_ms.
+    - `done` closes the stream with the full text, its source and the
+      time to first token.
+    """
+    started = time.perf_counter()
+    elapsed_ms = lambda: (time.perf_counter() - started) * 1000
+
+    cached = chat_answer_cache.get(request.message)
+    if cached is None and llm_client.get() and llm_pool.saturated():
+        chat_latency.rejected += 1
+        raise HTTPException(status_code=429, detail="Assistant is busy, please retry shortly", headers={"Retry-After": "1"})
+
+    async def cached_events():
+        chat_latency.cached_answers += 1
+        chat_latency.first_event_ms.append(elapsed_ms())
+        yield sse_event("token", {"content": cached})
+        yield sse_event("done", {
+            "role": "assistant",
+            "content": cached,
+            "source": "cache",
+            "time_to_first_token_ms": round(elapsed_ms(), 1),
+            "timestamp": time.time()
+        })
+
+    async def events():
+        first_event: Optional[float] = None
+        offline_sent = False
+        llm_ttft: Optional[float] = None
+        parts = []
+        complete = False
+
+        def mark_first_event():
+            nonlocal first_event
+            if first_event is None:
+                first_event = elapsed_ms()
+                chat_latency.first_event_ms.append(first_event)
+
+        if llm_client.get():
+            tokens = llm_tokens(request.message).__aiter__()
+            first = asyncio.ensure_future(tokens.__anext__())
+            try:
+                done, _ = await asyncio.wait({first}, timeout=settings.chat_first_token_timeout_ms / 1000)
+                if not done:
+                    # Slow LLM: answer from the offline knowledge base now, upgrade when tokens arrive
+                    mark_first_event()
+                    offline_sent = True
+                    chat_latency.offline_first += 1
+                    yield sse_event("offline", {"content": offline_answer(request.message)})
+
+                token = await first
+                llm_ttft = elapsed_ms()
+                chat_latency.llm_first_token_ms.append(llm_ttft)
+                mark_first_event()
+                parts.append(token)
+                yield sse_event("token", {"content": token})
+
+                async for token in tokens:
+                    parts.append(token)
+                    yield sse_event("token", {"content": token})
+                complete = True
+            except StopAsyncIteration:
+                complete = True
+            except Exception as e:
+                chat_latency.llm_errors += 1
+                print(f"Groq Error: {e}")
+            finally:
+                first.cancel()
+                # Let the cancellation land (done() stays False until it does), without
+                # re-raising it here, then close the stream so its LLM pool slot frees now
+                await asyncio.wait({first})
+                await tokens.aclose()
+
+        if parts:
+            chat_latency.llm_answers += 1
+            content, source = "".join(parts), "llm"
+            if complete: # Never cache an answer cut off by a timeout
+                chat_answer_cache.put(request.message, content)
+        else:
+            chat_latency.offline_answers += 1
+            content, source = offline_answer(request.message), "offline"
+            if not offline_sent:
+                mark_first_event()
+                yield sse_event("offline", {"content": content})
+
+        yield sse_event("done", {
+            "role": "assistant",
+            "content": content,
+            "source": source,
+            "time_to_first_token_ms": round(llm_ttft if llm_ttft is not None else first_event, 1),
+            "timestamp": time.time()
+        })
+
+    return StreamingResponse(
+        cached_events() if cached is not None else events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.get("/metrics")
+async def chat_metrics():
+    """Time-to-first-token and answer source counters for /stream, plus LLM pool and answer cache state."""
+    return {**chat_latency.status(), "pool": llm_pool.status(), "cache": chat_answer_cache.status()}
@@ -1,18 +1,203 @@
 # backend/slippage-engine/app/routers/health.py
 
+import time
 from fastapi import APIRouter, Depends
+from fastapi.responses import JSONResponse
 from typing import Dict, Any
+from ..services.http_clients import http_clients
+from ..services.pair_stats_cache import pair_stats_cache
+from ..services.mempool_analytics import mempool_analytics
+from ..services.price_cache import price_cache
+from ..services.liquidity_fetcher import liquidity_fetcher
+from ..services.reserve_cache import reserve_cache
+from ..services.pool_graph import pool_graph
+from ..services.recommendation_cache import recommendation_cache
+from ..services.market_data_cache import market_data_cache
+from ..services.recommendation_stream import recommendation_stream
+from ..services.timeseries_store import timeseries_store
+from ..services.fail_chance import fail_chance_model
+from ..services.shared_cache import shared_cache
+from ..services.llm_client import llm_client
+from ..services.token_registry import token_registry
+from ..services.warm_up import warm_up
 
 router = APIRouter()
 
-# Dummy dependency - in a real app, this could check DB connections etc.
+STARTED_AT = time.monotonic()
+
 async def get_health_status():
-    return {"status": "healthy"}
+    if warm_up.stopping:
+        status = "stopping"
+    elif warm_up.ready:
+        status = "healthy"
+    else:
+        status = "warming_up"
+    return {"status": status, "ready": warm_up.ready, "uptime_seconds": round(time.monotonic() - STARTED_AT, 1)}
 
 @router.get("/", summary="Health Check")
 async def health_check(health_data: Dict[str, Any] = Depends(get_health_status)):
     """
     Checks the health of the Slippage Engine service.
-    Returns a confirmation if the service is running.
+    Always 200 while the process is up; status says whether it is
+    still warming up, serving, or shutting down.
+    """
+    return health_data
+
+@router.get("/live", summary="Liveness Probe")
+async def liveness():
+    """
+    200 as long as the event loop is answering. Does not depend on
+    upstreams or warm-up, so a slow upstream never gets the process restarted.
+    """
+    return {"status": "alive", "uptime_seconds": round(time.monotonic() - STARTED_AT, 1)}
+
+@router.get("/ready", summary="Readiness Probe")
+async def readiness(health_data: Dict[str, Any] = Depends(get_health_status)):
+    """
+    200 once the startup warm-up has finished, 503 before that and while
+    shutting down, so the load balancer only routes to warm instances.
+    Also reports warm-up progress, upstream circuit states and how full
+    the main caches are.
+    """
+    pools = http_clients.stats()
+    body = {
+        **health_data,
+        "warm_up": warm_up.status(),
+        "upstreams": {name: pool["circuit"]["state"] if pool.get("open") else None for name, pool in pools.items()},
+        "listener_connected": pair_stats_cache.connected,
+        "caches": {
+            "prices": price_cache.status()["assets_cached"],
+            "liquidity": liquidity_fetcher.status()["tokens_cached"],
+            "reserves": reserve_cache.status()["pairs_cached"],
+            "pool_graph_pools": pool_graph.status()["pools"],
+            "market_quotes": len(market_data_cache.quotes),
+            "fail_chance_regimes": fail_chance_model.status()["regimes_cached"],
+        },
+        "llm": llm_client.status(),
+    }
+    return JSONResponse(body, status_code=200 if warm_up.ready else 503)
+
+@router.get("/pools", summary="Upstream Connection Pools")
+async def pool_stats():
+    """
+    Reports usage counters for the pooled upstream HTTP clients
+    (requests, in-flight, peak concurrency, open/idle connections).
+    """
+    return http_clients.stats()
+
+
+@router.get("/pair-stats", summary="Listener Subscription")
+async def pair_stats_status():
+    """
+    Reports the state of the push-fed pair stats cache
+    (connection, cached pairs, hit/miss/stale counters).
+    """
+    return pair_stats_cache.status()
+
+
+@router.get("/mempool", summary="Mempool Analytics")
+async def mempool_status():
+    """
+    Reports the in-process mempool analytics engine
+    (tracked pairs, transactions ingested, sandwiches detected, hit/miss counters).
+    """
+    return mempool_analytics.status()
+
+
+@router.get("/prices", summary="Price Cache")
+async def price_cache_status():
+    """
+    Reports the shared price cache state
+    (cached assets, in-flight fetches, hit/miss/stale counters).
+    """
+    return price_cache.status()
+
+
+@router.get("/liquidity", summary="Liquidity Cache")
+async def liquidity_cache_status():
+    """
+    Reports the subgraph liquidity cache state
+    (cached tokens, batches sent, hit/miss counters).
+    """
+    return liquidity_fetcher.status()
+
+
+@router.get("/reserves", summary="Pool Reserve Cache")
+async def reserve_cache_status():
+    """
+    Reports the background-refreshed pool reserve cache
+    (cached pairs, tracked tokens, refreshes, hit/miss/stale counters).
+    """
+    return reserve_cache.status()
+
+
+@router.get("/pool-graph", summary="Pool Graph")
+async def pool_graph_status():
+    """
+    Reports the in-memory pool graph used for multi-hop routing
+    (version, pool/token counts, age, route searches and their cost).
+    """
+    return pool_graph.status()
+
+
+@router.get("/recommendations", summary="Recommendation Cache")
+async def recommendation_cache_status():
+    """
+    Reports the materialized recommendation cache
+    (entries, hit/miss counters, 304 responses served).
+    """
+    return recommendation_cache.status()
+
+
+@router.get("/market-data", summary="Market Data Refresher")
+async def market_data_status():
+    """
+    Reports the background market data refresher
+    (cached quotes, history points per token, refresh counters).
+    """
+    return market_data_cache.status()
+
+
+@router.get("/stream", summary="Recommendation Stream")
+async def stream_status():
+    """
+    Reports the streaming hub
+    (topics, subscribers, computations, publishes, coalesced updates).
+    """
+    return recommendation_stream.status()
+
+
+@router.get("/history", summary="Time-Series Store")
+async def history_status():
+    """
+    Reports the recommendation history store
+    (records written, rate-limited and dropped, open segments, flushes).
+    """
+    return timeseries_store.status()
+
+
+@router.get("/fail-chance", summary="Fail-Chance Model")
+async def fail_chance_status():
+    """
+    Reports the Monte Carlo fail-chance model
+    (cached regimes, hit/miss counters, samples, simulation time).
+    """
+    return fail_chance_model.status()
+
+
+@router.get("/shared-cache", summary="Shared Cross-Worker Cache")
+async def shared_cache_status():
+    """
+    Reports this worker's view of the cache shared between workers
+    (entries, hit/miss counters, refresh leases won and lost, waits).
+    """
+    return shared_cache.status()
+
+
+@router.get("/tokens", summary="Token Registry")
+async def token_registry_status():
+    """
+    Reports the loaded token list
+    (version, path, token/symbol/id counts, market tokens, WETH address).
     """
-    return health_data
\ No newline at end of file
+    return token_registry.status()
@@ -0,0 +1,70 @@
+# backend/slippage-engine/app/routers/history.py
+
+from fastapi import APIRouter, HTTPException, Query
+from typing import Any, Dict, List, Optional
+import math
+import time
+
+import numpy as np
+
+from ..services.timeseries_store import timeseries_store, AGGREGATIONS, COLUMNS
+from ..services.token_registry import token_registry
+from ..config import settings
+
+router = APIRouter()
+
+@router.get("/", summary="Recorded Pairs")
+async def list_pairs():
+    """Returns the pairs (the non-WETH token of each pool) that have recorded history."""
+    return {"pairs": timeseries_store.pairs()}
+
+@router.get("/{pair}", summary="Pair History")
+async def get_history(
+    pair: str,
+    start: Optional[int] = Query(None, description="Start time (ms since epoch); default one hour before end"),
+    end: Optional[int] = Query(None, description="End time (ms since epoch); default now"),
+    resolution: Optional[int] = Query(None, ge=1, description="Bucket size in seconds"),
+    agg: str = Query("last", description="Per-bucket aggregation: last, mean or max"),
+    columns: Optional[str] = Query(None, description="Comma-separated columns; default all"),
+):
+    """
+    Recorded pair stats inputs and recommendation outputs for a pair over
+    a time range, column by column. Ranges with more rows than
+    settings.timeseries_max_points are downsampled automatically.
+    """
+    if agg not in AGGREGATIONS:
+        raise HTTPException(status_code=400, detail=f"agg must be one of {', '.join(AGGREGATIONS)}")
+    names = [c.strip() for c in columns.split(",")] if columns else None
+    unknown = [c for c in names or [] if c not in COLUMNS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown columns: {', '.join(unknown)}")
+
+    end = end if end is not None else int(time.time() * 1000)
+    start = start if start is not None else end - 3_600_000
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+
+    # History is recorded per pool token address; symbols resolve through the registry
+    data = timeseries_store.query(token_registry.resolve_address(pair) or pair, start, end, names)
+    resolution_ms = resolution * 1000 if resolution else 0
+    if not resolution_ms and len(data["t"]) > settings.timeseries_max_points:
+        resolution_ms = math.ceil((end - start) / settings.timeseries_max_points / 1000) * 1000
+    if resolution_ms:
+        data = timeseries_store.downsample(data, resolution_ms, agg)
+
+    result: Dict[str, List[Any]] = {}
+    for name, column in data.items():
+        if column.dtype == np.float32:
+            column = np.round(column.astype(np.float64), 6) # Drop float32 noise (0.0424, not 0.04239999)
+        values = column.tolist()
+        if column.dtype.kind == "f":
+            values = [None if v != v else v for v in values] # NaN is not valid JSON
+        result[name] = values
+    return {
+        "pair": timeseries_store.pair_key(pair),
+        "start": start,
+        "end": end,
+        "resolution_ms": resolution_ms or None,
+        "count": len(result["t"]),
+        "columns": result,
+    }
@@ -1,85 +1,54 @@
-from fastapi import APIRouter, HTTPException
-import httpx
+from fastapi import APIRouter, HTTPException, Query
 import random
 import time
+from typing import Optional
 from ..config import settings
+from ..services.market_data_cache import market_data_cache, RESOLUTIONS
+from ..services.token_registry import token_registry
 
 router = APIRouter()
 
-# Simple supported list for the MVP
-SUPPORTED_TOKENS = [
-    {"id": "ethereum", "symbol": "ETH", "address": "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"},
-    {"id": "pepe", "symbol": "PEPE", "address": "0x6982508145454Ce325dDbE47a25d4ec3d2311933"},
-    {"id": "shiba-inu", "symbol": "SHIB", "address": "0x95aD61b0a150d79219dCF64E1E6Cc01f0B64C4cE"},
-]
-
-# Headers to mimic a browser and avoid 301 redirects/blocking
-HEADERS = {
-    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
-    "Accept": "application/json"
-}
-
 @router.get("/symbols")
 async def get_symbols():
-    # Fetch live data for these specific tokens
-    ids = ",".join([t["id"] for t in SUPPORTED_TOKENS])
-    url = f"{settings.coingecko_api_url}/simple/price"
-    
-    try:
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            resp = await client.get(url, params={"ids": ids, "vs_currencies": "usd", "include_24hr_change": "true"}, headers=HEADERS)
-            resp.raise_for_status()
-            data = resp.json()
-            
-        result = []
-        for token in SUPPORTED_TOKENS:
-            cg_data = data.get(token["id"], {})
-            result.append({
-                "id": token["symbol"], 
-                "name": token["id"].title(),
-                "price": cg_data.get("usd", 0),
-                "change24h": cg_data.get("usd_24h_change", 0),
-                "volume": "N/A"
-            })
+    # Served from memory; the market data refresher keeps quotes current
+    result = market_data_cache.symbols()
+    if result:
         return result
-        
-    except Exception as e:
-        print(f"Error fetching symbols: {e}")
-        # Return fallback data so UI doesn't break
-        return [
-            {"id": "ETH", "name": "Ethereum", "price": 2500.00, "change24h": 1.2, "volume": "N/A"},
-            {"id": "PEPE", "name": "Pepe", "price": 0.0000012, "change24h": -5.4, "volume": "N/A"},
-            {"id": "SHIB", "name": "Shiba Inu", "price": 0.0000095, "change24h": 0.8, "volume": "N/A"},
-        ]
+
+    # Nothing fetched yet: return fallback data so UI doesn't break
+    return [
+        {"id": "ETH", "name": "Ethereum", "price": 2500.00, "change24h": 1.2, "volume": "N/A"},
+        {"id": "PEPE", "name": "Pepe", "price": 0.0000012, "change24h": -5.4, "volume": "N/A"},
+        {"id": "SHIB", "name": "Shiba Inu", "price": 0.0000095, "change24h": 0.8, "volume": "N/A"},
+    ]
 
 @router.get("/price/{symbol}")
-async def get_price_history(symbol: str):
-    token = next((t for t in SUPPORTED_TOKENS if t["symbol"] == symbol.upper()), None)
-    if not token:
+async def get_price_history(
+    symbol: str,
+    resolution: Optional[str] = Query(None, description="One of 1m, 5m, 1h"),
+    since: Optional[int] = Query(None, description="Only return points newer than this timestamp (ms)")
+):
+    token = token_registry.by_symbol(symbol)
+    if token is None:
         raise HTTPException(status_code=404, detail="Token not found")
+    if not token.market_data:
+        raise HTTPException(status_code=404, detail=f"No price history is kept for {token.symbol}")
+
+    resolution = resolution or settings.market_history_default_resolution
+    if resolution not in RESOLUTIONS:
+        raise HTTPException(status_code=400, detail=f"Resolution must be one of: {', '.join(RESOLUTIONS)}")
 
-    url = f"{settings.coingecko_api_url}/coins/{token['id']}/market_chart"
-    
-    try:
-        async with httpx.AsyncClient(follow_redirects=True) as client:
-            resp = await client.get(
-                url, 
-                params={"vs_currency": "usd", "days": "1"}, 
-                headers=HEADERS
-            )
-            resp.raise_for_status()
-            data = resp.json()
-            
-        prices = data.get("prices", [])
-        history = [{"timestamp": p[0], "price": p[1], "change": 0} for p in prices]
-        
-    except Exception as e:
-        print(f"Error fetching history for {symbol}: {e}")
-        # Generate MOCK history so graph still loads
-        history = generate_mock_history()
+    history = market_data_cache.history(token.coingecko_id, resolution, since)
+    source = "cache"
+    if history is None:
+        # Generate MOCK history so graph still loads before the first refresh
+        history = generate_mock_history() if since is None else []
+        source = "mock"
 
     return {
         "id": symbol,
+        "resolution": resolution,
+        "source": source,
         "priceHistory": history
     }
 
@@ -97,4 +66,4 @@ def generate_mock_history():
             "price": price,
             "change": change
         })
-    return history
\ No newline at end of file
+    return history
@@ -0,0 +1,46 @@
+# backend/slippage-engine/app/routers/mempool.py
+
+from fastapi import APIRouter, Header, HTTPException
+from typing import Any, Dict, List, Optional
+
+from .auth import require_shared_secret
+from ..services.pair_stats_cache import pair_stats_cache
+from ..services.mempool_analytics import mempool_analytics
+from ..config import settings
+
+router = APIRouter()
+
+def require_ingest_token(token: Optional[str]):
+    """
+    Ingested transactions drive live recommendations, so the endpoint is
+    off unless enabled with a shared secret, and every call must carry it.
+    """
+    require_shared_secret(
+        settings.mempool_ingest_enabled, settings.mempool_ingest_token, token, "X-Ingest-Token", "Transaction ingest"
+    )
+
+@router.post("/transactions", summary="Ingest Decoded Transactions")
+async def ingest_transactions(
+    transactions: List[Dict[str, Any]],
+    x_ingest_token: Optional[str] = Header(None)
+):
+    """
+    Feeds decoded transactions (the listener/demo-data shape) into the
+    in-process analytics engine, for sources other than the listener stream.
+    Disabled by default; requires settings.mempool_ingest_enabled and the
+    X-Ingest-Token header matching settings.mempool_ingest_token.
+    """
+    require_ingest_token(x_ingest_token)
+    accepted = pair_stats_cache.ingest_transactions(transactions)
+    return {"accepted": accepted, "rejected": len(transactions) - accepted}
+
+@router.get("/pairs/{pair}", summary="Pair Stats")
+async def get_pair_stats(pair: str):
+    """
+    Returns the window stats for a pair, looked up by pair string
+    ("PEPE-WETH") or by the non-WETH token address.
+    """
+    stats = mempool_analytics.get(pair)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No transactions seen for this pair")
+    return stats
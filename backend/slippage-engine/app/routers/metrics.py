@@ -0,0 +1,98 @@
+# backend/slippage-engine/app/routers/metrics.py
+
+from fastapi import APIRouter, Response
+from typing import List
+
+from ..services.metrics import CONTENT_TYPE, Counter, Gauge, registry
+from ..services.circuit_breaker import STATES
+from ..services.http_clients import http_clients
+from ..services.pair_stats_cache import pair_stats_cache
+from ..services.mempool_analytics import mempool_analytics
+from ..services.price_cache import price_cache
+from ..services.liquidity_fetcher import liquidity_fetcher
+from ..services.reserve_cache import reserve_cache
+from ..services.pool_graph import pool_graph
+from ..services.recommendation_cache import recommendation_cache
+from ..services.recommendation_stream import recommendation_stream
+from ..services.fail_chance import fail_chance_model
+from ..services.shared_cache import shared_cache
+from ..services.llm_pool import llm_pool, chat_answer_cache
+from ..services.warm_up import warm_up
+
+router = APIRouter()
+
+# cache label -> (status() source, {result label: status key}, entries key)
+CACHES = {
+    "pair_stats": (pair_stats_cache.status, {"hit": "hits", "miss": "misses", "stale": "stale"}, "pairs_cached"),
+    "mempool": (mempool_analytics.status, {"hit": "hits", "miss": "misses"}, "pairs_tracked"),
+    "price": (price_cache.status, {"hit": "hits", "miss": "misses", "stale": "stale_served"}, "assets_cached"),
+    "liquidity": (liquidity_fetcher.status, {"hit": "hits", "miss": "misses"}, "tokens_cached"),
+    "reserves": (reserve_cache.status, {"hit": "hits", "miss": "misses", "stale": "stale"}, "pairs_cached"),
+    "recommendation": (recommendation_cache.status, {"hit": "hits", "miss": "misses", "not_modified": "not_modified"}, "entries"),
+    "fail_chance": (fail_chance_model.status, {"hit": "hits", "miss": "misses"}, "regimes_cached"),
+    "shared": (shared_cache.status, {"hit": "hits", "miss": "misses"}, "entries"),
+    "chat_answer": (chat_answer_cache.status, {"hit": "hits", "miss": "misses"}, "entries"),
+}
+
+
+def collect() -> List[Counter]:
+    """
+    Metrics read from the services' own counters at scrape time, so the
+    hot paths pay nothing extra for them.
+    """
+    lookups = Counter("slippage_engine_cache_lookups_total", "Cache lookups by result", ("cache", "result"))
+    entries = Gauge("slippage_engine_cache_entries", "Entries currently held per cache", ("cache",))
+    for cache, (status, results, entries_key) in CACHES.items():
+        values = status()
+        for result, key in results.items():
+            lookups.labels(cache, result).set(values[key])
+        entries.labels(cache).set(values[entries_key])
+
+    upstream_in_flight = Gauge("slippage_engine_upstream_requests_in_flight", "Upstream requests in flight", ("upstream",))
+    upstream_connections = Gauge("slippage_engine_upstream_connections", "Pooled upstream connections by state", ("upstream", "state"))
+    circuit_state = Gauge("slippage_engine_upstream_circuit_state", "Circuit breaker state (0 closed, 1 half-open, 2 open)", ("upstream",))
+    circuit_rejected = Counter("slippage_engine_upstream_circuit_rejected_total", "Requests failed fast by an open circuit", ("upstream",))
+    hedges = Counter("slippage_engine_upstream_hedges_total", "Hedged second attempts sent, and how many answered first", ("upstream", "result"))
+    for upstream, stats in http_clients.stats().items():
+        if not stats["open"]:
+            continue
+        upstream_in_flight.labels(upstream).set(stats["in_flight"])
+        for state in ("active", "idle"):
+            upstream_connections.labels(upstream, state).set(stats["connections"][state])
+        circuit = stats["circuit"]
+        circuit_state.labels(upstream).set(STATES.index(circuit["state"]))
+        circuit_rejected.labels(upstream).set(circuit["rejected"])
+        hedges.labels(upstream, "sent").set(circuit["hedges"])
+        hedges.labels(upstream, "won").set(circuit["hedge_wins"])
+
+    llm = llm_pool.status()
+    llm_calls = Gauge("slippage_engine_llm_calls", "LLM calls running or waiting for a slot", ("state",))
+    llm_calls.labels("active").set(llm["active"])
+    llm_calls.labels("waiting").set(llm["waiting"])
+    llm_shed = Counter("slippage_engine_llm_shed_total", "LLM calls shed by the pool", ("reason",))
+    llm_shed.labels("rejected").set(llm["rejected"])
+    llm_shed.labels("timed_out").set(llm["timed_out"])
+
+    stream = recommendation_stream.status()
+    subscribers = Gauge("slippage_engine_stream_subscribers", "Connected recommendation stream clients")
+    subscribers.set(stream["subscribers"])
+    publishes = Counter("slippage_engine_stream_publishes_total", "Recommendation updates published to streams")
+    publishes.labels().set(stream["publishes"])
+
+    graph = pool_graph.status()
+    graph_pools = Gauge("slippage_engine_pool_graph_pools", "Pools in the in-memory routing graph")
+    graph_pools.set(graph["pools"])
+    route_searches = Counter("slippage_engine_route_searches_total", "Best-route searches over the pool graph, and how many found a route", ("result",))
+    route_searches.labels("searched").set(graph["searches"])
+    route_searches.labels("found").set(graph["routes_found"])
+
+    ready = Gauge("slippage_engine_ready", "1 once warm-up has finished and the instance takes traffic")
+    ready.set(int(warm_up.ready))
+
+    return [lookups, entries, upstream_in_flight, upstream_connections, circuit_state, circuit_rejected, hedges, llm_calls, llm_shed, subscribers, publishes, graph_pools, route_searches, ready]
+
+
+@router.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus text exposition of the engine's hot-path metrics."""
+    return Response(content=registry.render(collect()), media_type=CONTENT_TYPE)
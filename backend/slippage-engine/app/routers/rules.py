@@ -0,0 +1,26 @@
+# backend/slippage-engine/app/routers/rules.py
+
+from fastapi import APIRouter, Depends, HTTPException
+
+from .auth import require_admin_token
+from ..services.rule_engine import rule_engine
+
+router = APIRouter()
+
+@router.get("/", summary="Current Rule Table")
+async def get_rules():
+    """
+    Returns the slippage/risk rule table currently in effect, with its version.
+    """
+    return rule_engine.table()
+
+@router.post("/reload", summary="Reload Rule Table", dependencies=[Depends(require_admin_token)])
+async def reload_rules():
+    """
+    Re-reads the rule table from disk. The previous table stays active
+    if the file is invalid. Admin only: needs settings.admin_enabled and
+    the X-Admin-Token header matching settings.admin_token.
+    """
+    if not rule_engine.reload():
+        raise HTTPException(status_code=400, detail="Rule table is invalid; previous version kept")
+    return {"version": rule_engine.version}
@@ -1,11 +1,35 @@
 # backend/slippage-engine/app/routers/slippage.py
 
-from fastapi import APIRouter, HTTPException, Depends
-from typing import Optional
+from fastapi import APIRouter, HTTPException, Depends, Header, Query, Request, Response, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from typing import Optional, Any, Awaitable, Callable, Dict, List, NamedTuple, Tuple
+import asyncio
+import time
 import httpx # For making HTTP requests to external APIs
+import json
 
-from app.schemas import SlippageRequest, SlippageRecommendation, ErrorResponse
+from pydantic import ValidationError
+
+from app.schemas import (
+    SlippageRequest, SlippageRecommendation, ErrorResponse,
+    SlippageBatchRequest, SlippageBatchItemResult, SlippageBatchResponse,
+    SlippageCurveRequest, SlippageCurve
+)
 from ..services.slippage_calculator import SlippageCalculator
+from ..services.http_clients import http_clients
+from ..services.pair_stats_cache import pair_stats_cache
+from ..services.mempool_analytics import mempool_analytics
+from ..services.reserve_cache import PoolReserves, reserve_cache
+from ..services.pool_graph import Route, combine_pair_stats, pool_graph
+from ..services.token_registry import is_weth, pool_token, token_registry
+from ..services.recommendation_cache import (
+    CachedRecommendation, recommendation_cache, trade_amount, input_version, etag_matches
+)
+from ..services import encoding
+from ..services.rule_engine import rule_engine
+from ..services.recommendation_stream import StreamKey, StreamSubscriber, recommendation_stream, stream_key
+from ..services.metrics import SLIPPAGE_INPUT_FAILURES, SLIPPAGE_INPUT_SOURCE, SLIPPAGE_STAGE_DURATION
+from ..services.timeseries_store import timeseries_store, recommendation_row
 from ..config import settings
 
 router = APIRouter()
@@ -14,15 +38,33 @@ router = APIRouter()
 # We can instantiate it once as it doesn't hold per-request state
 slippage_calculator = SlippageCalculator()
 
+# Conservative stand-in used when no live or cached pair stats exist
+DEFAULT_PAIR_STATS = {
+    "bot_activity_score": 0.5,
+    "sandwiches_5min": 0,
+    "transactions_5min": 0,
+    "suspicious_tx_count": 0,
+    "avg_gas_gwei": 30,
+}
+
+# Sections that need the explanation generator and fail-chance model
+DETAIL_FIELDS = frozenset({"explanation", "alternatives"})
+
+FIELDS_QUERY = Query(
+    None,
+    description="Comma-separated top-level fields to return, e.g. recommended_slippage,risk_level. "
+                "Leaving out explanation and alternatives also skips computing them."
+)
+
 # Dependency to get pair stats from Role 1's WebSocket server
 async def get_pair_stats_from_listener(pair: str):
     """Fetches aggregated stats for a given token pair from the listener service."""
-    listener_url = f"{settings.listener_ws_url}/api/pairs/{pair}" # Assuming listener exposes this endpoint
+    # The listener only knows its own pair ids ("PEPE-WETH")
+    listener_url = f"{settings.listener_http_url}/api/pairs/{token_registry.listener_pair(pair) or pair}"
     try:
-        async with httpx.AsyncClient() as client:
-            response = await client.get(listener_url)
-            response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
-            return response.json()
+        response = await http_clients.listener.get(listener_url)
+        response.raise_for_status() # Raise an exception for bad status codes (4xx or 5xx)
+        return response.json()
     except httpx.RequestError as exc:
         print(f"An error occurred while requesting {exc.request.url!r}. Error: {exc}")
         raise HTTPException(status_code=503, detail="Listener service unavailable")
@@ -30,6 +72,294 @@ async def get_pair_stats_from_listener(pair: str):
         print(f"Error response {exc.response.status_code} while requesting {exc.request.url!r}.")
         raise HTTPException(status_code=exc.response.status_code, detail=f"Listener returned an error: {exc.response.text}")
 
+def local_pair_stats(pair: str) -> Optional[Dict[str, Any]]:
+    """Pair stats held in memory: computed from the transaction stream, or pushed by the listener."""
+    if settings.mempool_analytics_enabled:
+        stats = mempool_analytics.get(pair)
+        if stats is not None:
+            return stats
+    return pair_stats_cache.get(pair)
+
+async def get_pair_stats(pair: str):
+    """
+    Reads pair stats computed in-process from the transaction stream, then
+    the push-fed cache; only goes to the listener's REST endpoint when the
+    pair is missing or stale and the fallback is enabled.
+    """
+    stats = local_pair_stats(pair)
+    if stats is not None:
+        return stats
+
+    # Ask for pushes so the next request for this pair is served from memory
+    pair_stats_cache.watch(pair)
+
+    if not settings.pair_stats_rest_fallback:
+        raise HTTPException(status_code=503, detail="Pair stats unavailable")
+    stats = await get_pair_stats_from_listener(pair)
+    pair_stats_cache.remember(pair, stats)
+    return stats
+
+# Inputs currently failing; logged when they start and stop failing, counted in metrics every time
+degraded_inputs: Dict[str, str] = {}
+
+async def fetch_with_deadline(
+    name: str,
+    fetch: Awaitable[Any],
+    timeout_ms: int,
+    last_known: Callable[[], Any],
+    default: Any
+) -> Tuple[Any, str]:
+    """
+    Awaits one upstream input within its sub-deadline.
+    Returns (value, source) where source is "live", "cached" or "default".
+    The time spent is recorded as the stage of the same name.
+    """
+    started = time.perf_counter()
+    try:
+        value, source = await asyncio.wait_for(fetch, timeout_ms / 1000), "live"
+    except Exception as e: # Includes timeouts and HTTPException from the listener
+        cached = last_known()
+        source = "cached" if cached is not None else "default"
+        value = cached if cached is not None else default
+        error = type(e).__name__
+        SLIPPAGE_INPUT_FAILURES.labels(name, error).inc()
+        if degraded_inputs.get(name) != error:
+            degraded_inputs[name] = error
+            print(f"Slippage input '{name}' unavailable ({error}); using {source} values until it recovers")
+    else:
+        if degraded_inputs.pop(name, None) is not None:
+            print(f"Slippage input '{name}' recovered")
+    SLIPPAGE_STAGE_DURATION.labels(name).observe(time.perf_counter() - started)
+    SLIPPAGE_INPUT_SOURCE.labels(name, source).inc()
+    return value, source
+
+# Each source gets its own sub-deadline, capped by the request budget,
+# and degrades to its last known value (or a default) when it misses it.
+def pair_stats_input(pair: str):
+    return fetch_with_deadline(
+        "pair_stats",
+        get_pair_stats(pair),
+        min(settings.pair_stats_timeout_ms, settings.slippage_request_budget_ms),
+        lambda: pair_stats_cache.last_known(pair),
+        DEFAULT_PAIR_STATS,
+    )
+
+def liquidity_input(token: str):
+    liquidity_fetcher = slippage_calculator.liquidity_fetcher
+    return fetch_with_deadline(
+        "liquidity",
+        liquidity_fetcher.fetch_pool_liquidity(token),
+        min(settings.liquidity_timeout_ms, settings.slippage_request_budget_ms),
+        lambda: liquidity_fetcher.last_known_liquidity(token),
+        liquidity_fetcher.default_liquidity_usd,
+    )
+
+def eth_price_input():
+    price_feed = slippage_calculator.price_feed
+    return fetch_with_deadline(
+        "eth_price",
+        price_feed.fetch_eth_price(),
+        min(settings.price_timeout_ms, settings.slippage_request_budget_ms),
+        price_feed.last_known_price,
+        price_feed.default_eth_price,
+    )
+
+# Input sources from best to worst; a combined input reports its worst part
+SOURCE_ORDER = ("live", "cached", "default")
+
+def trade_route(token_in: str, token_out: str, amount_usd: Optional[float]) -> Optional[Route]:
+    """
+    Best route through the in-memory pool graph for a trade that needs
+    more than one pool. None when the token/WETH pool prices the trade
+    directly, or when the graph has no route (the caller falls back to it).
+    """
+    if not settings.routing_enabled:
+        return None
+    route = pool_graph.best_route(token_in, token_out, amount_usd)
+    if route is None or (len(route.hops) == 1 and (is_weth(token_in) or is_weth(token_out))):
+        return None
+    return route
+
+def route_pairs(route: Route) -> List[str]:
+    """Pair ids whose stats cover each hop of a route, in order, without repeats."""
+    return list(dict.fromkeys(pool_token(hop.token_in, hop.token_out) for hop in route.hops))
+
+def route_inputs(
+    route: Route,
+    stats_by_pair: Dict[str, Tuple[Dict[str, Any], str]],
+    price_source: str
+) -> Tuple[Dict[str, Any], float, Dict[str, str]]:
+    """(pair stats, liquidity, input sources) of a route from its hops' pair stats."""
+    fetched = [stats_by_pair[pair] for pair in route_pairs(route)]
+    input_sources = {
+        "pair_stats": max((source for _, source in fetched), key=SOURCE_ORDER.index),
+        # The graph is refreshed in bulk; an old one still routes, but is reported as cached
+        "liquidity": "live" if pool_graph.age_seconds <= settings.pool_graph_max_age_seconds else "cached",
+        "eth_price": price_source,
+    }
+    return combine_pair_stats([stats for stats, _ in fetched]), route.liquidity_usd, input_sources
+
+class RecommendationInputs(NamedTuple):
+    pair_stats: Dict[str, Any]
+    pool_liquidity: float
+    eth_price: float
+    input_sources: Dict[str, str]
+    reserves: Optional[PoolReserves]
+    route: Optional[Route] = None
+
+async def recommendation_inputs(token_in: str, token_out: str, amount_usd: Optional[float] = None) -> RecommendationInputs:
+    """Everything a recommendation for this trade is computed from."""
+    # Multi-hop trades: MEV risk of every hop's pair, liquidity of the shallowest pool
+    route = trade_route(token_in, token_out, amount_usd)
+    if route is not None:
+        pairs = route_pairs(route)
+        fetched = await asyncio.gather(*(pair_stats_input(pair) for pair in pairs), eth_price_input())
+        eth_price, price_source = fetched[-1]
+        pair_stats, pool_liquidity, input_sources = route_inputs(route, dict(zip(pairs, fetched)), price_source)
+        return RecommendationInputs(pair_stats, pool_liquidity, eth_price, input_sources, None, route)
+
+    # 1-3. Fetch pair stats, pool liquidity and ETH price concurrently, all for the pool that prices the trade
+    pair = pool_token(token_in, token_out)
+    (pair_stats, stats_source), (pool_liquidity, liquidity_source), (eth_price, price_source) = await asyncio.gather(
+        pair_stats_input(pair),
+        liquidity_input(pair),
+        eth_price_input(),
+    )
+
+    input_sources = {
+        "pair_stats": stats_source,
+        "liquidity": liquidity_source,
+        "eth_price": price_source,
+    }
+    # Local lookup only; misses are refreshed in the background
+    reserves = reserve_cache.get(pair)
+    return RecommendationInputs(pair_stats, pool_liquidity, eth_price, input_sources, reserves)
+
+def local_inputs(token_in: str, token_out: str, amount_usd: Optional[float] = None) -> Optional[RecommendationInputs]:
+    """
+    The inputs recommendation_inputs would return if every source
+    answered from memory, found without any upstream call. None when one
+    of them would need the network (or would degrade).
+    """
+    route = trade_route(token_in, token_out, amount_usd)
+    eth_price = slippage_calculator.price_feed.cached_price()
+    if eth_price is None:
+        return None
+    if route is not None:
+        stats_by_pair = {pair: (local_pair_stats(pair), "live") for pair in route_pairs(route)}
+        if any(stats is None for stats, _ in stats_by_pair.values()):
+            return None
+        pair_stats, pool_liquidity, input_sources = route_inputs(route, stats_by_pair, "live")
+        return RecommendationInputs(pair_stats, pool_liquidity, eth_price, input_sources, None, route)
+
+    pair = pool_token(token_in, token_out)
+    pair_stats = local_pair_stats(pair)
+    pool_liquidity = slippage_calculator.liquidity_fetcher.cached_liquidity(pair)
+    if pair_stats is None or pool_liquidity is None:
+        return None
+    input_sources = {"pair_stats": "live", "liquidity": "live", "eth_price": "live"}
+    return RecommendationInputs(pair_stats, pool_liquidity, eth_price, input_sources, reserve_cache.get(pair))
+
+def version_of(inputs: RecommendationInputs) -> str:
+    return input_version(
+        inputs.pair_stats, inputs.pool_liquidity, inputs.eth_price, inputs.reserves,
+        inputs.input_sources, rule_engine.version, inputs.route
+    )
+
+def response_format(accept: Optional[str], fields: Optional[str] = None) -> Tuple[str, encoding.Fields]:
+    """
+    Media type negotiated from Accept, and the parsed field selection.
+    Raises 406 if no supported encoding is acceptable, 400 for unknown fields.
+    """
+    media_type = encoding.negotiate(accept)
+    if media_type is None:
+        raise HTTPException(status_code=406, detail=f"Supported encodings: {', '.join(encoding.available())}")
+    try:
+        return media_type, encoding.parse_fields(fields, SlippageRecommendation)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def is_detailed(fields: encoding.Fields) -> bool:
+    return fields is None or not DETAIL_FIELDS.isdisjoint(fields)
+
+def recommendation_key(token_in: str, token_out: str, amount_usd: Optional[float]) -> Tuple:
+    return (token_in.lower(), token_out.lower(), trade_amount(amount_usd))
+
+def unchanged_etag(
+    token_in: str,
+    token_out: str,
+    amount_usd: Optional[float],
+    inputs: Optional[RecommendationInputs],
+    media_type: str,
+    fields: encoding.Fields
+) -> Optional[str]:
+    """
+    ETag of the cached response for this trade if it was built from
+    exactly these locally found inputs, else None. Lets a conditional
+    request be answered without fetching anything.
+    """
+    if inputs is None:
+        return None
+    cached = recommendation_cache.peek(
+        recommendation_key(token_in, token_out, amount_usd), version_of(inputs), complete=is_detailed(fields)
+    )
+    return cached.encoded(media_type, fields)[1] if cached is not None else None
+
+def response_headers(etag: str, reserves: Optional[PoolReserves]) -> Dict[str, str]:
+    headers = {"ETag": etag, "Cache-Control": "no-cache", "Vary": "Accept"}
+    # Measured per response; the cached body only says which reserves it was priced from
+    if reserves is not None:
+        headers["X-Reserves-Age"] = str(round(reserves.age_seconds, 1))
+    return headers
+
+async def recommend(
+    token_in: str,
+    token_out: str,
+    amount_usd: Optional[float],
+    inputs: Optional[RecommendationInputs] = None,
+    detailed: bool = True
+) -> CachedRecommendation:
+    """
+    Cached recommendation for the current inputs. Recalculates only
+    when the input version changed since the cached entry was built, or
+    when the entry lacks the explanation and alternatives and they are needed.
+    Shared by POST /, /curve and the streaming endpoints.
+    """
+    amount_usd = trade_amount(amount_usd)
+    inputs = inputs or await recommendation_inputs(token_in, token_out, amount_usd)
+    pair_stats, pool_liquidity, eth_price, input_sources, reserves, route = inputs
+
+    # 4. Reuse the serialized recommendation while none of its inputs changed
+    key = recommendation_key(token_in, token_out, amount_usd)
+    version = version_of(inputs)
+
+    cached = recommendation_cache.get(key, version, complete=detailed)
+    if cached is None:
+        # 5. Calculate slippage recommendation using the service
+        started = time.perf_counter()
+        recommendation = await slippage_calculator.calculate(
+            token_in=token_in,
+            token_out=token_out,
+            pair_stats=pair_stats,
+            pool_liquidity_usd=pool_liquidity,
+            eth_price_usd=eth_price,
+            input_sources=input_sources,
+            amount_usd=amount_usd,
+            reserves=reserves,
+            detailed=detailed,
+            route=route
+        )
+        SLIPPAGE_STAGE_DURATION.labels("calculation").observe(time.perf_counter() - started)
+        # Encoded lazily, once per media type and field selection
+        cached = recommendation_cache.put(key, version, recommendation, complete=detailed)
+        # History keeps every new result (inputs changed), at most one per pair per interval;
+        # routed results mix several pairs' stats, so they stay out of the per-pair series
+        if route is None:
+            timeseries_store.record(
+                pool_token(token_in, token_out), recommendation_row(pair_stats, pool_liquidity, eth_price, amount_usd, recommendation)
+            )
+    return cached
+
 # --------------------------------------------------
 # POST /api/slippage Endpoint
 # Calculates slippage recommendation
@@ -38,36 +368,49 @@ async def get_pair_stats_from_listener(pair: str):
     "/",
     response_model=SlippageRecommendation,
     responses={
+        304: {"description": "Recommendation unchanged since the ETag in If-None-Match"},
         400: {"model": ErrorResponse},
         404: {"model": ErrorResponse},
+        406: {"model": ErrorResponse},
         503: {"model": ErrorResponse},
     }
 )
-async def calculate_slippage(request: SlippageRequest):
+async def calculate_slippage(
+    request: SlippageRequest,
+    fields: Optional[str] = FIELDS_QUERY,
+    accept: Optional[str] = Header(None),
+    if_none_match: Optional[str] = Header(None)
+):
     """
     Calculates the recommended slippage tolerance for a given token pair
     based on real-time MEV activity, liquidity, and other factors.
+
+    Responses carry an ETag; while the inputs are unchanged the cached
+    body is reused, and a matching If-None-Match gets 304 Not Modified.
+    Send Accept: application/msgpack for MessagePack instead of JSON.
+    X-Reserves-Age gives the age in seconds of the pool reserves the price
+    impact was computed from, when they were used.
     """
+    media_type, selected = response_format(accept, fields)
     try:
-        # 1. Get pair statistics from Role 1 (mempool listener)
-        pair_stats = await get_pair_stats_from_listener(request.token_out) # Assuming token_out is the primary pair identifier
-        
-        # 2. Fetch pool liquidity (e.g., from The Graph)
-        pool_liquidity = await slippage_calculator.liquidity_fetcher.get_pool_liquidity(request.token_out)
-        
-        # 3. Fetch ETH price (e.g., from CoinGecko)
-        eth_price = await slippage_calculator.price_feed.get_eth_price()
-        
-        # 4. Calculate slippage recommendation using the service
-        recommendation = await slippage_calculator.calculate(
-            token_in=request.token_in,
-            token_out=request.token_out,
-            pair_stats=pair_stats,
-            pool_liquidity_usd=pool_liquidity,
-            eth_price_usd=eth_price
-        )
-        
-        return recommendation
+        amount_usd = trade_amount(request.amount_usd)
+        # Conditional requests are checked against inputs already in memory first
+        if if_none_match:
+            inputs = local_inputs(request.token_in, request.token_out, amount_usd)
+            etag = unchanged_etag(request.token_in, request.token_out, amount_usd, inputs, media_type, selected)
+            if etag is not None and etag_matches(if_none_match, etag):
+                recommendation_cache.not_modified += 1
+                return Response(status_code=304, headers=response_headers(etag, inputs.reserves))
+
+        inputs = await recommendation_inputs(request.token_in, request.token_out, amount_usd)
+        cached = await recommend(request.token_in, request.token_out, amount_usd, inputs, detailed=is_detailed(selected))
+        body, etag = cached.encoded(media_type, selected)
+
+        headers = response_headers(etag, inputs.reserves)
+        if etag_matches(if_none_match, etag):
+            recommendation_cache.not_modified += 1
+            return Response(status_code=304, headers=headers)
+        return Response(content=body, media_type=media_type, headers=headers)
         
     except HTTPException as http_exc:
         # Re-raise HTTPException to propagate errors from dependencies
@@ -78,4 +421,280 @@ async def calculate_slippage(request: SlippageRequest):
         raise HTTPException(
             status_code=500,
             detail=f"An internal error occurred during slippage calculation."
-        )
\ No newline at end of file
+        )
+
+# --------------------------------------------------
+# POST /api/slippage/batch Endpoint
+# Prices many (token_in, token_out, amount_usd) items in one vectorized pass
+# --------------------------------------------------
+@router.post("/batch", response_model=SlippageBatchResponse, responses={406: {"model": ErrorResponse}})
+async def calculate_slippage_batch(
+    request: SlippageBatchRequest,
+    fields: Optional[str] = FIELDS_QUERY,
+    accept: Optional[str] = Header(None)
+):
+    """
+    Calculates recommendations for a basket of trades. Shared inputs are
+    fetched once per distinct token; invalid items get a per-item error.
+    fields and Accept apply to each item's recommendation as in POST /.
+    """
+    media_type, selected = response_format(accept, fields)
+    results = [SlippageBatchItemResult(index=i) for i in range(len(request.items))]
+
+    # Validate each item on its own so one bad item does not fail the batch
+    valid = []
+    for i, item in enumerate(request.items):
+        try:
+            valid.append((i, SlippageRequest(**item)))
+        except ValidationError as e:
+            results[i].error = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc'])}: {err['msg']}" for err in e.errors()
+            )
+
+    if valid:
+        try:
+            # Multi-hop items are searched in memory first; they need stats for every hop's pair
+            routes = [trade_route(req.token_in, req.token_out, req.amount_usd) for _, req in valid]
+            pools = [pool_token(req.token_in, req.token_out) for _, req in valid]
+            tokens = list(dict.fromkeys(pool for pool, route in zip(pools, routes) if route is None))
+            pairs = list(dict.fromkeys(
+                [*tokens, *(pair for route in routes if route is not None for pair in route_pairs(route))]
+            ))
+
+            # Fetch shared inputs once per distinct pair or token, all concurrently
+            fetched = await asyncio.gather(
+                *(pair_stats_input(p) for p in pairs),
+                *(liquidity_input(t) for t in tokens),
+                eth_price_input(),
+            )
+            stats_by_pair = dict(zip(pairs, fetched[:len(pairs)]))
+            liquidity_by_token = dict(zip(tokens, fetched[len(pairs):len(pairs) + len(tokens)]))
+            eth_price, price_source = fetched[-1]
+
+            pair_stats, pool_liquidity, input_sources = [], [], []
+            for pool, route in zip(pools, routes):
+                if route is not None:
+                    stats, liquidity, sources = route_inputs(route, stats_by_pair, price_source)
+                else:
+                    stats, stats_source = stats_by_pair[pool]
+                    liquidity, liquidity_source = liquidity_by_token[pool]
+                    sources = {
+                        "pair_stats": stats_source,
+                        "liquidity": liquidity_source,
+                        "eth_price": price_source,
+                    }
+                pair_stats.append(stats)
+                pool_liquidity.append(liquidity)
+                input_sources.append(sources)
+
+            started = time.perf_counter()
+            recommendations = await slippage_calculator.calculate_batch(
+                pair_stats=pair_stats,
+                pool_liquidity_usd=pool_liquidity,
+                eth_price_usd=eth_price,
+                input_sources=input_sources,
+                pairs=[req.token_out for _, req in valid],
+                tokens_in=[req.token_in for _, req in valid],
+                amounts_usd=[req.amount_usd for _, req in valid],
+                reserves=[reserve_cache.get(pool) if route is None else None for pool, route in zip(pools, routes)],
+                detailed=is_detailed(selected),
+                routes=routes
+            )
+            SLIPPAGE_STAGE_DURATION.labels("batch_calculation").observe(time.perf_counter() - started)
+            for (i, req), pool, recommendation, stats, liquidity, route in zip(valid, pools, recommendations, pair_stats, pool_liquidity, routes):
+                # Trimmed to the selected fields as a plain dict, which encodes the same way
+                results[i].recommendation = encoding.select(recommendation, selected)
+                if route is None:
+                    timeseries_store.record(
+                        pool, recommendation_row(stats, liquidity, eth_price, req.amount_usd, recommendation)
+                    )
+
+        except Exception as e:
+            print(f"Error calculating slippage batch of {len(valid)} items: {e}")
+            for i, _ in valid:
+                results[i].error = "An internal error occurred during slippage calculation."
+
+    failed = sum(1 for r in results if r.error)
+    response = SlippageBatchResponse(results=results, succeeded=len(results) - failed, failed=failed)
+    started = time.perf_counter()
+    body = encoding.encode(response, media_type)
+    SLIPPAGE_STAGE_DURATION.labels("serialization").observe(time.perf_counter() - started)
+    return Response(content=body, media_type=media_type, headers={"Vary": "Accept"})
+
+# --------------------------------------------------
+# POST /api/slippage/curve Endpoint
+# Fail chance and MEV loss across a whole range of tolerances
+# --------------------------------------------------
+@router.post("/curve", response_model=SlippageCurve, responses={400: {"model": ErrorResponse}, 406: {"model": ErrorResponse}})
+async def slippage_curve(request: SlippageCurveRequest, accept: Optional[str] = Header(None)):
+    """
+    The slippage-vs-risk curve for one trade, for drawing a tolerance
+    slider. Uses the same inputs and cached recommendation as POST /;
+    every point comes from one interpolation over the simulated curves.
+    """
+    media_type, _ = response_format(accept)
+    if request.min_slippage is not None and request.max_slippage is not None and request.min_slippage >= request.max_slippage:
+        raise HTTPException(status_code=400, detail="min_slippage must be below max_slippage")
+    try:
+        inputs = await recommendation_inputs(request.token_in, request.token_out, request.amount_usd)
+        # Only the recommended slippage and risk level are used here
+        cached = await recommend(request.token_in, request.token_out, request.amount_usd, inputs, detailed=False)
+
+        started = time.perf_counter()
+        points = await slippage_calculator.curve(
+            pair=request.token_out,
+            pair_stats=inputs.pair_stats,
+            pool_liquidity_usd=inputs.pool_liquidity,
+            recommended_slippage=cached.recommended_slippage,
+            risk_level=cached.risk_level,
+            min_slippage=request.min_slippage,
+            max_slippage=request.max_slippage,
+            points=request.points
+        )
+        SLIPPAGE_STAGE_DURATION.labels("curve").observe(time.perf_counter() - started)
+        curve = SlippageCurve(
+            recommended_slippage=cached.recommended_slippage,
+            risk_level=cached.risk_level,
+            points=points,
+            inputs=inputs.input_sources,
+            degraded=any(source != "live" for source in inputs.input_sources.values())
+        )
+        return Response(content=encoding.encode(curve, media_type), media_type=media_type, headers={"Vary": "Accept"})
+
+    except HTTPException as http_exc:
+        raise http_exc
+
+    except Exception as e:
+        print(f"Error calculating slippage curve for {request.token_in}/{request.token_out}: {e}")
+        raise HTTPException(
+            status_code=500,
+            detail=f"An internal error occurred during slippage calculation."
+        )
+
+# --------------------------------------------------
+# Streaming Endpoints
+# GET /api/slippage/stream (SSE) and /api/slippage/ws (WebSocket)
+# push a recommendation only when it moves; see RecommendationStream
+# --------------------------------------------------
+recommendation_stream.set_recommender(recommend)
+
+def stream_message(subscription: Dict[str, Any], cached: CachedRecommendation) -> bytes:
+    # The recommendation is already serialized; splice it in instead of re-encoding
+    head = json.dumps(subscription, separators=(",", ":"))[:-1].encode()
+    return head + b',"etag":' + json.dumps(cached.etag).encode() + b',"recommendation":' + cached.body + b"}"
+
+async def subscribe_all(
+    subscriber: StreamSubscriber,
+    requests: List[SlippageRequest],
+    subscriptions: Dict[StreamKey, Dict[str, Any]]
+):
+    """
+    Subscribes to each trade, recording its metadata in subscriptions first:
+    the current state is queued during subscribe() and the writer may send
+    it before the rest of the requests are subscribed.
+    """
+    for req in requests:
+        key = stream_key(req.token_in, req.token_out, req.amount_usd)
+        previous = subscriptions.get(key)
+        subscriptions[key] = {"token_in": req.token_in, "token_out": req.token_out, "amount_usd": req.amount_usd}
+        try:
+            await recommendation_stream.subscribe(subscriber, req.token_in, req.token_out, req.amount_usd)
+        except Exception:
+            if previous is None:
+                del subscriptions[key]
+            else:
+                subscriptions[key] = previous
+            raise
+
+def parse_subscription(value: str) -> SlippageRequest:
+    """Parses "token_in:token_out[:amount_usd]"."""
+    parts = value.split(":")
+    if len(parts) not in (2, 3):
+        raise ValueError(f"Subscription '{value}' must be token_in:token_out[:amount_usd]")
+    return SlippageRequest(
+        token_in=parts[0],
+        token_out=parts[1],
+        amount_usd=float(parts[2]) if len(parts) == 3 and parts[2] else None
+    )
+
+@router.get("/stream")
+async def stream_slippage(
+    request: Request,
+    sub: List[str] = Query(..., description="token_in:token_out[:amount_usd], repeatable")
+):
+    """
+    Server-Sent Events stream of recommendations for the subscribed trades.
+    Sends the current state first, then an event whenever it moves.
+    """
+    try:
+        requests = [parse_subscription(value) for value in sub]
+    except (ValueError, ValidationError) as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    subscriber = StreamSubscriber()
+    subscriptions: Dict[StreamKey, Dict[str, Any]] = {}
+    try:
+        await subscribe_all(subscriber, requests, subscriptions)
+    except ValueError as e:
+        recommendation_stream.unsubscribe_all(subscriber)
+        raise HTTPException(status_code=400, detail=str(e))
+
+    async def events():
+        try:
+            while not await request.is_disconnected():
+                updates = await subscriber.next_updates(settings.stream_keepalive_seconds)
+                if not updates:
+                    yield b": keepalive\n\n"
+                for key, cached in updates:
+                    if key not in subscriptions:
+                        continue
+                    yield b"event: recommendation\ndata: " + stream_message(subscriptions[key], cached) + b"\n\n"
+        finally:
+            recommendation_stream.unsubscribe_all(subscriber)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@router.websocket("/ws")
+async def stream_slippage_ws(websocket: WebSocket):
+    """
+    WebSocket variant of /stream. Clients send
+    {"subscribe": [{"token_in": ..., "token_out": ..., "amount_usd": ...}]}
+    at any time and receive the same messages as the SSE stream.
+    """
+    await websocket.accept()
+    subscriber = StreamSubscriber()
+    subscriptions: Dict[StreamKey, Dict[str, Any]] = {}
+
+    async def read_subscriptions():
+        while True:
+            message = await websocket.receive_json()
+            try:
+                requests = [SlippageRequest(**item) for item in message.get("subscribe", [])]
+                await subscribe_all(subscriber, requests, subscriptions)
+            except (ValueError, ValidationError, TypeError, AttributeError) as e:
+                await websocket.send_json({"error": str(e)})
+
+    async def write_updates():
+        while True:
+            for key, cached in await subscriber.next_updates():
+                if key not in subscriptions:
+                    continue
+                await websocket.send_text(stream_message(subscriptions[key], cached).decode())
+
+    reader = asyncio.create_task(read_subscriptions())
+    writer = asyncio.create_task(write_updates())
+    try:
+        done, _ = await asyncio.wait({reader, writer}, return_when=asyncio.FIRST_COMPLETED)
+        for task in done:
+            if not isinstance(task.exception(), WebSocketDisconnect):
+                task.result()
+    except WebSocketDisconnect:
+        pass
+    finally:
+        reader.cancel()
+        writer.cancel()
+        recommendation_stream.unsubscribe_all(subscriber)
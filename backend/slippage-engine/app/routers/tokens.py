@@ -0,0 +1,45 @@
+# backend/slippage-engine/app/routers/tokens.py
+
+from dataclasses import asdict
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from .auth import require_admin_token
+from ..services.token_registry import token_registry
+
+router = APIRouter()
+
+@router.get("/", summary="Token Registry")
+async def list_tokens(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=1000)
+):
+    """
+    Returns a page of the tokens the engine knows, with their symbol,
+    address, CoinGecko id and decimals.
+    """
+    return {
+        "version": token_registry.version,
+        "total": len(token_registry),
+        "tokens": [asdict(t) for t in token_registry.tokens(offset, limit)],
+    }
+
+@router.get("/{query}", summary="Resolve Token")
+async def resolve_token(query: str):
+    """
+    Looks a token up by symbol or alias ("ETH", "weth"), address (any
+    case) or CoinGecko id ("shiba-inu").
+    """
+    token = token_registry.resolve(query) or token_registry.by_coingecko_id(query)
+    if token is None:
+        raise HTTPException(status_code=404, detail="Token not found")
+    return asdict(token)
+
+@router.post("/reload", summary="Reload Token Registry", dependencies=[Depends(require_admin_token)])
+async def reload_tokens():
+    """
+    Re-reads the token list from disk. The previous list stays active
+    if the file is invalid. Admin only, like POST /api/rules/reload.
+    """
+    if not token_registry.reload():
+        raise HTTPException(status_code=400, detail="Token list is invalid; previous version kept")
+    return {"version": token_registry.version, "tokens": len(token_registry)}
@@ -1,8 +1,10 @@
 # backend/slippage-engine/app/schemas.py
 
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional, Tuple
-from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+from dataclasses import dataclass, field
+
+from .services.token_registry import token_registry
 
 # --------------------------------------------------
 # Request Model for Slippage Calculation
@@ -14,10 +16,13 @@ class SlippageRequest(BaseModel):
 
     @validator('token_in', 'token_out')
     def validate_address_format(cls, v):
-        # Skip validation for symbols like "ETH"
+        # Symbols like "ETH" resolve to their address through the token registry
         if len(v) < 42 and not v.startswith('0x'):
-             return v
-             
+            token = token_registry.by_symbol(v)
+            if token is None:
+                raise ValueError(f"Unknown token symbol '{v}'; use the token address")
+            return token.address
+
         if not isinstance(v, str) or not v.startswith('0x') or len(v) != 42:
             raise ValueError('Token must be a valid Ethereum address (0x...)')
         return v.lower() # Normalize to lowercase
@@ -44,8 +49,55 @@ class SlippageRecommendation:
     risk_score: int
     pool_stats: dict
     bot_activity: dict
-    explanation: Explanation
+    explanation: Optional[Explanation] # None when left out by a field selection
     alternatives: List[dict]
+    # Provenance of each input: "live", "cached" or "default"
+    inputs: Dict[str, str] = field(default_factory=dict)
+    degraded: bool = False
+
+# --------------------------------------------------
+# Batch Slippage Models
+# Items are validated one by one so a bad item fails alone
+# --------------------------------------------------
+class SlippageBatchRequest(BaseModel):
+    items: List[Dict[str, Any]] = Field(..., min_length=1, max_length=500)
+
+@dataclass
+class SlippageBatchItemResult:
+    index: int
+    recommendation: Optional[SlippageRecommendation] = None
+    error: Optional[str] = None
+
+@dataclass
+class SlippageBatchResponse:
+    results: List[SlippageBatchItemResult]
+    succeeded: int
+    failed: int
+
+# --------------------------------------------------
+# Slippage Curve Models
+# One point per tolerance; the range defaults to the rule table's alternatives
+# --------------------------------------------------
+class SlippageCurveRequest(SlippageRequest):
+    min_slippage: Optional[float] = Field(None, ge=0, le=0.25, example=0.001)
+    max_slippage: Optional[float] = Field(None, gt=0, le=0.25, example=0.05)
+    points: int = Field(50, ge=2, le=500)
+
+@dataclass
+class SlippageCurvePoint:
+    slippage: float
+    percent: str
+    fail_chance: float # Probability the swap reverts at this tolerance
+    expected_mev_loss: float # Expected share of the trade extracted by sandwiches
+    risk: str # "lower" / "higher" than the recommendation, or its risk level at it
+
+@dataclass
+class SlippageCurve:
+    recommended_slippage: float
+    risk_level: str
+    points: List[SlippageCurvePoint]
+    inputs: Dict[str, str] = field(default_factory=dict)
+    degraded: bool = False
 
 # --------------------------------------------------
 # Response Model for Error Handling
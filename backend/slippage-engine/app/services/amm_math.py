@@ -0,0 +1,23 @@
+# backend/slippage-engine/app/services/amm_math.py
+
+# Closed-form constant-product (x * y = k) math for Uniswap V2 style pools.
+# Every function is plain arithmetic, so it accepts floats or NumPy arrays.
+
+UNISWAP_V2_FEE = 0.003
+
+def get_amount_out(amount_in, reserve_in, reserve_out, fee=UNISWAP_V2_FEE):
+    """Output amount for a swap of amount_in, after the LP fee."""
+    amount_in_with_fee = amount_in * (1 - fee)
+    return reserve_out * amount_in_with_fee / (reserve_in + amount_in_with_fee)
+
+def price_impact(amount_in, reserve_in, fee=UNISWAP_V2_FEE):
+    """
+    Fraction the execution price moves away from the spot price
+    because of the trade itself (LP fee excluded).
+    """
+    amount_in_with_fee = amount_in * (1 - fee)
+    return amount_in_with_fee / (reserve_in + amount_in_with_fee)
+
+def spot_price(reserve_in, reserve_out):
+    """Units of the output token per unit of the input token before the trade."""
+    return reserve_out / reserve_in
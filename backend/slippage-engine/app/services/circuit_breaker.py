@@ -0,0 +1,117 @@
+# backend/slippage-engine/app/services/circuit_breaker.py
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Optional
+
+import httpx
+
+from ..config import settings
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+STATES = (CLOSED, HALF_OPEN, OPEN) # Index is the value of the state gauge
+
+
+class CircuitOpenError(httpx.TransportError):
+    """Raised instead of sending a request while the upstream's circuit is open."""
+
+
+class CircuitBreaker:
+    """
+    Per-upstream circuit breaker.
+
+    - closed: requests go through; settings.circuit_failure_threshold
+      consecutive failures open the circuit.
+    - open: requests fail immediately with CircuitOpenError, so callers fall
+      back to cached or default values without waiting out a timeout.
+    - half_open: after settings.circuit_open_seconds one probe request is let
+      through; success closes the circuit, failure opens it again.
+
+    Failures are transport errors, 5xx and 429 responses. A call that is
+    cancelled before it finishes counts as neither.
+    """
+
+    def __init__(self, name: str, failure_threshold: Optional[int] = None, open_seconds: Optional[float] = None):
+        self.name = name
+        self.failure_threshold = failure_threshold or settings.circuit_failure_threshold
+        self.open_seconds = open_seconds if open_seconds is not None else settings.circuit_open_seconds
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probing = False
+
+        # Counters
+        self.rejected = 0
+        self.opened = 0
+
+    def allow(self) -> bool:
+        """Whether a request may be sent now. In half_open, only one probe at a time."""
+        if not settings.circuit_breaker_enabled or self.state == CLOSED:
+            return True
+        if self.state == OPEN:
+            if time.monotonic() - self.opened_at < self.open_seconds:
+                self.rejected += 1
+                return False
+            self.state = HALF_OPEN
+        if self._probing:
+            self.rejected += 1
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self):
+        self.consecutive_failures = 0
+        self._probing = False
+        if self.state != CLOSED:
+            print(f"   [Circuit] {self.name} closed")
+            self.state = CLOSED
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self._probing = False
+        if self.state == HALF_OPEN or (self.state == CLOSED and self.consecutive_failures >= self.failure_threshold):
+            self.state = OPEN
+            self.opened_at = time.monotonic()
+            self.opened += 1
+            print(f"   [Circuit] {self.name} open for {self.open_seconds:g}s after {self.consecutive_failures} failures")
+
+    def release(self):
+        """Frees the half-open probe slot of a call that ended without a result."""
+        self._probing = False
+
+    def status(self) -> Dict[str, Any]:
+        retry_in = self.open_seconds - (time.monotonic() - self.opened_at) if self.state == OPEN else None
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened": self.opened,
+            "rejected": self.rejected,
+            "retry_in_seconds": round(max(retry_in, 0.0), 1) if retry_in is not None else None,
+        }
+
+
+class LatencyWindow:
+    """Recent successful latencies of one upstream, for picking the hedge delay."""
+
+    def __init__(self, size: int = 256):
+        self._samples: Deque[float] = deque(maxlen=size)
+        self._percentile: Optional[float] = None
+        self._since_update = 0
+
+    def observe(self, seconds: float):
+        self._samples.append(seconds)
+        self._since_update += 1
+        if self._since_update >= 16:
+            self._percentile = None # Recomputed lazily on the next read
+
+    def percentile(self, q: float) -> Optional[float]:
+        """The q-th latency quantile, or None until there are enough samples to trust it."""
+        if len(self._samples) < settings.http_hedge_min_samples:
+            return None
+        if self._percentile is None:
+            ordered = sorted(self._samples)
+            self._percentile = ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+            self._since_update = 0
+        return self._percentile
@@ -0,0 +1,109 @@
+# backend/slippage-engine/app/services/encoding.py
+
+import dataclasses
+from typing import Any, Callable, Collection, Dict, FrozenSet, List, Optional, Tuple
+
+import msgpack
+import orjson
+
+JSON = "application/json"
+MSGPACK = "application/msgpack"
+MSGPACK_ALIASES = {MSGPACK, "application/x-msgpack", "application/vnd.msgpack"}
+
+Fields = Optional[FrozenSet[str]]
+
+# dataclass -> its field names, computed once per class
+_SCHEMAS: Dict[type, Tuple[str, ...]] = {}
+
+
+def field_names(cls: type) -> Tuple[str, ...]:
+    names = _SCHEMAS.get(cls)
+    if names is None:
+        names = _SCHEMAS[cls] = tuple(f.name for f in dataclasses.fields(cls))
+    return names
+
+
+def _default(obj: Any) -> Any:
+    """
+    Fallback for types the encoders do not know: one level of a dataclass,
+    or a NumPy scalar. The encoder recurses into the result itself.
+    """
+    if dataclasses.is_dataclass(obj):
+        return {name: getattr(obj, name) for name in field_names(type(obj))}
+    if hasattr(obj, "item"): # NumPy scalar
+        return obj.item()
+    raise TypeError(f"Cannot encode {type(obj).__name__}")
+
+
+def select(obj: Any, fields: Fields) -> Any:
+    """Top-level fields of a dataclass response, or all of them when fields is None."""
+    if fields is None:
+        return obj
+    return {name: getattr(obj, name) for name in field_names(type(obj)) if name in fields}
+
+
+def parse_fields(value: Optional[str], cls: type) -> Fields:
+    """
+    Parses a "fields=a,b" selection against a response dataclass.
+    Raises ValueError naming any field the response does not have.
+    """
+    if not value:
+        return None
+    requested = frozenset(name.strip() for name in value.split(",") if name.strip())
+    unknown = requested.difference(field_names(cls))
+    if unknown:
+        raise ValueError(f"Unknown fields: {', '.join(sorted(unknown))}. Available: {', '.join(field_names(cls))}")
+    return requested
+
+
+def negotiate(accept: Optional[str]) -> Optional[str]:
+    """
+    The response media type for an Accept header: MessagePack when the
+    client prefers it, otherwise JSON. None if
+    nothing acceptable can be produced.
+    """
+    if not accept:
+        return JSON
+    best, best_q = None, 0.0
+    for part in accept.split(","):
+        media, _, params = part.strip().partition(";")
+        media = media.strip().lower()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if media in MSGPACK_ALIASES:
+            candidate = MSGPACK
+        elif media in (JSON, "application/*", "*/*"):
+            candidate = JSON
+        else:
+            continue
+        # Ties go to the first listed type
+        if q > best_q:
+            best, best_q = candidate, q
+    return best
+
+
+def _json_orjson(obj: Any) -> bytes:
+    # orjson serializes dataclasses natively; NumPy scalars need the flag
+    return orjson.dumps(obj, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _msgpack(obj: Any) -> bytes:
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+ENCODERS: Dict[str, Callable[[Any], bytes]] = {JSON: _json_orjson, MSGPACK: _msgpack}
+
+
+def encode(obj: Any, media_type: str = JSON, fields: Fields = None) -> bytes:
+    """Serializes a response dataclass (optionally trimmed to fields) straight to bytes."""
+    return ENCODERS[media_type](select(obj, fields))
+
+
+def available() -> List[str]:
+    return list(ENCODERS)
@@ -1,7 +1,11 @@
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 from ..schemas import Explanation, ExplanationFactor
+from .rule_engine import RuleEngine, CompiledRules, rule_engine as shared_rule_engine
 
 class ExplanationGenerator:
+    def __init__(self, rules: Optional[RuleEngine] = None):
+        self.rules = rules or shared_rule_engine
+
     def generate(
         self,
         base_slippage: float,
@@ -11,19 +15,20 @@ class ExplanationGenerator:
         pair_stats: Dict[str, Any],
         pool_liquidity_usd: float,
         avg_gas_gwei: float,
-        recommended_slippage: float
+        recommended_slippage: float,
+        rules: Optional[CompiledRules] = None,
+        trade: Optional[Dict[str, Any]] = None,
+        impact_adjustment: float = 0.0
     ) -> Explanation:
         """
         Generates a human-readable explanation for the recommended slippage.
         """
+        rules = rules or self.rules.default
         factors = []
         
         # --- Pool Liquidity Factor ---
-        liquidity_level = "Very Low"
+        liquidity_level = rules.liquidity.value(pool_liquidity_usd, "label")
         base_display = f"{base_slippage:.1%}"
-        if pool_liquidity_usd > 10_000_000: liquidity_level, base_display = "High", f"{base_slippage:.1%}"
-        elif pool_liquidity_usd > 1_000_000: liquidity_level, base_display = "Good", f"{base_slippage:.1%}"
-        elif pool_liquidity_usd > 100_000: liquidity_level, base_display = "Moderate", f"{base_slippage:.1%}"
         
         factors.append(ExplanationFactor(
             name="Pool Liquidity",
@@ -33,10 +38,7 @@ class ExplanationGenerator:
         
         # --- Bot Activity Factor ---
         bot_score = pair_stats.get("bot_activity_score", 0)
-        bot_level = "Very Low"
-        if bot_score > 0.7: bot_level = "Very High"
-        elif bot_score > 0.4: bot_level = "Moderate"
-        elif bot_score > 0.2: bot_level = "Low"
+        bot_level = rules.bot_activity.value(bot_score, "label")
         
         factors.append(ExplanationFactor(
             name="Bot Activity",
@@ -61,6 +63,16 @@ class ExplanationGenerator:
             impact=gas_impact
         ))
         
+        # --- Trade Price Impact Factor ---
+        if trade and trade["source"] != "none":
+            estimated = " est." if trade["source"] == "liquidity_estimate" else ""
+            routed = f" over {len(trade['route'].hops)} pools" if trade["source"] == "route" else ""
+            factors.append(ExplanationFactor(
+                name="Price Impact",
+                value=f"{trade['price_impact']:.2%}{estimated} for ${trade['amount_usd']:,.0f}{routed}",
+                impact=f"+{impact_adjustment:.2%}" if impact_adjustment > 0 else "None"
+            ))
+
         return Explanation(
             summary="This recommendation balances trade execution probability with minimizing MEV extraction risk.",
             factors=factors
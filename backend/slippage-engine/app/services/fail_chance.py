@@ -0,0 +1,218 @@
+# backend/slippage-engine/app/services/fail_chance.py
+
+import asyncio
+import math
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from cachetools import LRUCache
+
+from ..config import settings
+
+# Tolerances the cached curves are evaluated at (0% to 25% in 0.05% steps)
+TOLERANCE_GRID = np.linspace(0.0, 0.25, 501)
+
+# --- Model assumptions ---
+BLOCKS_PER_WINDOW = 25 # 12s blocks in the 5-minute stats window
+BASE_BLOCK_VOLATILITY = 0.0015 # Per-block price stdev of a $1M pool
+BASE_SWAP_IMPACT = 0.003 # Mean price move of one competing swap in a $1M pool
+ATTACKER_OVERSHOOT = 0.10 # Share of sandwiches sized against a misjudged limit
+ATTACKER_AIM_ERROR = 0.002 # Mean price push of those past the smallest profitable slack
+MIN_PROFITABLE_SLACK = 0.0005 # Attackers skip victims with less room than this
+MAX_TARGETING_RATE = 0.6 # Small windows can show more sandwiches than plausible victims
+
+# (bot score tenths, sandwiches, log2 tx bucket, gas tens of gwei, liquidity half-decades)
+Regime = Tuple[int, int, int, int, int]
+
+
+def regime_for(pair_stats: Dict[str, Any], pool_liquidity_usd: float) -> Regime:
+    """Buckets the market state so similar conditions share one simulation."""
+    bot = float(pair_stats.get("bot_activity_score", 0) or 0)
+    sandwiches = int(pair_stats.get("sandwiches_5min", 0) or 0)
+    txs = int(pair_stats.get("transactions_5min", 0) or 0)
+    gas = float(pair_stats.get("avg_gas_gwei", 30) or 0)
+    liquidity = max(float(pool_liquidity_usd or 0), 1.0)
+    return (
+        int(round(min(max(bot, 0.0), 1.0) * 10)),
+        min(max(sandwiches, 0), 10),
+        min(int(round(math.log2(1 + max(txs, 0)))), 10),
+        min(int(round(max(gas, 0.0) / 10)), 30),
+        min(max(int(round(math.log10(liquidity) * 2)), 6), 20),
+    )
+
+
+def format_probability(p: float) -> str:
+    if p < 0.01:
+        return "<1%"
+    if p > 0.99:
+        return ">99%"
+    return f"{p * 100:.0f}%"
+
+
+class FailChanceModel:
+    """
+    Monte Carlo estimate of how often a swap reverts at a given slippage
+    tolerance, and how much of the trade MEV bots take when it does not.
+
+    Each sample draws, for one swap:
+    - blocks until inclusion (longer when gas competition is high),
+    - price diffusion over those blocks (larger in thin pools),
+    - competing swaps landing first (Poisson at the pair's tx rate),
+    - whether a sandwich bot targets it (from the sandwich and bot rates).
+
+    A swap reverts when the adverse move exceeds its tolerance, or when a
+    sandwich overshoots the limit: a misjudged frontrun pushes the price a
+    random distance further, which reverts the swap only when it exceeds the
+    slack left, so wider tolerances revert fewer sandwiches. An unreverted
+    sandwich extracts the slack left between the move and the tolerance. Each regime is simulated once
+    (vectorized, seeded by the regime) and kept as fail/loss curves over
+    TOLERANCE_GRID, so a request only interpolates; ensure() runs the
+    simulations for new regimes in a worker thread, one per regime however
+    many requests are waiting for it.
+    """
+
+    def __init__(self, samples: Optional[int] = None, max_regimes: Optional[int] = None):
+        self.samples = samples or settings.fail_chance_samples
+        self._curves: LRUCache = LRUCache(maxsize=max_regimes or settings.fail_chance_max_regimes)
+        # Regime -> simulation in flight, shared by every caller waiting on it
+        self._inflight: Dict[Regime, asyncio.Future] = {}
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.simulations = 0
+        self.simulation_seconds = 0.0
+
+    def simulate(self, regime: Regime) -> Tuple[np.ndarray, np.ndarray]:
+        """Returns (revert probability, expected MEV loss fraction) at each grid tolerance."""
+        bot_tenths, sandwiches, tx_bucket, gas_tens, liquidity_half_decades = regime
+        bot = bot_tenths / 10
+        txs = 2 ** tx_bucket - 1
+        gas = gas_tens * 10
+        liquidity = 10 ** (liquidity_half_decades / 2)
+        n = self.samples
+        rng = np.random.default_rng(zlib.crc32(repr(regime).encode()))
+
+        # Blocks until inclusion: high gas means a normal bid waits longer
+        inclusion_chance = min(max(0.85 - (gas - 30) / 250, 0.35), 0.9)
+        blocks = rng.geometric(inclusion_chance, n)
+
+        # Price diffusion, scaled for pool depth
+        depth = 1e6 / liquidity
+        block_volatility = min(max(BASE_BLOCK_VOLATILITY * depth ** 0.25, 0.0003), 0.02)
+        move = rng.standard_normal(n) * block_volatility * np.sqrt(blocks)
+
+        # Competing swaps ahead of ours, half of them in our direction
+        swap_impact = min(max(BASE_SWAP_IMPACT * depth ** 0.5, 0.0001), 0.03)
+        ahead = rng.poisson(txs / BLOCKS_PER_WINDOW * blocks)
+        adverse = rng.binomial(ahead, 0.5)
+        move += rng.gamma(adverse, swap_impact) - rng.gamma(ahead - adverse, swap_impact)
+
+        # Sandwich targeting: observed victims per swap, raised by bot activity
+        victims_per_swap = min(sandwiches / max(txs - 2 * sandwiches, 1), MAX_TARGETING_RATE)
+        attack_chance = 1 - (1 - victims_per_swap) * (1 - 0.25 * bot)
+        attacked = rng.random(n) < attack_chance
+        misjudged = attacked & (rng.random(n) < ATTACKER_OVERSHOOT)
+        # Where a misjudged frontrun leaves the price; past the tolerance, the victim reverts.
+        # Always at least MIN_PROFITABLE_SLACK past the move, so only attackable swaps can stay within
+        reach = (move + MIN_PROFITABLE_SLACK + rng.exponential(ATTACKER_AIM_ERROR, n))[misjudged]
+        landed_order = np.argsort(reach)
+        reach = reach[landed_order]
+        landed_move = np.concatenate(([0.0], np.cumsum(move[misjudged][landed_order])))
+
+        # Curves from the sorted moves: counts below each tolerance are searchsorted lookups
+        order = np.argsort(move)
+        move = move[order]
+        attacked, misjudged = attacked[order], misjudged[order]
+        attacked_count = np.concatenate(([0], np.cumsum(attacked)))
+        attacked_move = np.concatenate(([0.0], np.cumsum(np.where(attacked, move, 0.0))))
+        misjudged_count = np.concatenate(([0], np.cumsum(misjudged)))
+        misjudged_move = np.concatenate(([0.0], np.cumsum(np.where(misjudged, move, 0.0))))
+
+        within = np.searchsorted(move, TOLERANCE_GRID, side="right")
+        attackable = np.searchsorted(move, TOLERANCE_GRID - MIN_PROFITABLE_SLACK, side="right")
+        landed = np.searchsorted(reach, TOLERANCE_GRID, side="right") # Misjudged, yet within the limit
+        overshoot = np.maximum(misjudged_count[attackable] - landed, 0)
+        extracted_count = attacked_count[attackable] - overshoot
+        extracted_move = attacked_move[attackable] - (misjudged_move[attackable] - landed_move[landed])
+
+        fail = (n - within + overshoot) / n
+        loss = (TOLERANCE_GRID * extracted_count - extracted_move) / n
+        return fail.astype(np.float32), np.maximum(loss, 0.0).astype(np.float32)
+
+    def _simulate_timed(self, regime: Regime) -> Tuple[np.ndarray, np.ndarray]:
+        started = time.perf_counter()
+        curves = self.simulate(regime)
+        self.simulation_seconds += time.perf_counter() - started
+        self.simulations += 1
+        return curves
+
+    async def _simulate_and_store(self, regime: Regime):
+        try:
+            self._curves[regime] = await asyncio.to_thread(self._simulate_timed, regime)
+        finally:
+            del self._inflight[regime]
+
+    async def ensure(self, regimes: Sequence[Regime]):
+        """
+        Simulates any regimes not cached yet, off the event loop. Counts one
+        hit or miss per distinct regime; callers missing a regime that is
+        already being simulated wait for that simulation.
+        """
+        for regime in dict.fromkeys(regimes):
+            if regime in self._curves:
+                self.hits += 1
+                continue
+            self.misses += 1
+            simulation = self._inflight.get(regime)
+            if simulation is None:
+                simulation = self._inflight[regime] = asyncio.ensure_future(self._simulate_and_store(regime))
+            # Shielded so one cancelled request does not cancel it for the others
+            await asyncio.shield(simulation)
+
+    def curves(self, regime: Regime) -> Tuple[np.ndarray, np.ndarray]:
+        """Cached curves for a regime; the lookup was already counted by ensure()."""
+        curves = self._curves.get(regime)
+        if curves is None:
+            # Callers normally ensure() first; simulate inline rather than fail
+            self.misses += 1
+            curves = self._curves[regime] = self._simulate_timed(regime)
+        return curves
+
+    def estimate(self, regime: Regime, tolerances: Sequence[float]) -> List[Tuple[float, float]]:
+        """(revert probability, expected MEV loss as a fraction of the trade) per tolerance."""
+        fail, loss = self.curves(regime)
+        x = np.asarray(tolerances, dtype=np.float64)
+        return list(zip(
+            np.interp(x, TOLERANCE_GRID, fail).tolist(),
+            np.interp(x, TOLERANCE_GRID, loss).tolist(),
+        ))
+
+    def alternatives(self, regime: Regime, slippages: Sequence[float], risks: Sequence[str]) -> List[Dict[str, str]]:
+        """The response's alternatives list with simulated fail chance and expected MEV loss."""
+        return [
+            {
+                "slippage": f"{(slippage * 100):.1f}%",
+                "risk": risk,
+                "fail_chance": format_probability(fail),
+                "expected_mev_loss": f"{loss * 100:.2f}%",
+            }
+            for slippage, risk, (fail, loss) in zip(slippages, risks, self.estimate(regime, slippages))
+        ]
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "regimes_cached": len(self._curves),
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "simulations": self.simulations,
+            "samples": self.samples,
+            "avg_simulation_ms": round(self.simulation_seconds / self.simulations * 1000, 2) if self.simulations else None,
+        }
+
+
+# Shared instance for the whole process
+fail_chance_model = FailChanceModel()
@@ -0,0 +1,334 @@
+# backend/slippage-engine/app/services/http_clients.py
+
+import asyncio
+import importlib.util
+import time
+from typing import Dict, Any, Optional
+
+import httpx
+
+from ..config import settings
+from .metrics import UPSTREAM_ERRORS, UPSTREAM_REQUEST_DURATION
+from .circuit_breaker import CircuitBreaker, CircuitOpenError, LatencyWindow
+
+# Headers to mimic a browser and avoid 301 redirects/blocking on CoinGecko
+BROWSER_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36",
+    "Accept": "application/json"
+}
+
+# One long-lived client per upstream service
+UPSTREAMS = ("coingecko", "subgraph", "listener")
+
+
+class PoolStats:
+    """Usage counters for a single upstream connection pool."""
+
+    def __init__(self):
+        self.requests_total = 0
+        self.errors_total = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.last_request_at = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "requests_total": self.requests_total,
+            "errors_total": self.errors_total,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "last_request_at": self.last_request_at,
+        }
+
+
+class _TrackedStream(httpx.AsyncByteStream):
+    """Wraps a response body so the request counts as in-flight until it is closed."""
+
+    def __init__(self, stream: httpx.AsyncByteStream, on_close):
+        self._stream = stream
+        self._on_close = on_close
+
+    async def __aiter__(self):
+        async for chunk in self._stream:
+            yield chunk
+
+    async def aclose(self):
+        try:
+            await self._stream.aclose()
+        finally:
+            if self._on_close:
+                self._on_close()
+                self._on_close = None
+
+
+class CountingTransport(httpx.AsyncBaseTransport):
+    """
+    AsyncHTTPTransport that records pool usage for sizing the limits, plus
+    per-upstream latency (until response headers) and error metrics.
+    """
+
+    def __init__(self, name: str = "default", **transport_kwargs):
+        self._transport = httpx.AsyncHTTPTransport(**transport_kwargs)
+        self.name = name
+        self.stats = PoolStats()
+        self._latency = UPSTREAM_REQUEST_DURATION.labels(name)
+
+    def _release(self):
+        self.stats.in_flight -= 1
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        stats = self.stats
+        stats.requests_total += 1
+        stats.in_flight += 1
+        stats.peak_in_flight = max(stats.peak_in_flight, stats.in_flight)
+        stats.last_request_at = time.time()
+
+        started = time.perf_counter()
+        try:
+            response = await self._transport.handle_async_request(request)
+        except asyncio.CancelledError:
+            # Caller deadline or a losing hedge: not an upstream error
+            self._release()
+            raise
+        except Exception as e:
+            stats.errors_total += 1
+            UPSTREAM_ERRORS.labels(self.name, type(e).__name__).inc()
+            self._release()
+            raise
+        finally:
+            self._latency.observe(time.perf_counter() - started)
+
+        if response.status_code >= 400:
+            UPSTREAM_ERRORS.labels(self.name, f"{response.status_code // 100}xx").inc()
+
+        return httpx.Response(
+            status_code=response.status_code,
+            headers=response.headers,
+            stream=_TrackedStream(response.stream, self._release),
+            extensions=response.extensions,
+        )
+
+    def connection_counts(self) -> Dict[str, int]:
+        # httpcore exposes the live connections on the underlying pool
+        pool = getattr(self._transport, "_pool", None)
+        connections = list(getattr(pool, "connections", []) or [])
+        idle = sum(1 for c in connections if c.is_idle())
+        return {"open": len(connections), "idle": idle, "active": len(connections) - idle}
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class ResilientTransport(httpx.AsyncBaseTransport):
+    """
+    Circuit breaker and optional request hedging in front of a
+    CountingTransport (which still sees, and counts, every attempt).
+
+    Hedging: if no response has arrived after the upstream's recent p95
+    latency, a second identical attempt is sent and whichever answers
+    first wins; the other is cancelled. Only the read-only upstreams in
+    settings.http_hedge_upstreams are hedged, and hedges are capped at
+    settings.http_hedge_budget of requests so a slow upstream does not
+    see double the load.
+    """
+
+    def __init__(self, name: str, transport: CountingTransport):
+        self.name = name
+        self._transport = transport
+        self.breaker = CircuitBreaker(name)
+        self.latency = LatencyWindow()
+        self.hedgeable = name in settings.http_hedge_upstreams
+
+        # Counters
+        self.requests = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if not self.breaker.allow():
+            raise CircuitOpenError(f"{self.name} circuit is open", request=request)
+        self.requests += 1
+        recorded = False
+        try:
+            try:
+                response = await self._send(request)
+            except Exception:
+                self.breaker.record_failure()
+                recorded = True
+                raise
+            if response.status_code >= 500 or response.status_code == 429:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            recorded = True
+            return response
+        finally:
+            if not recorded:
+                self.breaker.release()
+
+    async def _attempt(self, request: httpx.Request) -> httpx.Response:
+        started = time.perf_counter()
+        response = await self._transport.handle_async_request(request)
+        if response.status_code < 500:
+            self.latency.observe(time.perf_counter() - started)
+        return response
+
+    def _hedge_delay(self) -> Optional[float]:
+        if not (settings.http_hedging_enabled and self.hedgeable):
+            return None
+        if self.hedges >= settings.http_hedge_budget * self.requests:
+            return None
+        p95 = self.latency.percentile(settings.http_hedge_percentile)
+        if p95 is None:
+            return None
+        return max(p95, settings.http_hedge_min_delay_ms / 1000)
+
+    async def _send(self, request: httpx.Request) -> httpx.Response:
+        delay = self._hedge_delay()
+        if delay is None:
+            return await self._attempt(request)
+
+        await request.aread() # Buffer the body so it can be sent twice
+        first = asyncio.create_task(self._attempt(request))
+        pending = {first}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if done:
+                return first.result()
+
+            self.hedges += 1
+            second = asyncio.create_task(self._attempt(request))
+            pending.add(second)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner = next((t for t in done if t.exception() is None), None)
+                if winner is None:
+                    error = next(iter(done)).exception()
+                    continue
+                for task in done - {winner}:
+                    if task.exception() is None:
+                        await task.result().aclose()
+                if winner is second:
+                    self.hedge_wins += 1
+                return winner.result()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def status(self) -> Dict[str, Any]:
+        p95 = self.latency.percentile(settings.http_hedge_percentile)
+        return {
+            **self.breaker.status(),
+            "hedging": settings.http_hedging_enabled and self.hedgeable,
+            "hedge_delay_ms": round(max(p95, settings.http_hedge_min_delay_ms / 1000) * 1000, 1) if p95 is not None else None,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+        }
+
+    async def aclose(self):
+        await self._transport.aclose()
+
+
+class HttpClients:
+    """
+    Owns the long-lived httpx clients used to talk to upstream services.
+    Opened and closed with the FastAPI lifespan; services receive this object
+    and look up their client per call so they always see the live pool.
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transports: Dict[str, CountingTransport] = {}
+        self._resilience: Dict[str, ResilientTransport] = {}
+
+    def _http2_enabled(self) -> bool:
+        if not settings.http2_enabled:
+            return False
+        if importlib.util.find_spec("h2") is None:
+            print("   [HttpClients] HTTP/2 requested but 'h2' is not installed. Using HTTP/1.1.")
+            return False
+        return True
+
+    def _build_client(self, name: str, http2: bool) -> httpx.AsyncClient:
+        limits = httpx.Limits(
+            max_connections=settings.http_max_connections,
+            max_keepalive_connections=settings.http_max_keepalive_connections,
+            keepalive_expiry=settings.http_keepalive_expiry_seconds,
+        )
+        timeout = httpx.Timeout(
+            settings.http_timeout_seconds,
+            connect=settings.http_connect_timeout_seconds,
+        )
+        transport = CountingTransport(name, limits=limits, http2=http2)
+        self._transports[name] = transport
+        # Breakers outlive the clients so an outage is remembered across restarts of the pool
+        resilient = ResilientTransport(name, transport)
+        if name in self._resilience:
+            previous = self._resilience[name]
+            resilient.breaker, resilient.latency = previous.breaker, previous.latency
+        self._resilience[name] = resilient
+
+        headers = BROWSER_HEADERS if name == "coingecko" else None
+        return httpx.AsyncClient(
+            transport=resilient,
+            timeout=timeout,
+            headers=headers,
+            follow_redirects=True,
+        )
+
+    async def start(self):
+        if self._clients:
+            return
+        http2 = self._http2_enabled()
+        for name in UPSTREAMS:
+            self._clients[name] = self._build_client(name, http2)
+        print(f"   [HttpClients] Opened {len(self._clients)} pooled clients (http2={http2})")
+
+    async def close(self):
+        clients, self._clients = self._clients, {}
+        for client in clients.values():
+            await client.aclose()
+        self._transports = {}
+
+    def get(self, name: str) -> httpx.AsyncClient:
+        client = self._clients.get(name)
+        if client is None:
+            # Used outside the app lifespan (scripts, ad-hoc calls): open lazily
+            client = self._build_client(name, self._http2_enabled())
+            self._clients[name] = client
+        return client
+
+    @property
+    def coingecko(self) -> httpx.AsyncClient:
+        return self.get("coingecko")
+
+    @property
+    def subgraph(self) -> httpx.AsyncClient:
+        return self.get("subgraph")
+
+    @property
+    def listener(self) -> httpx.AsyncClient:
+        return self.get("listener")
+
+    def stats(self) -> Dict[str, Any]:
+        result = {}
+        for name in UPSTREAMS:
+            transport: Optional[CountingTransport] = self._transports.get(name)
+            if transport is None:
+                result[name] = {"open": False}
+                continue
+            result[name] = {
+                "open": True,
+                **transport.stats.as_dict(),
+                "connections": transport.connection_counts(),
+                "max_connections": settings.http_max_connections,
+                "max_keepalive_connections": settings.http_max_keepalive_connections,
+                "circuit": self._resilience[name].status(),
+            }
+        return result
+
+
+# Shared instance for the whole process
+http_clients = HttpClients()
@@ -1,48 +1,258 @@
-import httpx
+import asyncio
+from typing import Any, Dict, List, Optional
+
+from cachetools import LRUCache, TTLCache
+
 from ..config import settings
-from ..services.price_feed import PriceFeed
+from .http_clients import HttpClients, http_clients
+from .shared_cache import SharedCache, shared_cache as default_shared_cache
+from .token_registry import token_registry
+
+# Single pool lookup; aliased once per token in a batched query
+PAIR_QUERY = """
+  %s: pairs(where: { token0_in: ["%s", "%s"], token1_in: ["%s", "%s"] }, first: 1, orderBy: reserveUSD, orderDirection: desc) {
+    reserveUSD
+  }"""
+
+# Deepest WETH pools, used to warm the cache on startup
+TOP_POOLS_QUERY = """
+query {
+  base: pairs(where: { token0: "%s" }, first: %d, orderBy: reserveUSD, orderDirection: desc) {
+    reserveUSD
+    token1 { id }
+  }
+  quote: pairs(where: { token1: "%s" }, first: %d, orderBy: reserveUSD, orderDirection: desc) {
+    reserveUSD
+    token0 { id }
+  }
+}
+"""
+
+async def query_subgraph(query: str, clients: Optional[HttpClients] = None) -> Dict[str, Any]:
+    """Posts a GraphQL query to the configured subgraph and returns its data block."""
+    clients = clients or http_clients
+    response = await clients.subgraph.post(settings.uniswap_subgraph_url, json={"query": query})
+
+    if response.status_code != 200:
+        raise RuntimeError(f"Subgraph returned status {response.status_code}")
+
+    payload = response.json()
+    data = payload.get("data")
+    if data is None:
+        raise RuntimeError(f"Subgraph error: {payload.get('errors')}")
+    return data
 
 class LiquidityFetcher:
-    def __init__(self):
-        self.subgraph_url = "https://api.thegraph.com/subgraphs/name/uniswap/uniswap-v2"
-        self.price_feed = PriceFeed()
+    def __init__(self, clients: Optional[HttpClients] = None, shared: Optional[SharedCache] = None):
+        self.clients = clients or http_clients
+        # With several workers, only the one holding a token's lease queries the subgraph
+        self.shared = shared or default_shared_cache
+        self.default_liquidity_usd = 100000.0 # Safe fallback
+        self.no_pool_liquidity_usd = 50000.0 # No pool found: treat as a very thin market
+
+        # token -> reserveUSD; TTL for freshness, LRU eviction past maxsize
+        self._cache: TTLCache = TTLCache(
+            maxsize=settings.liquidity_cache_max_tokens,
+            ttl=settings.liquidity_cache_ttl_seconds
+        )
+        # Last successfully fetched liquidity per token (no expiry)
+        self._last_known: LRUCache = LRUCache(maxsize=settings.liquidity_cache_max_tokens)
+
+        # Micro-batching state
+        self._pending: Dict[str, asyncio.Future] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.batches = 0
+        self.tokens_batched = 0
+        self.errors = 0
+
+    def last_known_liquidity(self, token_address: str) -> Optional[float]:
+        token = token_registry.resolve_address(token_address)
+        return self._last_known.get(token) if token is not None else None
+
+    def cached_liquidity(self, token_address: str) -> Optional[float]:
+        """What fetch_pool_liquidity would return without querying the subgraph, or None."""
+        token = token_registry.resolve_address(token_address)
+        if token is None:
+            return None
+        if token == token_registry.weth.address:
+            return 100_000_000.0
+        return self._cache.get(token)
+
+    def _store(self, token: str, liquidity: float):
+        self._cache[token] = liquidity
+        self._last_known[token] = liquidity
+
+    async def fetch_pool_liquidity(self, token_address: str) -> float:
+        """
+        Returns the USD reserve of the deepest token/WETH pair.
+        Misses arriving within one batching window share a single subgraph query.
+        Raises on upstream failure so callers can decide how to degrade.
+        """
+        # Symbols are resolved locally; one the registry does not know never reaches the subgraph
+        token = token_registry.resolve_address(token_address)
+        if token is None:
+            raise LookupError(f"Unknown token '{token_address}'")
+
+        # Skip if token is WETH (infinite liquidity conceptually for this check)
+        if token == token_registry.weth.address:
+            return 100_000_000.0
+
+        cached = self._cache.get(token)
+        if cached is not None:
+            self.hits += 1
+            return cached
+        self.misses += 1
+
+        future = self._pending.get(token) or self._inflight.get(token)
+        if future is None:
+            future = self._enqueue(token)
+
+        # Shield so a caller's timeout does not cancel a lookup others share
+        return await asyncio.shield(future)
 
     async def get_pool_liquidity(self, token_address: str) -> float:
         try:
-            # 1. Get ETH Price for conversion
-            eth_price = await self.price_feed.get_eth_price()
-            
-            # 2. Query pairs
-            weth = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
-            token = token_address.lower()
-            
-            # Skip if token is WETH (infinite liquidity conceptually for this check)
-            if token == weth:
-                return 100_000_000.0
-
-            query = """
-            query {
-              pairs(where: { token0_in: ["%s", "%s"], token1_in: ["%s", "%s"] }, first: 1, orderBy: reserveUSD, orderDirection: desc) {
-                reserveUSD
-              }
-            }
-            """ % (token, weth, token, weth)
-
-            async with httpx.AsyncClient() as client:
-                response = await client.post(self.subgraph_url, json={"query": query})
-                
-                if response.status_code != 200:
-                    print(f"   [Liquidity] Subgraph returned status {response.status_code}")
-                    return 50000.0
-                    
-                data = response.json()
-                pairs = data.get("data", {}).get("pairs", [])
-                
-                if pairs:
-                    return float(pairs[0]["reserveUSD"])
-                
-                return 50000.0 
-                
+            return await self.fetch_pool_liquidity(token_address)
         except Exception as e:
             print(f"   [Liquidity] Error fetching liquidity: {e}")
-            return 100000.0 # Safe fallback
\ No newline at end of file
+            return self.default_liquidity_usd
+
+    # --- Micro-batching ---
+
+    def _enqueue(self, token: str) -> asyncio.Future:
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        # Mark exceptions as retrieved when every waiter has timed out
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self._pending[token] = future
+
+        if len(self._pending) >= settings.liquidity_batch_max_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(settings.liquidity_batch_window_ms / 1000, self._flush)
+        return future
+
+    def _flush(self):
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if not self._pending:
+            return
+
+        batch, self._pending = self._pending, {}
+        self._inflight.update(batch)
+        asyncio.create_task(self._run_batch(batch))
+
+    async def _run_batch(self, batch: Dict[str, asyncio.Future]):
+        self.batches += 1
+        self.tokens_batched += len(batch)
+        try:
+            results = await self._query_batch(list(batch))
+        except Exception as e:
+            self.errors += 1
+            for future in batch.values():
+                if not future.done():
+                    future.set_exception(e)
+        else:
+            for token, future in batch.items():
+                if future.done():
+                    continue
+                if token in results:
+                    future.set_result(results[token])
+                else:
+                    future.set_exception(LookupError(f"Subgraph returned no result for {token}"))
+        finally:
+            for token in batch:
+                self._inflight.pop(token, None)
+
+    async def _query_batch(self, tokens: List[str]) -> Dict[str, float]:
+        entries = await self.shared.fetch("liquidity", tokens, settings.liquidity_cache_ttl_seconds, self._query_upstream)
+        results = {}
+        for token, (_, liquidity) in entries.items():
+            self._store(token, liquidity)
+            results[token] = liquidity
+        return results
+
+    async def _query_upstream(self, tokens: List[str]) -> Dict[str, float]:
+        aliases = {f"t{i}": token for i, token in enumerate(tokens)}
+        weth = token_registry.weth.address
+        body = "".join(
+            PAIR_QUERY % (alias, token, weth, token, weth)
+            for alias, token in aliases.items()
+        )
+        data = await self._post("query {%s\n}" % body)
+
+        results = {}
+        for alias, token in aliases.items():
+            pairs = data.get(alias)
+            if pairs is None:
+                continue # Alias failed inside an otherwise successful query
+            results[token] = float(pairs[0]["reserveUSD"]) if pairs else self.no_pool_liquidity_usd
+        return results
+
+    async def _post(self, query: str) -> Dict[str, Any]:
+        return await query_subgraph(query, self.clients)
+
+    # --- Warm-up ---
+
+    async def warm_up(self, top_n: Optional[int] = None) -> int:
+        """Preloads liquidity for the deepest WETH pools. Returns the number of tokens cached."""
+        top_n = top_n or settings.liquidity_warmup_top_pools
+        # One worker queries the subgraph; the others (and a worker restarted
+        # within the TTL) fill their own cache from the copy it published
+        try:
+            fetched = await self.shared.fetch_blob(
+                "warmup", "liquidity", settings.liquidity_cache_ttl_seconds, lambda: self._query_top_pools(top_n)
+            )
+        except Exception as e:
+            print(f"   [Liquidity] Warm-up failed: {e}")
+            return 0
+        if fetched is None:
+            print("   [Liquidity] Warm-up still running in another worker")
+            return 0
+
+        _, deepest = fetched
+        for token, liquidity in deepest.items():
+            self._store(token, liquidity)
+
+        print(f"   [Liquidity] Warmed {len(deepest)} pools")
+        return len(deepest)
+
+    async def _query_top_pools(self, top_n: int) -> Dict[str, float]:
+        weth = token_registry.weth.address
+        data = await self._post(TOP_POOLS_QUERY % (weth, top_n, weth, top_n))
+
+        deepest: Dict[str, float] = {}
+        for pair in data.get("base") or []:
+            token, reserve = pair["token1"]["id"].lower(), float(pair["reserveUSD"])
+            deepest[token] = max(reserve, deepest.get(token, 0.0))
+        for pair in data.get("quote") or []:
+            token, reserve = pair["token0"]["id"].lower(), float(pair["reserveUSD"])
+            deepest[token] = max(reserve, deepest.get(token, 0.0))
+
+        # Per-token entries too, so other workers' first misses are served from the table
+        for token, liquidity in deepest.items():
+            self.shared.put("liquidity", token, liquidity)
+        return deepest
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "tokens_cached": len(self._cache),
+            "pending": len(self._pending),
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "misses": self.misses,
+            "batches": self.batches,
+            "tokens_batched": self.tokens_batched,
+            "errors": self.errors,
+            "ttl_seconds": settings.liquidity_cache_ttl_seconds,
+        }
+
+
+# Shared instance for the whole process
+liquidity_fetcher = LiquidityFetcher()
@@ -0,0 +1,65 @@
+# backend/slippage-engine/app/services/llm_client.py
+
+import importlib
+import time
+from typing import Any, Dict, Optional
+
+from ..config import settings
+
+
+class LLMClient:
+    """
+    The Groq client, built on first use instead of at import time.
+
+    Importing the app stays fast and never touches the Groq SDK; the
+    warm-up phase loads it in the background when an API key is set, so
+    the first chat request does not pay for it either. get() returns None
+    when no key is configured or the client could not be created, and
+    callers answer from the offline knowledge base.
+    """
+
+    def __init__(self, api_key: Optional[str] = None):
+        self.api_key = api_key if api_key is not None else settings.groq_api_key
+        self._client: Optional[Any] = None
+        self._failed = False
+        self._announced = False
+        self.load_seconds: Optional[float] = None
+
+    @property
+    def configured(self) -> bool:
+        return bool(self.api_key) and not self._failed
+
+    @property
+    def loaded(self) -> bool:
+        return self._client is not None
+
+    def get(self) -> Optional[Any]:
+        if self._client is not None or self._failed:
+            return self._client
+        if not self.api_key:
+            if not self._announced:
+                self._announced = True
+                print("   ⚠️  No GROQ_API_KEY found. Using Offline Mode.")
+            return None
+
+        started = time.perf_counter()
+        try:
+            groq = importlib.import_module("groq")
+            self._client = groq.AsyncGroq(api_key=self.api_key, timeout=settings.llm_request_timeout_seconds)
+            self.load_seconds = time.perf_counter() - started
+            print("   ✅ Groq AI Connected (Llama 3.3)")
+        except Exception as e:
+            self._failed = True
+            print(f"   ⚠️  Groq Client Error: {e}")
+        return self._client
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "configured": self.configured,
+            "loaded": self.loaded,
+            "load_ms": round(self.load_seconds * 1000, 1) if self.load_seconds is not None else None,
+        }
+
+
+# Shared instance for the whole process
+llm_client = LLMClient()
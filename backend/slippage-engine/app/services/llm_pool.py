@@ -0,0 +1,133 @@
+# backend/slippage-engine/app/services/llm_pool.py
+
+import asyncio
+import re
+from contextlib import asynccontextmanager
+from typing import Any, Dict, Optional
+
+from cachetools import TTLCache
+
+from ..config import settings
+
+
+class LLMOverloaded(Exception):
+    """Raised when an LLM call is shed; carries the HTTP status to answer with."""
+
+    def __init__(self, status_code: int, detail: str, retry_after: int = 1):
+        super().__init__(detail)
+        self.status_code = status_code
+        self.detail = detail
+        self.retry_after = retry_after
+
+
+class LLMPool:
+    """
+    Dedicated admission gate for LLM calls, separate from everything else
+    in the process.
+
+    - At most max_concurrency calls run at once.
+    - At most max_queue callers wait for a slot; more are rejected at once (429).
+    - A caller that waits longer than queue_timeout_ms gives up (503).
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        max_queue: Optional[int] = None,
+        queue_timeout_ms: Optional[int] = None
+    ):
+        self.max_concurrency = max_concurrency or settings.llm_max_concurrency
+        self.max_queue = max_queue if max_queue is not None else settings.llm_max_queue
+        self.queue_timeout_ms = queue_timeout_ms or settings.llm_queue_timeout_ms
+        self._slots = asyncio.Semaphore(self.max_concurrency)
+
+        self.active = 0
+        self.waiting = 0
+
+        # Counters
+        self.admitted = 0
+        self.rejected = 0
+        self.timed_out = 0
+
+    def saturated(self) -> bool:
+        """True if a new caller would be rejected right now."""
+        return self.active + self.waiting >= self.max_concurrency + self.max_queue
+
+    @asynccontextmanager
+    async def slot(self):
+        if self.saturated():
+            self.rejected += 1
+            raise LLMOverloaded(429, "Assistant is busy, please retry shortly")
+
+        self.waiting += 1
+        try:
+            await asyncio.wait_for(self._slots.acquire(), self.queue_timeout_ms / 1000)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            raise LLMOverloaded(503, "Assistant queue timed out", retry_after=2)
+        finally:
+            self.waiting -= 1
+
+        self.active += 1
+        self.admitted += 1
+        try:
+            yield
+        finally:
+            self.active -= 1
+            self._slots.release()
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "active": self.active,
+            "waiting": self.waiting,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+            "queue_timeout_ms": self.queue_timeout_ms,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+        }
+
+
+class ChatAnswerCache:
+    """
+    LLM answers keyed by the normalized question. The system prompt is
+    static, so the same question gets an equivalent answer until the TTL ends.
+    """
+
+    def __init__(self, ttl_seconds: Optional[float] = None, max_entries: Optional[int] = None):
+        self._answers: TTLCache = TTLCache(
+            maxsize=max_entries or settings.chat_cache_max_entries,
+            ttl=ttl_seconds or settings.chat_cache_ttl_seconds
+        )
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def normalize(question: str) -> str:
+        # Case, punctuation and spacing do not change the question
+        return " ".join(re.sub(r"[^\w\s$]", " ", question.lower()).split())
+
+    def get(self, question: str) -> Optional[str]:
+        answer = self._answers.get(self.normalize(question))
+        if answer is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return answer
+
+    def put(self, question: str, answer: str):
+        self._answers[self.normalize(question)] = answer
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._answers),
+            "hits": self.hits,
+            "misses": self.misses,
+            "ttl_seconds": self._answers.ttl,
+        }
+
+
+# Shared instances for the whole process
+llm_pool = LLMPool()
+chat_answer_cache = ChatAnswerCache()
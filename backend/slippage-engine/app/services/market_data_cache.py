@@ -0,0 +1,222 @@
+# backend/slippage-engine/app/services/market_data_cache.py
+
+import asyncio
+import time
+from bisect import bisect_right
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..config import settings
+from .http_clients import HttpClients, http_clients
+from .price_cache import PriceCache, price_cache
+from .shared_cache import SharedCache, shared_cache as default_shared_cache
+from .token_registry import TokenRegistry, token_registry
+
+# Precomputed history resolutions (bucket width in ms)
+RESOLUTIONS = {"1m": 60_000, "5m": 300_000, "1h": 3_600_000}
+
+HISTORY_WINDOW_MS = 24 * 3600 * 1000
+
+
+class PriceSeries:
+    """24h of (timestamp ms, price) points for one token, plus its downsampled views."""
+
+    def __init__(self):
+        self.raw: List[Tuple[int, float]] = []
+        # resolution -> (timestamps, points) so `since` filters with one bisect
+        self.views: Dict[str, Tuple[List[int], List[Dict[str, float]]]] = {}
+        self.updated_at: Optional[float] = None
+
+    def merge(self, points: List[Tuple[int, float]]):
+        merged = dict(self.raw)
+        merged.update(points)
+        cutoff = max(merged) - HISTORY_WINDOW_MS if merged else 0
+        self.raw = sorted((ts, price) for ts, price in merged.items() if ts >= cutoff)
+        self.views = {name: self._downsample(width) for name, width in RESOLUTIONS.items()}
+        self.updated_at = time.time()
+
+    def _downsample(self, width_ms: int) -> Tuple[List[int], List[Dict[str, float]]]:
+        # Last price in each bucket (the bucket's close)
+        closes: Dict[int, Tuple[int, float]] = {}
+        for ts, price in self.raw:
+            closes[ts // width_ms] = (ts, price)
+
+        timestamps, points = [], []
+        previous = None
+        for ts, price in closes.values():
+            timestamps.append(ts)
+            points.append({"timestamp": ts, "price": price, "change": price - previous if previous is not None else 0})
+            previous = price
+        return timestamps, points
+
+    def since(self, resolution: str, since_ms: Optional[int] = None) -> List[Dict[str, float]]:
+        timestamps, points = self.views.get(resolution, ([], []))
+        if since_ms is None:
+            return points
+        return points[bisect_right(timestamps, since_ms):]
+
+
+class MarketDataCache:
+    """
+    In-memory quotes and 24h price history for the registry's market tokens.
+
+    A background loop refreshes quotes through the shared price cache and
+    history from CoinGecko's market_chart; each quote is also appended to
+    the history so the 1m view stays current. Reads never wait on CoinGecko.
+    With several workers, each chart is fetched by one worker and read by
+    the others from the shared cache.
+    """
+
+    def __init__(
+        self,
+        clients: Optional[HttpClients] = None,
+        prices: Optional[PriceCache] = None,
+        tokens: Optional[TokenRegistry] = None,
+        shared: Optional[SharedCache] = None
+    ):
+        self.clients = clients or http_clients
+        self.shared = shared or default_shared_cache
+        self.prices = prices or price_cache
+        self.tokens = tokens or token_registry
+        self.quotes: Dict[str, Dict[str, float]] = {}
+        self.quotes_updated_at: Optional[float] = None
+        # CoinGecko id -> series; tokens added by a registry reload get one on first refresh
+        self.series: Dict[str, PriceSeries] = {t.coingecko_id: PriceSeries() for t in self.tokens.market_tokens}
+        self._task: Optional[asyncio.Task] = None
+        self._history_pass: Optional[asyncio.Future] = None # The one history pass in flight
+        self._next_history = 0.0 # Monotonic time the next history pass is due
+
+        # Counters
+        self.quote_refreshes = 0
+        self.history_refreshes = 0
+        self.errors = 0
+
+    # --- Lifecycle ---
+
+    async def start(self):
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await self.refresh_quotes()
+                if time.monotonic() >= self._next_history:
+                    await self.refresh_history()
+            except Exception as e:
+                self.errors += 1
+                print(f"   [MarketData] Refresh failed: {e}")
+            await asyncio.sleep(settings.market_quotes_refresh_seconds)
+
+    # --- Refresh ---
+
+    async def refresh_quotes(self):
+        ids = [t.coingecko_id for t in self.tokens.market_tokens]
+        quotes = await self.prices.get_many(ids)
+        if not quotes:
+            self.errors += 1
+            return
+        self.quotes.update(quotes)
+        self.quotes_updated_at = time.time()
+        self.quote_refreshes += 1
+
+        now_ms = int(self.quotes_updated_at * 1000)
+        for asset_id, quote in quotes.items():
+            self.series.setdefault(asset_id, PriceSeries()).merge([(now_ms, quote["usd"])])
+
+    async def refresh_history(self):
+        """
+        Refetches every market token's chart. Callers that overlap (the loop
+        and warm-up at startup) share one pass instead of each starting one.
+        """
+        if self._history_pass is None:
+            self._next_history = time.monotonic() + settings.market_history_refresh_seconds
+            self._history_pass = asyncio.ensure_future(self._refresh_history())
+            self._history_pass.add_done_callback(self._history_pass_done)
+        # Shielded so a cancelled caller does not cancel the pass for the other one
+        await asyncio.shield(self._history_pass)
+
+    def _history_pass_done(self, _: asyncio.Future):
+        self._history_pass = None
+
+    async def _refresh_history(self):
+        for token in self.tokens.market_tokens:
+            try:
+                fetched = await self.shared.fetch_blob(
+                    "market_history", token.coingecko_id, settings.market_history_refresh_seconds,
+                    lambda: self._fetch_chart(token.coingecko_id)
+                )
+                if fetched is None:
+                    # Another worker is still fetching it; look again on the next loop pass
+                    self._next_history = time.monotonic()
+                    continue
+                _, prices = fetched
+                self.series.setdefault(token.coingecko_id, PriceSeries()).merge([(int(ts), float(price)) for ts, price in prices])
+                self.history_refreshes += 1
+            except Exception as e:
+                self.errors += 1
+                print(f"   [MarketData] Error fetching history for {token.symbol}: {e}")
+
+    async def _fetch_chart(self, coingecko_id: str) -> List[List[float]]:
+        resp = await self.clients.coingecko.get(
+            f"{settings.coingecko_api_url}/coins/{coingecko_id}/market_chart",
+            params={"vs_currency": "usd", "days": "1"}
+        )
+        resp.raise_for_status()
+        return resp.json().get("prices", [])
+
+    async def warm_up(self) -> int:
+        """Fills quotes and history now rather than on the loop's first pass. Returns tokens with history."""
+        # Joins the loop's first history pass if it already started
+        await asyncio.gather(self.refresh_quotes(), self.refresh_history())
+        return sum(1 for series in self.series.values() if series.raw)
+
+    # --- Reads ---
+
+    def symbols(self) -> List[Dict[str, Any]]:
+        """Latest quote per market token; empty until the first refresh lands."""
+        if not self.quotes:
+            return []
+        result = []
+        for token in self.tokens.market_tokens:
+            quote = self.quotes.get(token.coingecko_id, {})
+            result.append({
+                "id": token.symbol,
+                "name": token.name,
+                "price": quote.get("usd", 0),
+                "change24h": quote.get("usd_24h_change", 0),
+                "volume": "N/A"
+            })
+        return result
+
+    def history(self, asset_id: str, resolution: str, since_ms: Optional[int] = None) -> Optional[List[Dict[str, float]]]:
+        """Cached history at a resolution, newer than since_ms. None if nothing is cached yet."""
+        series = self.series.get(asset_id)
+        if series is None or not series.raw:
+            return None
+        return series.since(resolution, since_ms)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "running": self._task is not None,
+            "quotes_cached": len(self.quotes),
+            "quotes_updated_at": self.quotes_updated_at,
+            "history_points": {asset_id: len(s.raw) for asset_id, s in self.series.items()},
+            "history_updated_at": {asset_id: s.updated_at for asset_id, s in self.series.items()},
+            "quote_refreshes": self.quote_refreshes,
+            "history_refreshes": self.history_refreshes,
+            "errors": self.errors,
+            "resolutions": list(RESOLUTIONS),
+        }
+
+
+# Shared instance for the whole process
+market_data_cache = MarketDataCache()
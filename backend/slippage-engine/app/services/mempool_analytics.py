@@ -0,0 +1,330 @@
+# backend/slippage-engine/app/services/mempool_analytics.py
+
+import time
+from collections import deque
+from typing import Any, Deque, Dict, Iterable, List, Optional
+
+from cachetools import LRUCache
+
+from ..config import settings
+from .token_registry import is_weth
+
+
+def bot_activity_score(tx_count: int, suspicious: int, sandwiches: int, avg_gas: float) -> float:
+    """Same weights as PairAggregator.calculateBotActivityScore in the listener."""
+    score = 0.0
+    # Ratio of suspicious transactions (0 - 0.3)
+    if tx_count > 0:
+        score += min(suspicious / tx_count, 1) * 0.3
+    # Sandwich count (0 - 0.35)
+    if sandwiches >= 5:
+        score += 0.35
+    elif sandwiches >= 3:
+        score += 0.25
+    elif sandwiches >= 1:
+        score += 0.15
+    # High average gas (0 - 0.2)
+    if avg_gas > 100:
+        score += 0.2
+    elif avg_gas > 75:
+        score += 0.15
+    elif avg_gas > 50:
+        score += 0.1
+    # Transaction volume (0 - 0.15)
+    if tx_count > 100:
+        score += 0.15
+    elif tx_count > 50:
+        score += 0.1
+    elif tx_count > 20:
+        score += 0.05
+    return min(max(score, 0.0), 1.0)
+
+
+class _Tx:
+    """The fields of a decoded transaction the detector looks at."""
+
+    __slots__ = ("tx_hash", "sender", "direction", "gas", "amount", "suspicious", "seen_at")
+
+    def __init__(self, tx: Dict[str, Any], gas: float, suspicious: bool, seen_at: float):
+        self.tx_hash = tx.get("txHash")
+        self.sender = str(tx.get("from", "")).lower()
+        # Some demo scenarios omit the direction; WETH in means buying the token
+        self.direction = tx.get("direction") or ("buy" if is_weth((tx.get("tokenIn") or {}).get("address", "")) else "sell")
+        self.gas = gas
+        try:
+            self.amount = float(tx.get("amountIn") or 0)
+        except (TypeError, ValueError):
+            self.amount = 0.0
+        self.suspicious = suspicious
+        self.seen_at = seen_at
+
+
+class PairWindow:
+    """
+    Sliding-window stats for one pair: a ring of per-second buckets plus
+    running totals. Advancing the window subtracts only the buckets that
+    fell out of it, so adds and reads are O(1) amortized regardless of
+    how many transactions the window holds.
+    """
+
+    def __init__(self, pair: str, seconds: int):
+        self.pair = pair
+        self.seconds = seconds
+        self.tx_count = [0] * seconds
+        self.suspicious = [0] * seconds
+        self.gas = [0.0] * seconds
+        self.sandwiches = [0] * seconds
+        self.head: Optional[int] = None # Newest second covered by the ring
+
+        self.total_txs = 0
+        self.total_suspicious = 0
+        self.total_gas = 0.0
+        self.total_sandwiches = 0
+
+        # Short look-back for sandwich detection, bounded in time and size
+        self.recent: Deque[_Tx] = deque(maxlen=settings.mempool_sandwich_max_txs)
+        self.reported_victims: set = set()
+        self.last_tx_at = 0.0
+
+    def advance(self, second: int):
+        if self.head is None:
+            self.head = second
+            return
+        gap = second - self.head
+        if gap <= 0:
+            return
+        if gap >= self.seconds:
+            # Everything expired
+            self.tx_count = [0] * self.seconds
+            self.suspicious = [0] * self.seconds
+            self.gas = [0.0] * self.seconds
+            self.sandwiches = [0] * self.seconds
+            self.total_txs = self.total_suspicious = self.total_sandwiches = 0
+            self.total_gas = 0.0
+        else:
+            for s in range(self.head + 1, second + 1):
+                i = s % self.seconds
+                self.total_txs -= self.tx_count[i]
+                self.total_suspicious -= self.suspicious[i]
+                self.total_gas -= self.gas[i]
+                self.total_sandwiches -= self.sandwiches[i]
+                self.tx_count[i] = self.suspicious[i] = self.sandwiches[i] = 0
+                self.gas[i] = 0.0
+            if self.total_txs == 0:
+                self.total_gas = 0.0 # Drop accumulated float error
+        self.head = second
+
+    def _bucket(self, second: int) -> Optional[int]:
+        self.advance(second)
+        if self.head - second >= self.seconds:
+            return None # Older than the window
+        return second % self.seconds
+
+    def add_transaction(self, second: int, gas: float, suspicious: bool):
+        i = self._bucket(second)
+        if i is None:
+            return
+        self.tx_count[i] += 1
+        self.gas[i] += gas
+        self.total_txs += 1
+        self.total_gas += gas
+        if suspicious:
+            self.suspicious[i] += 1
+            self.total_suspicious += 1
+
+    def add_sandwich(self, second: int):
+        i = self._bucket(second)
+        if i is None:
+            return
+        self.sandwiches[i] += 1
+        self.total_sandwiches += 1
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        self.advance(int(now))
+        avg_gas = self.total_gas / self.total_txs if self.total_txs else 0.0
+        score = bot_activity_score(self.total_txs, self.total_suspicious, self.total_sandwiches, avg_gas)
+        now_ms = int(now * 1000)
+        return {
+            "pair": self.pair,
+            "timestamp": now_ms,
+            "transactions_5min": self.total_txs,
+            "suspicious_tx_count": self.total_suspicious,
+            "sandwiches_5min": self.total_sandwiches,
+            "avg_gas_gwei": round(avg_gas, 2),
+            "bot_activity_score": round(score, 3),
+            "last_update": now_ms,
+            "source": "engine",
+        }
+
+
+class MempoolAnalytics:
+    """
+    In-process replacement for the listener's pair aggregator. Ingests
+    decoded transactions (the demo-data shape) and keeps per-pair window
+    stats that the slippage calculator reads without a network hop.
+
+    A pair is reachable by the listener's pair string ("PEPE-WETH") and, for
+    WETH pairs, by the other token's address, which is how the engine looks
+    pairs up.
+    """
+
+    def __init__(self, window_seconds: Optional[int] = None, max_pairs: Optional[int] = None):
+        self.window_seconds = window_seconds or settings.mempool_window_seconds
+        # Window key -> PairWindow; aliases map every lookup key onto a window key
+        self._windows: LRUCache = LRUCache(maxsize=max_pairs or settings.mempool_max_pairs)
+        self._aliases: Dict[str, str] = {}
+
+        # Counters
+        self.transactions = 0
+        self.sandwiches = 0
+        self.rejected = 0
+        self.hits = 0
+        self.misses = 0
+
+    # --- Ingest ---
+
+    @staticmethod
+    def pair_keys(tx: Dict[str, Any]) -> List[str]:
+        """Lookup keys for a transaction's pair: pair string first, then the non-WETH token."""
+        keys = []
+        if tx.get("pair"):
+            keys.append(str(tx["pair"]).upper())
+        token_in = (tx.get("tokenIn") or {}).get("address", "")
+        token_out = (tx.get("tokenOut") or {}).get("address", "")
+        if is_weth(token_in) and token_out:
+            keys.append(token_out.upper())
+        elif is_weth(token_out) and token_in:
+            keys.append(token_in.upper())
+        return keys
+
+    def ingest(self, tx: Dict[str, Any], now: Optional[float] = None) -> Optional[str]:
+        """
+        Adds one decoded transaction, bucketed by arrival time like the
+        listener does. Returns the pair's window key, or None if rejected.
+        """
+        keys = self.pair_keys(tx)
+        try:
+            gas = float(tx.get("gasPriceGwei", 0))
+        except (TypeError, ValueError):
+            keys = []
+        if not keys:
+            self.rejected += 1
+            return None
+
+        now = time.time() if now is None else now
+        key = keys[0]
+        window = self._windows.get(key)
+        if window is None:
+            window = self._windows[key] = PairWindow(key, self.window_seconds)
+            if len(self._aliases) > 2 * self._windows.maxsize:
+                # Forget aliases of evicted pairs
+                self._aliases = {a: k for a, k in self._aliases.items() if k in self._windows}
+        for alias in keys:
+            self._aliases[alias] = key
+
+        suspicious = bool(tx.get("isSuspicious")) or gas > settings.mempool_suspicious_gas_gwei
+        second = int(now)
+        window.add_transaction(second, gas, suspicious)
+        window.last_tx_at = now
+        self.transactions += 1
+
+        entry = _Tx(tx, gas, suspicious, now)
+        if self._detect_sandwich(window, entry):
+            window.add_sandwich(second)
+            self.sandwiches += 1
+        return key
+
+    def ingest_many(self, txs: Iterable[Dict[str, Any]], now: Optional[float] = None) -> List[str]:
+        """Ingests a batch; returns the distinct window keys that changed."""
+        changed = {}
+        for tx in txs:
+            key = self.ingest(tx, now)
+            if key is not None:
+                changed[key] = True
+        return list(changed)
+
+    # --- Sandwich detection ---
+
+    def _detect_sandwich(self, window: PairWindow, tx: _Tx) -> bool:
+        """
+        Incremental form of the listener's sandwich detector: only patterns
+        the new transaction takes part in are checked, over a look-back that
+        is bounded in both time and size.
+        """
+        recent = window.recent
+        cutoff = tx.seen_at - settings.mempool_sandwich_window_seconds
+        while recent and recent[0].seen_at <= cutoff:
+            window.reported_victims.discard(recent.popleft().tx_hash)
+        if len(recent) == recent.maxlen:
+            window.reported_victims.discard(recent[0].tx_hash)
+        recent.append(tx)
+        if len(recent) < 3:
+            return False
+
+        # One pass: each sender's buys and sells in the look-back
+        legs: Dict[str, tuple] = {}
+        for t in recent:
+            if t.direction in ("buy", "sell"):
+                legs.setdefault(t.sender, ([], []))[t.direction == "sell"].append(t)
+
+        reported = window.reported_victims
+        if tx.direction == "buy":
+            # The new buy as the victim of an attacker already in the window
+            for attacker, (buys, sells) in legs.items():
+                if attacker != tx.sender and buys and sells and self._find_sandwich(buys, sells, [tx], reported):
+                    return True
+        # The new transaction as the attacker's frontrun or backrun
+        buys, sells = legs.get(tx.sender, ([], []))
+        if not buys or not sells:
+            return False
+        victims = [t for t in recent if t.sender != tx.sender and t.direction == "buy"]
+        return self._find_sandwich(buys, sells, victims, reported)
+
+    @staticmethod
+    def _find_sandwich(buys: List[_Tx], sells: List[_Tx], victims: List[_Tx], reported: set) -> bool:
+        min_ratio = settings.mempool_sandwich_min_gas_ratio
+        for frontrun in buys:
+            for backrun in sells:
+                # Attacker legs should both outbid the victim and be close to each other
+                if abs(frontrun.gas - backrun.gas) / ((frontrun.gas + backrun.gas) / 2 or 1) > 0.3:
+                    continue
+                valid = [
+                    v for v in victims
+                    if 0 < v.gas < frontrun.gas
+                    and frontrun.gas / v.gas >= min_ratio
+                    and backrun.gas / v.gas >= min_ratio
+                    and v.tx_hash not in reported
+                ]
+                if valid:
+                    # Count the largest victim, as the listener does
+                    reported.add(max(valid, key=lambda v: v.amount).tx_hash)
+                    return True
+        return False
+
+    # --- Reads ---
+
+    def get(self, pair: str, now: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """Current window stats for a pair, or None if no transaction for it was ever ingested."""
+        key = self._aliases.get(pair.upper())
+        window = self._windows.get(key) if key else None
+        if window is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return window.snapshot(time.time() if now is None else now)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.mempool_analytics_enabled,
+            "pairs_tracked": len(self._windows),
+            "transactions": self.transactions,
+            "sandwiches": self.sandwiches,
+            "rejected": self.rejected,
+            "hits": self.hits,
+            "misses": self.misses,
+            "window_seconds": self.window_seconds,
+        }
+
+
+# Shared instance for the whole process
+mempool_analytics = MempoolAnalytics()
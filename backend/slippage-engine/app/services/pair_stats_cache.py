@@ -0,0 +1,254 @@
+# backend/slippage-engine/app/services/pair_stats_cache.py
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Any, List, Optional, Set, Tuple
+
+from ..config import settings
+from .mempool_analytics import MempoolAnalytics, mempool_analytics
+from .token_registry import token_registry
+
+if TYPE_CHECKING:
+    import socketio
+
+
+class PairStatsCache:
+    """
+    Process-local map of pair -> latest stats, fed by the listener's Socket.IO
+    `pair_update` pushes. Keeps one connection open and reconnects with
+    exponential backoff; reads are a dict lookup with no network hop.
+
+    The listener names pairs "PEPE-WETH" while the engine asks by token
+    address; both map onto token_registry.pair_key, so a push is found by
+    either name and listeners are notified with that key.
+
+    With mempool analytics enabled it also subscribes to the listener's raw
+    `transaction` stream and feeds it to the in-process analytics engine.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str] = None,
+        max_age_seconds: Optional[float] = None,
+        analytics: Optional[MempoolAnalytics] = None
+    ):
+        self.url = url or settings.listener_ws_url
+        self.analytics = analytics or mempool_analytics
+        self.max_age_seconds = max_age_seconds if max_age_seconds is not None else settings.pair_stats_max_age_seconds
+
+        # pair key -> (received_at monotonic, stats)
+        self._stats: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        # Listener pair ids subscribed to
+        self._wanted: Set[str] = set()
+        # Called with the pair key after every pushed update
+        self._listeners: List[Callable[[str], None]] = []
+
+        self._sio: Optional["socketio.AsyncClient"] = None
+        self._connected_event = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+
+        # Counters
+        self.connected = False
+        self.updates_received = 0
+        self.transactions_received = 0
+        self.reconnects = 0
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+
+    @staticmethod
+    def _key(pair: str) -> str:
+        return token_registry.pair_key(pair)
+
+    # --- Lifecycle ---
+
+    async def start(self):
+        if self._task or not settings.pair_stats_push_enabled:
+            return
+        self._stopping = False
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        self._stopping = True
+        if self._sio is not None:
+            try:
+                await self._sio.disconnect()
+            except Exception:
+                pass
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except (asyncio.CancelledError, Exception):
+                pass
+        self._task = None
+        self.connected = False
+
+    async def wait_connected(self) -> bool:
+        """Resolves once the listener connection is up (warm-up waits on this)."""
+        await self._connected_event.wait()
+        return True
+
+    def _build_client(self) -> "socketio.AsyncClient":
+        # Imported here so the app does not load socketio/aiohttp unless push is enabled
+        import socketio
+        # Reconnection is handled by _run so the initial connect is retried too
+        sio = socketio.AsyncClient(reconnection=False, handle_sigint=False)
+        sio.on("connect", self._on_connect)
+        sio.on("disconnect", self._on_disconnect)
+        sio.on("pairs_list", self._on_pairs_list)
+        sio.on("pair_update", self._on_pair_update)
+        sio.on("transaction", self._on_transaction)
+        return sio
+
+    async def _run(self):
+        delay = 1.0
+        while not self._stopping:
+            self._sio = self._build_client()
+            try:
+                await self._sio.connect(self.url, transports=["websocket"])
+                delay = 1.0
+                await self._sio.wait()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"   [PairStats] Listener connection failed: {e}")
+            finally:
+                self.connected = False
+                self._connected_event.clear()
+                try:
+                    await self._sio.disconnect()
+                except Exception:
+                    pass
+
+            if self._stopping:
+                break
+            self.reconnects += 1
+            await asyncio.sleep(delay)
+            delay = min(delay * 2, settings.listener_reconnect_max_delay_seconds)
+
+    # --- Socket.IO handlers ---
+
+    async def _on_connect(self):
+        self.connected = True
+        self._connected_event.set()
+        print(f"   [PairStats] Connected to listener at {self.url}")
+        # Subscriptions do not survive a reconnect on the listener side
+        for pair in list(self._wanted):
+            await self._sio.emit("subscribe", {"pair": pair})
+        await self._sio.emit("get_pairs")
+        if settings.mempool_analytics_enabled:
+            await self._sio.emit("subscribe_transactions")
+
+    async def _on_disconnect(self, *args):
+        self.connected = False
+        self._connected_event.clear()
+        print("   [PairStats] Disconnected from listener")
+
+    async def _on_pairs_list(self, data):
+        for entry in (data or {}).get("pairs", []):
+            pair = entry.get("pair") if isinstance(entry, dict) else entry
+            if pair:
+                await self._subscribe(pair)
+
+    async def _on_pair_update(self, stats):
+        pair = (stats or {}).get("pair")
+        if not pair:
+            return
+        key = self._key(pair)
+        self._stats[key] = (time.monotonic(), stats)
+        self.updates_received += 1
+        for listener in self._listeners:
+            listener(key)
+
+    async def _on_transaction(self, tx):
+        if settings.mempool_analytics_enabled and isinstance(tx, dict):
+            self.transactions_received += 1
+            self.ingest_transactions([tx])
+
+    def ingest_transactions(self, txs: List[Dict[str, Any]]) -> int:
+        """
+        Feeds decoded transactions to the analytics engine and notifies
+        listeners of every affected pair. Returns how many were accepted.
+        """
+        accepted = 0
+        keys: Dict[str, bool] = {}
+        for tx in txs:
+            if self.analytics.ingest(tx) is None:
+                continue
+            accepted += 1
+            # The pair string and the token address collapse onto one key
+            for key in self.analytics.pair_keys(tx):
+                keys[self._key(key)] = True
+        for key in keys:
+            for listener in self._listeners:
+                listener(key)
+        return accepted
+
+    async def _subscribe(self, pair: str):
+        """Subscribes to a listener pair id ("PEPE-WETH")."""
+        pair = pair.upper()
+        if pair in self._wanted:
+            return
+        self._wanted.add(pair)
+        if self.connected and self._sio is not None:
+            await self._sio.emit("subscribe", {"pair": pair})
+
+    def add_listener(self, listener: Callable[[str], None]):
+        self._listeners.append(listener)
+
+    def remove_listener(self, listener: Callable[[str], None]):
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    # --- Reads ---
+
+    def watch(self, pair: str):
+        """Asks the listener to start pushing a pair (token or listener pair id) we have not seen yet."""
+        listener_pair = pair.upper() if "-" in pair else token_registry.listener_pair(pair)
+        if listener_pair is None or listener_pair in self._wanted or not self._task:
+            return
+        asyncio.create_task(self._subscribe(listener_pair))
+
+    def get(self, pair: str) -> Optional[Dict[str, Any]]:
+        """Returns the latest pushed stats for a pair, or None if missing or stale."""
+        entry = self._stats.get(self._key(pair))
+        if entry is None:
+            self.misses += 1
+            return None
+        received_at, stats = entry
+        if time.monotonic() - received_at > self.max_age_seconds:
+            self.stale += 1
+            return None
+        self.hits += 1
+        return stats
+
+    def last_known(self, pair: str) -> Optional[Dict[str, Any]]:
+        """Returns the latest pushed stats for a pair, ignoring staleness."""
+        entry = self._stats.get(self._key(pair))
+        return entry[1] if entry else None
+
+    def remember(self, pair: str, stats: Dict[str, Any]):
+        """Stores stats fetched through the REST fallback."""
+        self._stats[self._key(pair)] = (time.monotonic(), stats)
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.pair_stats_push_enabled,
+            "connected": self.connected,
+            "url": self.url,
+            "pairs_cached": len(self._stats),
+            "pairs_subscribed": len(self._wanted),
+            "updates_received": self.updates_received,
+            "transactions_received": self.transactions_received,
+            "reconnects": self.reconnects,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "max_age_seconds": self.max_age_seconds,
+        }
+
+
+# Shared instance for the whole process
+pair_stats_cache = PairStatsCache()
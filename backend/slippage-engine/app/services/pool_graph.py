@@ -0,0 +1,376 @@
+# backend/slippage-engine/app/services/pool_graph.py
+
+import asyncio
+import math
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ..config import settings
+from . import amm_math
+from .liquidity_fetcher import query_subgraph
+from .shared_cache import SharedCache, shared_cache as default_shared_cache
+from .token_registry import token_registry
+
+# One page of the deepest pools, any token pair; the subgraph caps first at 1000
+POOLS_QUERY = """
+query {
+  pools: pairs(first: %d, skip: %d, orderBy: reserveUSD, orderDirection: desc, where: { reserveUSD_gt: "%s" }) {
+    id
+    reserve0
+    reserve1
+    reserveUSD
+    token0 { id }
+    token1 { id }
+  }
+}
+"""
+
+PAGE_SIZE = 1000
+
+
+@dataclass(frozen=True)
+class Pool:
+    address: str
+    token0: str # Lowercase, as ordered by the pair contract
+    token1: str
+    reserve0: float # Decimal-adjusted token units
+    reserve1: float
+    reserve_usd: float
+
+    def reserves(self, token_in: str) -> Tuple[float, float]:
+        """(reserve_in, reserve_out) for a swap selling token_in."""
+        return (self.reserve0, self.reserve1) if token_in == self.token0 else (self.reserve1, self.reserve0)
+
+    def other(self, token: str) -> str:
+        return self.token1 if token == self.token0 else self.token0
+
+
+@dataclass
+class Hop:
+    pool: str
+    token_in: str
+    token_out: str
+    amount_in: float
+    amount_out: float
+    price_impact: float
+    liquidity_usd: float
+
+
+@dataclass
+class Route:
+    token_in: str
+    token_out: str
+    amount_usd: float # Trade size the route was chosen for
+    amount_in: float
+    amount_out: float
+    hops: List[Hop]
+    price_impact: float # Compounded over every hop, LP fees excluded
+    cost: Optional[float] # Value lost to impact and fees, against the graph's USD prices
+    graph_version: int
+
+    @property
+    def liquidity_usd(self) -> float:
+        """Reserves of the shallowest pool on the route."""
+        return min(hop.liquidity_usd for hop in self.hops)
+
+    @property
+    def key(self) -> Tuple:
+        return tuple(hop.pool for hop in self.hops), round(self.price_impact, 6), round(self.liquidity_usd, 0)
+
+    def summary(self) -> List[Dict[str, Any]]:
+        return [
+            {
+                "pool": hop.pool,
+                "token_in": hop.token_in,
+                "token_out": hop.token_out,
+                "price_impact": round(hop.price_impact, 4),
+                "liquidity_usd": round(hop.liquidity_usd, 0),
+            }
+            for hop in self.hops
+        ]
+
+
+class _Graph(NamedTuple):
+    # token -> (neighbour, pool), deepest pools first, at most settings.routing_max_branching
+    neighbours: Dict[str, List[Tuple[str, Pool]]]
+    # (lower address, higher address) -> deepest pool between the two tokens
+    pools: Dict[Tuple[str, str], Pool]
+    # token -> USD price implied by its deepest pool
+    prices: Dict[str, float]
+    built_at: float
+
+
+EMPTY_GRAPH = _Graph({}, {}, {}, 0.0)
+
+
+def pair_key(a: str, b: str) -> Tuple[str, str]:
+    return (a, b) if a < b else (b, a)
+
+
+def build_graph(pairs: List[Dict[str, Any]], branching: int, now: float) -> _Graph:
+    """Indexes subgraph pairs into lookup maps. Pools with an empty side are skipped."""
+    pools: Dict[Tuple[str, str], Pool] = {}
+    for pair in pairs:
+        pool = Pool(
+            address=pair["id"].lower(),
+            token0=pair["token0"]["id"].lower(),
+            token1=pair["token1"]["id"].lower(),
+            reserve0=float(pair["reserve0"]),
+            reserve1=float(pair["reserve1"]),
+            reserve_usd=float(pair["reserveUSD"]),
+        )
+        if pool.reserve0 <= 0 or pool.reserve1 <= 0 or pool.token0 == pool.token1:
+            continue
+        key = pair_key(pool.token0, pool.token1)
+        if key not in pools or pools[key].reserve_usd < pool.reserve_usd:
+            pools[key] = pool
+
+    neighbours: Dict[str, List[Tuple[str, Pool]]] = {}
+    prices: Dict[str, float] = {}
+    for pool in sorted(pools.values(), key=lambda p: p.reserve_usd, reverse=True):
+        for token, reserve in ((pool.token0, pool.reserve0), (pool.token1, pool.reserve1)):
+            # Deepest pool first, so it sets the price and the rest only fill the branching budget
+            prices.setdefault(token, pool.reserve_usd / 2 / reserve)
+            adjacent = neighbours.setdefault(token, [])
+            if len(adjacent) < branching:
+                adjacent.append((pool.other(token), pool))
+    return _Graph(neighbours, pools, prices, now)
+
+
+def combine_pair_stats(stats: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    MEV activity of a route from the stats of each hop's pair: a trade is
+    exposed if any hop is, so bot scores compound and event counts add up.
+    """
+    if len(stats) == 1:
+        return stats[0]
+    calm = 1.0
+    for s in stats:
+        calm *= 1 - min(max(float(s.get("bot_activity_score", 0)), 0.0), 1.0)
+    return {
+        "bot_activity_score": round(1 - calm, 3),
+        "sandwiches_5min": sum(s.get("sandwiches_5min", 0) for s in stats),
+        "transactions_5min": sum(s.get("transactions_5min", 0) for s in stats),
+        "suspicious_tx_count": sum(s.get("suspicious_tx_count", 0) for s in stats),
+        "avg_gas_gwei": max(s.get("avg_gas_gwei", 30) for s in stats),
+    }
+
+
+class PoolGraph:
+    """
+    In-memory graph of the deepest pools: tokens are nodes, pools with
+    their reserves are edges.
+
+    A background loop reloads the whole graph in a few paged subgraph
+    queries and swaps it in with one assignment, so route searches never
+    touch the network and cost only O(hops x branching^2) dict and float
+    operations, however many trades are priced.
+
+    With several workers, one worker at a time pages through the subgraph
+    and publishes the pools in the shared cache; the others build their
+    graph from that copy.
+    """
+
+    def __init__(self, shared: Optional[SharedCache] = None):
+        self.shared = shared or default_shared_cache
+        self._graph = EMPTY_GRAPH
+        self._published_at = 0.0 # Fetch time of the pools the current graph was built from
+        self.version = 0
+        self._loaded: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Counters
+        self.refreshes = 0
+        self.errors = 0
+        self.searches = 0
+        self.routes_found = 0
+        self.search_seconds = 0.0
+
+    # --- Background refresh ---
+
+    async def start(self):
+        if self._task is None and settings.pool_graph_enabled:
+            self._loaded = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await self.refresh()
+            await asyncio.sleep(settings.pool_graph_refresh_seconds)
+
+    async def refresh(self):
+        try:
+            # Waits at most one lease for the refreshing worker, then takes over from it
+            fetched = await self.shared.fetch_blob(
+                "pool_graph", "pools", settings.pool_graph_refresh_seconds, self._query_upstream,
+                timeout=settings.shared_cache_lease_seconds
+            )
+        except Exception as e:
+            self.errors += 1
+            print(f"   [PoolGraph] Refresh failed, keeping v{self.version}: {e}")
+            return
+        if fetched is None:
+            print(f"   [PoolGraph] Another worker is still refreshing, keeping v{self.version}")
+            return
+        fetched_at, pairs = fetched
+        if fetched_at == self._published_at:
+            return # Already built from this copy
+        graph = build_graph(pairs, settings.routing_max_branching, fetched_at)
+        if not graph.pools:
+            self.errors += 1
+            print(f"   [PoolGraph] Subgraph returned no pools, keeping v{self.version}")
+            return
+        self._graph = graph
+        self._published_at = fetched_at
+        self.version += 1
+        self.refreshes += 1
+        if self._loaded is not None:
+            self._loaded.set()
+        print(f"   [PoolGraph] Loaded {len(graph.pools)} pools across {len(graph.prices)} tokens (v{self.version})")
+
+    async def _query_upstream(self) -> List[Dict[str, Any]]:
+        max_pools = settings.pool_graph_max_pools
+        min_reserve = settings.pool_graph_min_reserve_usd
+        pages = await asyncio.gather(*(
+            query_subgraph(POOLS_QUERY % (min(PAGE_SIZE, max_pools - skip), skip, min_reserve))
+            for skip in range(0, max_pools, PAGE_SIZE)
+        ))
+        return [pair for page in pages for pair in page.get("pools") or []]
+
+    async def wait_loaded(self) -> int:
+        """Waits for the first graph load. Returns the number of pools."""
+        if self._loaded is not None:
+            await self._loaded.wait()
+        return len(self._graph.pools)
+
+    # --- Route search ---
+
+    def best_route(
+        self,
+        token_in: str,
+        token_out: str,
+        amount_usd: Optional[float] = None,
+        max_hops: Optional[int] = None
+    ) -> Optional[Route]:
+        """
+        The route that delivers the most token_out for a trade of amount_usd
+        (settings.routing_quote_amount_usd when not given), over at most
+        max_hops pools. None if either token is unknown or not connected.
+
+        Layered search: after each hop only the best amount reaching each
+        token is kept, and intermediate hops follow each token's deepest
+        pools. Output grows with input in every pool, so the best prefix
+        to a token is also the best start for every route through it.
+        """
+        graph = self._graph
+        start, end = token_registry.resolve_address(token_in), token_registry.resolve_address(token_out)
+        if start is None or end is None or start == end or start not in graph.prices or end not in graph.prices:
+            return None
+
+        started = time.perf_counter()
+        self.searches += 1
+        fee = settings.amm_fee
+        max_hops = max_hops or settings.routing_max_hops
+        amount_usd = amount_usd if amount_usd and amount_usd > 0 else settings.routing_quote_amount_usd
+        amount_in = amount_usd / graph.prices[start]
+
+        # token -> (amount held, tokens visited, pools used)
+        frontier: Dict[str, Tuple[float, Tuple[str, ...], Tuple[Pool, ...]]] = {start: (amount_in, (start,), ())}
+        best: Optional[Tuple[float, Tuple[str, ...], Tuple[Pool, ...]]] = None
+        for hops in range(1, max_hops + 1):
+            # Finish every partial route with a direct pool into token_out
+            for token, (amount, path, pools) in frontier.items():
+                pool = graph.pools.get(pair_key(token, end))
+                if pool is not None:
+                    out = amm_math.get_amount_out(amount, *pool.reserves(token), fee)
+                    if best is None or out > best[0]:
+                        best = (out, path + (end,), pools + (pool,))
+            if hops == max_hops:
+                break
+
+            layer: Dict[str, Tuple[float, Tuple[str, ...], Tuple[Pool, ...]]] = {}
+            for token, (amount, path, pools) in frontier.items():
+                for neighbour, pool in graph.neighbours.get(token, ()):
+                    if neighbour == end or neighbour in path:
+                        continue
+                    out = amm_math.get_amount_out(amount, *pool.reserves(token), fee)
+                    held = layer.get(neighbour)
+                    if held is None or out > held[0]:
+                        layer[neighbour] = (out, path + (neighbour,), pools + (pool,))
+            frontier = layer
+
+        self.search_seconds += time.perf_counter() - started
+        if best is None:
+            return None
+        self.routes_found += 1
+        return self._route(graph, best[1], best[2], amount_usd, amount_in)
+
+    def _route(
+        self,
+        graph: _Graph,
+        path: Tuple[str, ...],
+        pools: Tuple[Pool, ...],
+        amount_usd: float,
+        amount_in: float
+    ) -> Route:
+        fee = settings.amm_fee
+        hops, amount, unaffected = [], amount_in, 1.0
+        for token, next_token, pool in zip(path, path[1:], pools):
+            reserve_in, reserve_out = pool.reserves(token)
+            impact = amm_math.price_impact(amount, reserve_in, fee)
+            out = amm_math.get_amount_out(amount, reserve_in, reserve_out, fee)
+            hops.append(Hop(pool.address, token, next_token, amount, out, impact, pool.reserve_usd))
+            unaffected *= 1 - impact
+            amount = out
+
+        price_out = graph.prices.get(path[-1])
+        return Route(
+            token_in=path[0],
+            token_out=path[-1],
+            amount_usd=amount_usd,
+            amount_in=amount_in,
+            amount_out=amount,
+            hops=hops,
+            price_impact=1 - unaffected,
+            cost=1 - amount * price_out / amount_usd if price_out else None,
+            graph_version=self.version,
+        )
+
+    # --- Reads ---
+
+    @property
+    def age_seconds(self) -> float:
+        built_at = self._graph.built_at
+        return time.time() - built_at if built_at else math.inf
+
+    def status(self) -> Dict[str, Any]:
+        graph = self._graph
+        return {
+            "enabled": settings.pool_graph_enabled,
+            "version": self.version,
+            "pools": len(graph.pools),
+            "tokens": len(graph.prices),
+            "age_seconds": round(self.age_seconds, 1) if graph.built_at else None,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "searches": self.searches,
+            "routes_found": self.routes_found,
+            "avg_search_us": round(self.search_seconds / self.searches * 1e6, 1) if self.searches else None,
+            "max_hops": settings.routing_max_hops,
+            "max_branching": settings.routing_max_branching,
+            "refresh_seconds": settings.pool_graph_refresh_seconds,
+        }
+
+
+# Shared instance for the whole process
+pool_graph = PoolGraph()
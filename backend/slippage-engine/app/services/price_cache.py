@@ -0,0 +1,175 @@
+# backend/slippage-engine/app/services/price_cache.py
+
+import asyncio
+import time
+from typing import Dict, Any, Iterable, List, Optional, Tuple
+
+from ..config import settings
+from .http_clients import HttpClients, http_clients
+from .shared_cache import SharedCache, shared_cache as default_shared_cache
+
+
+class PriceCache:
+    """
+    Process-wide CoinGecko quote cache keyed by coin id ("ethereum", "pepe", ...).
+
+    - Fresh entries (younger than the TTL) are returned directly.
+    - Stale entries (within the stale window) are returned immediately while
+      a background refresh runs.
+    - Concurrent misses share a single in-flight request (single-flight), and
+      misses for several ids are fetched in one /simple/price call.
+    - With several workers, misses go through the shared cache first, so
+      only one worker calls CoinGecko for each id.
+    """
+
+    def __init__(
+        self,
+        clients: Optional[HttpClients] = None,
+        ttl_seconds: Optional[float] = None,
+        stale_ttl_seconds: Optional[float] = None,
+        shared: Optional[SharedCache] = None
+    ):
+        self.clients = clients or http_clients
+        self.shared = shared or default_shared_cache
+        self.base_url = settings.coingecko_api_url
+        self.ttl_seconds = ttl_seconds if ttl_seconds is not None else settings.price_cache_ttl_seconds
+        self.stale_ttl_seconds = stale_ttl_seconds if stale_ttl_seconds is not None else settings.price_stale_ttl_seconds
+
+        # coin id -> (fetched_at monotonic, {"usd": ..., "usd_24h_change": ...})
+        self._entries: Dict[str, Tuple[float, Dict[str, float]]] = {}
+        # coin id -> task currently fetching it
+        self._inflight: Dict[str, asyncio.Task] = {}
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.stale_served = 0
+        self.fetches = 0
+        self.errors = 0
+
+    # --- Reads ---
+
+    def peek(self, asset_id: str) -> Optional[Dict[str, float]]:
+        """Last fetched quote for an asset, regardless of age."""
+        entry = self._entries.get(asset_id)
+        return entry[1] if entry else None
+
+    def cached(self, asset_id: str) -> Optional[Dict[str, float]]:
+        """The quote get() would serve without fetching (fresh or within the stale window), or None."""
+        entry = self._entries.get(asset_id)
+        if entry is None or time.monotonic() - entry[0] >= self.ttl_seconds + self.stale_ttl_seconds:
+            return None
+        return entry[1]
+
+    async def get(self, asset_id: str) -> Dict[str, float]:
+        """Returns the quote for one asset. Raises if it cannot be fetched."""
+        quotes = await self.get_many([asset_id])
+        if asset_id not in quotes:
+            raise LookupError(f"No price available for '{asset_id}'")
+        return quotes[asset_id]
+
+    async def get_many(self, asset_ids: Iterable[str]) -> Dict[str, Dict[str, float]]:
+        """
+        Returns quotes for every asset that has a usable value.
+        Assets that are missing and fail to fetch are left out.
+        """
+        now = time.monotonic()
+        result: Dict[str, Dict[str, float]] = {}
+        to_refresh: List[str] = []
+        to_wait: List[str] = []
+
+        for asset_id in dict.fromkeys(asset_ids):
+            entry = self._entries.get(asset_id)
+            age = now - entry[0] if entry else None
+
+            if entry and age < self.ttl_seconds:
+                self.hits += 1
+                result[asset_id] = entry[1]
+            elif entry and age < self.ttl_seconds + self.stale_ttl_seconds:
+                # Serve stale, revalidate in the background
+                self.stale_served += 1
+                result[asset_id] = entry[1]
+                to_refresh.append(asset_id)
+            else:
+                self.misses += 1
+                to_wait.append(asset_id)
+
+        if to_refresh:
+            self._start_fetch(to_refresh)
+
+        if to_wait:
+            tasks = set(self._start_fetch(to_wait).values())
+            # Shield so a caller's timeout does not cancel a fetch others are waiting on
+            await asyncio.gather(*(asyncio.shield(t) for t in tasks), return_exceptions=True)
+            for asset_id in to_wait:
+                quote = self.peek(asset_id)
+                if quote is not None:
+                    result[asset_id] = quote
+
+        return result
+
+    # --- Fetching ---
+
+    def _start_fetch(self, asset_ids: List[str]) -> Dict[str, asyncio.Task]:
+        needed = [a for a in asset_ids if a not in self._inflight]
+        if needed:
+            task = asyncio.create_task(self._fetch(needed))
+            for asset_id in needed:
+                self._inflight[asset_id] = task
+            task.add_done_callback(lambda t, ids=needed: self._on_fetch_done(t, ids))
+        return {a: self._inflight[a] for a in asset_ids if a in self._inflight}
+
+    def _on_fetch_done(self, task: asyncio.Task, asset_ids: List[str]):
+        for asset_id in asset_ids:
+            if self._inflight.get(asset_id) is task:
+                del self._inflight[asset_id]
+        if not task.cancelled() and task.exception() is not None:
+            self.errors += 1
+            print(f"   [PriceCache] Error fetching {', '.join(asset_ids)}: {task.exception()}")
+
+    async def _fetch(self, asset_ids: List[str]):
+        quotes = await self.shared.fetch("price", asset_ids, self.ttl_seconds, self._fetch_upstream)
+        # Keep the age the quote already has, so every worker expires it at the same time
+        offset = time.monotonic() - time.time()
+        for asset_id, (fetched_at, quote) in quotes.items():
+            self._entries[asset_id] = (fetched_at + offset, quote)
+
+    async def _fetch_upstream(self, asset_ids: List[str]) -> Dict[str, Dict[str, float]]:
+        self.fetches += 1
+        print(f"   [PriceCache] Fetching {', '.join(asset_ids)} from CoinGecko...")
+
+        # Pooled CoinGecko client already carries the browser headers
+        response = await self.clients.coingecko.get(
+            f"{self.base_url}/simple/price",
+            params={"ids": ",".join(asset_ids), "vs_currencies": "usd", "include_24hr_change": "true"}
+        )
+        response.raise_for_status()
+        data = response.json()
+
+        quotes = {}
+        for asset_id in asset_ids:
+            quote = data.get(asset_id) or {}
+            if "usd" not in quote:
+                continue
+            quotes[asset_id] = {
+                "usd": float(quote["usd"]),
+                "usd_24h_change": float(quote.get("usd_24h_change") or 0),
+            }
+        return quotes
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "assets_cached": len(self._entries),
+            "in_flight": len(set(self._inflight.values())),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_served": self.stale_served,
+            "fetches": self.fetches,
+            "errors": self.errors,
+            "ttl_seconds": self.ttl_seconds,
+            "stale_ttl_seconds": self.stale_ttl_seconds,
+        }
+
+
+# Shared instance for the whole process
+price_cache = PriceCache()
@@ -1,53 +1,37 @@
-import httpx
-import time
+from typing import Optional
 from ..config import settings
+from .price_cache import PriceCache, price_cache
 
 class PriceFeed:
-    def __init__(self):
-        self.base_url = settings.coingecko_api_url
+    def __init__(self, cache: Optional[PriceCache] = None):
+        # All feeds share the process-wide cache so refreshes are deduplicated
+        self.cache = cache or price_cache
         self.default_eth_price = settings.eth_price_usd
-        
-        # Manual Cache State
-        self._cached_price = None
-        self._last_updated = 0
-        self._cache_ttl = 60
 
-        # Headers to prevent 301 redirects
-        self.headers = {
-            "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
-        }
+    def last_known_price(self, asset_id: str = "ethereum") -> Optional[float]:
+        """Most recent successfully fetched price, regardless of TTL."""
+        quote = self.cache.peek(asset_id)
+        return quote["usd"] if quote else None
 
-    async def get_eth_price(self) -> float:
-        # 1. Check Cache
-        now = time.time()
-        if self._cached_price and (now - self._last_updated < self._cache_ttl):
-            return self._cached_price
+    def cached_price(self, asset_id: str = "ethereum") -> Optional[float]:
+        """Price fetch_price would return without a CoinGecko call, or None."""
+        quote = self.cache.cached(asset_id)
+        return quote["usd"] if quote else None
+
+    async def fetch_price(self, asset_id: str) -> float:
+        """
+        Returns the USD price for a CoinGecko coin id.
+        Raises on upstream failure so callers can decide how to degrade.
+        """
+        quote = await self.cache.get(asset_id)
+        return quote["usd"]
 
-        print("   [PriceFeed] Fetching ETH price from CoinGecko...")
-        
+    async def fetch_eth_price(self) -> float:
+        return await self.fetch_price("ethereum")
+
+    async def get_eth_price(self) -> float:
         try:
-            async with httpx.AsyncClient(follow_redirects=True) as client:
-                response = await client.get(
-                    f"{self.base_url}/simple/price",
-                    params={"ids": "ethereum", "vs_currencies": "usd"},
-                    headers=self.headers
-                )
-                response.raise_for_status()
-                data = response.json()
-                
-                if "ethereum" in data and "usd" in data["ethereum"]:
-                    price = float(data["ethereum"]["usd"])
-                    
-                    # Update Cache
-                    self._cached_price = price
-                    self._last_updated = now
-                    
-                    print(f"   [PriceFeed] ETH price: ${price:.2f}")
-                    return price
-                else:
-                    print("   [PriceFeed] Response missing ETH price. Using default.")
-                    return self.default_eth_price
-                    
+            return await self.fetch_eth_price()
         except Exception as e:
             print(f"   [PriceFeed] Error fetching ETH price: {e}. Using default.")
-            return self.default_eth_price
\ No newline at end of file
+            return self.default_eth_price
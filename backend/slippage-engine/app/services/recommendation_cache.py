@@ -0,0 +1,152 @@
+# backend/slippage-engine/app/services/recommendation_cache.py
+
+import hashlib
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Tuple
+
+from cachetools import LRUCache
+
+from ..config import settings
+from ..schemas import SlippageRecommendation
+from .encoding import JSON, Fields, encode
+from .metrics import SLIPPAGE_STAGE_DURATION
+from .reserve_cache import PoolReserves
+from .pool_graph import Route
+
+# Pair stats fields the calculator reads; anything else (timestamps, ...) is ignored
+STATS_FIELDS = ("bot_activity_score", "sandwiches_5min", "transactions_5min", "suspicious_tx_count", "avg_gas_gwei")
+
+# Encodings kept per entry; rarer field selections are serialized per request
+MAX_VARIANTS = 8
+
+
+@dataclass
+class CachedRecommendation:
+    input_version: str
+    recommendation: SlippageRecommendation
+    complete: bool = True # False when built without explanation and alternatives
+    # (media type, field selection) -> (body, ETag), serialized on first use
+    variants: Dict[Tuple[str, Fields], Tuple[bytes, str]] = field(default_factory=dict)
+
+    def encoded(self, media_type: str = JSON, fields: Fields = None) -> Tuple[bytes, str]:
+        """(body, ETag) for one encoding and field selection."""
+        variant = self.variants.get((media_type, fields))
+        if variant is None:
+            started = time.perf_counter()
+            body = encode(self.recommendation, media_type, fields)
+            SLIPPAGE_STAGE_DURATION.labels("serialization").observe(time.perf_counter() - started)
+            variant = (body, '"%s"' % hashlib.blake2b(body, digest_size=12).hexdigest())
+            if len(self.variants) < MAX_VARIANTS:
+                self.variants[(media_type, fields)] = variant
+        return variant
+
+    @property
+    def body(self) -> bytes:
+        """Full JSON body, as the streams send it."""
+        return self.encoded()[0]
+
+    @property
+    def etag(self) -> str:
+        return self.encoded()[1]
+
+    @property
+    def recommended_slippage(self) -> float:
+        return self.recommendation.recommended_slippage
+
+    @property
+    def risk_level(self) -> str:
+        return self.recommendation.risk_level
+
+
+def trade_amount(amount_usd: Optional[float]) -> Optional[float]:
+    """
+    The trade size a recommendation is keyed and priced by: the caller's
+    exact amount, or None when no (positive) size was given. Sizes are not
+    rounded into shared buckets, since price impact, expected output and the
+    explanation must all describe the trade that was asked about.
+    """
+    if not amount_usd or amount_usd <= 0:
+        return None
+    return float(amount_usd)
+
+
+def input_version(
+    pair_stats: Dict[str, Any],
+    pool_liquidity_usd: float,
+    eth_price_usd: float,
+    reserves: Optional[PoolReserves],
+    input_sources: Dict[str, str],
+    rules_version: int,
+    route: Optional[Route] = None
+) -> str:
+    """Digest of every input a recommendation depends on. Changes only when one of them does."""
+    parts = (
+        tuple(pair_stats.get(f) for f in STATS_FIELDS),
+        pool_liquidity_usd,
+        eth_price_usd,
+        (reserves.pair_address, reserves.reserve_token, reserves.reserve_weth) if reserves else None,
+        tuple(sorted(input_sources.items())),
+        rules_version,
+        route.key if route else None,
+    )
+    return hashlib.blake2b(repr(parts).encode(), digest_size=12).hexdigest()
+
+
+class RecommendationCache:
+    """
+    Recommendations keyed by (token_in, token_out, trade size), each
+    with its serialized bodies. An entry is reused while its input version
+    matches, so an unchanged poll costs a lookup and an ETag comparison
+    instead of a recalculation.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self._entries: LRUCache = LRUCache(maxsize=max_entries or settings.recommendation_cache_max_entries)
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.not_modified = 0
+
+    def get(self, key: Tuple, version: str, complete: bool = True) -> Optional[CachedRecommendation]:
+        """The entry for key if built from this input version (and with every section, if complete)."""
+        entry = self._entries.get(key)
+        if entry is None or entry.input_version != version or (complete and not entry.complete):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry
+
+    def peek(self, key: Tuple, version: str, complete: bool = True) -> Optional[CachedRecommendation]:
+        """Like get, without counting a hit or miss."""
+        entry = self._entries.get(key)
+        if entry is None or entry.input_version != version or (complete and not entry.complete):
+            return None
+        return entry
+
+    def put(self, key: Tuple, version: str, recommendation: SlippageRecommendation, complete: bool = True) -> CachedRecommendation:
+        entry = CachedRecommendation(input_version=version, recommendation=recommendation, complete=complete)
+        self._entries[key] = entry
+        return entry
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "not_modified": self.not_modified,
+        }
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """True if an If-None-Match header value covers the given ETag."""
+    if not if_none_match:
+        return False
+    candidates = [c.strip() for c in if_none_match.split(",")]
+    # Weak comparison, as RFC 9110 requires for If-None-Match
+    return "*" in candidates or etag in (c[2:] if c.startswith("W/") else c for c in candidates)
+
+
+# Shared instance for the whole process
+recommendation_cache = RecommendationCache()
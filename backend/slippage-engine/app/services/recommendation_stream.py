@@ -0,0 +1,210 @@
+# backend/slippage-engine/app/services/recommendation_stream.py
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Set, Tuple
+
+from ..config import settings
+from .pair_stats_cache import PairStatsCache, pair_stats_cache
+from .recommendation_cache import CachedRecommendation, trade_amount
+from .token_registry import pool_token, token_registry
+
+# (token_in, token_out, trade size), the same key as the recommendation cache
+StreamKey = Tuple[str, str, Optional[float]]
+
+
+def stream_key(token_in: str, token_out: str, amount_usd: Optional[float]) -> StreamKey:
+    return token_in.lower(), token_out.lower(), trade_amount(amount_usd)
+
+# Builds the current recommendation for (token_in, token_out, amount_usd)
+Recommender = Callable[[str, str, Optional[float]], Awaitable[CachedRecommendation]]
+
+
+class StreamSubscriber:
+    """
+    One connected client. Holds at most one pending update per subscribed
+    key: a newer update overwrites an unsent one, so a slow consumer only
+    ever sees the latest state and its backlog is bounded by its keys.
+    """
+
+    def __init__(self):
+        self.keys: Set[StreamKey] = set()
+        self._latest: Dict[StreamKey, CachedRecommendation] = {}
+        self._ready = asyncio.Event()
+        self.coalesced = 0
+
+    def offer(self, key: StreamKey, entry: CachedRecommendation):
+        if key in self._latest:
+            self.coalesced += 1
+        self._latest[key] = entry
+        self._ready.set()
+
+    async def next_updates(self, timeout: Optional[float] = None) -> List[Tuple[StreamKey, CachedRecommendation]]:
+        """Waits for pending updates and drains them. Returns [] on timeout."""
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        self._ready.clear()
+        updates, self._latest = list(self._latest.items()), {}
+        return updates
+
+
+class _Topic:
+    """Shared state for one stream key: its subscribers and the last published result."""
+
+    __slots__ = ("token_in", "token_out", "amount_usd", "pair_key", "subscribers", "published")
+
+    def __init__(self, token_in: str, token_out: str, amount_usd: Optional[float]):
+        self.token_in = token_in
+        self.token_out = token_out
+        self.amount_usd = amount_usd
+        # Same key the pair stats cache notifies with
+        self.pair_key = token_registry.pair_key(pool_token(token_in, token_out))
+        self.subscribers: Set[StreamSubscriber] = set()
+        self.published: Optional[CachedRecommendation] = None
+
+
+class RecommendationStream:
+    """
+    Fans recommendation updates out to streaming clients.
+
+    Each subscribed (pair, trade size) is computed once per input change,
+    no matter how many clients follow it. Pair stats pushes from the listener
+    trigger an immediate recompute of the affected keys; a periodic sweep
+    picks up liquidity, price and reserve changes. An update is published only
+    when the recommended slippage moves by at least settings.stream_min_change
+    or the risk level changes.
+    """
+
+    def __init__(self, stats_cache: Optional[PairStatsCache] = None):
+        self.stats_cache = stats_cache or pair_stats_cache
+        self._recommender: Optional[Recommender] = None
+        self._topics: Dict[StreamKey, _Topic] = {}
+        self._dirty: Set[StreamKey] = set()
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Counters
+        self.computations = 0
+        self.publishes = 0
+        self.errors = 0
+
+    # --- Lifecycle ---
+
+    def set_recommender(self, recommender: Recommender):
+        self._recommender = recommender
+
+    async def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self.stats_cache.add_listener(self._on_pair_update)
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self.stats_cache.remove_listener(self._on_pair_update)
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    # --- Subscriptions ---
+
+    async def subscribe(self, subscriber: StreamSubscriber, token_in: str, token_out: str, amount_usd: Optional[float]) -> StreamKey:
+        """Adds a key to a subscriber and immediately queues its current state."""
+        if len(subscriber.keys) >= settings.stream_max_subscriptions:
+            raise ValueError(f"At most {settings.stream_max_subscriptions} subscriptions per client")
+
+        key = stream_key(token_in, token_out, amount_usd)
+        topic = self._topics.get(key)
+        if topic is None:
+            topic = self._topics[key] = _Topic(token_in, token_out, amount_usd)
+        topic.subscribers.add(subscriber)
+        subscriber.keys.add(key)
+
+        if topic.published is None:
+            await self._refresh(key)
+        if topic.published is not None:
+            subscriber.offer(key, topic.published)
+        return key
+
+    def unsubscribe_all(self, subscriber: StreamSubscriber):
+        for key in subscriber.keys:
+            topic = self._topics.get(key)
+            if topic is None:
+                continue
+            topic.subscribers.discard(subscriber)
+            if not topic.subscribers:
+                del self._topics[key]
+        subscriber.keys.clear()
+
+    # --- Updates ---
+
+    def _on_pair_update(self, pair: str):
+        keys = [key for key, topic in self._topics.items() if topic.pair_key == pair]
+        if keys and self._wakeup is not None:
+            self._dirty.update(keys)
+            self._wakeup.set()
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.stream_refresh_seconds)
+            except asyncio.TimeoutError:
+                # Periodic sweep for inputs that are not pushed
+                self._dirty.update(self._topics)
+            self._wakeup.clear()
+
+            dirty, self._dirty = self._dirty, set()
+            if dirty:
+                await asyncio.gather(*(self._refresh(key) for key in dirty))
+
+    async def _refresh(self, key: StreamKey):
+        topic = self._topics.get(key)
+        if topic is None or self._recommender is None:
+            return
+        try:
+            entry = await self._recommender(topic.token_in, topic.token_out, topic.amount_usd)
+        except Exception as e:
+            self.errors += 1
+            print(f"   [Stream] Error computing {topic.token_in}/{topic.token_out}: {e}")
+            return
+        self.computations += 1
+
+        if not self._moved(topic.published, entry):
+            return
+        topic.published = entry
+        self.publishes += 1
+        for subscriber in topic.subscribers:
+            subscriber.offer(key, entry)
+
+    @staticmethod
+    def _moved(previous: Optional[CachedRecommendation], current: CachedRecommendation) -> bool:
+        if previous is None:
+            return True
+        if previous.etag == current.etag:
+            return False
+        return (
+            abs(current.recommended_slippage - previous.recommended_slippage) >= settings.stream_min_change
+            or current.risk_level != previous.risk_level
+        )
+
+    def status(self) -> Dict[str, Any]:
+        subscribers = {s for topic in self._topics.values() for s in topic.subscribers}
+        return {
+            "running": self._task is not None,
+            "topics": len(self._topics),
+            "subscribers": len(subscribers),
+            "computations": self.computations,
+            "publishes": self.publishes,
+            "coalesced": sum(s.coalesced for s in subscribers),
+            "errors": self.errors,
+            "min_change": settings.stream_min_change,
+            "refresh_seconds": settings.stream_refresh_seconds,
+        }
+
+
+# Shared instance for the whole process
+recommendation_stream = RecommendationStream()
@@ -0,0 +1,214 @@
+# backend/slippage-engine/app/services/reserve_cache.py
+
+import asyncio
+import time
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, List, Optional
+
+from cachetools import LRUCache, TTLCache
+
+from ..config import settings
+from .liquidity_fetcher import query_subgraph
+from .shared_cache import SharedCache, shared_cache as default_shared_cache
+from .token_registry import token_registry
+
+# Deepest token/WETH pool with its reserves; aliased once per token
+RESERVES_QUERY = """
+  %s: pairs(where: { token0_in: ["%s", "%s"], token1_in: ["%s", "%s"] }, first: 1, orderBy: reserveUSD, orderDirection: desc) {
+    id
+    reserve0
+    reserve1
+    reserveUSD
+    token0 { id }
+    token1 { id }
+  }"""
+
+
+@dataclass
+class PoolReserves:
+    pair_address: str
+    token: str
+    reserve_token: float # Decimal-adjusted token units
+    reserve_weth: float
+    reserve_usd: float
+    updated_at: float # time.time() of the refresh that produced it
+
+    @property
+    def age_seconds(self) -> float:
+        return time.time() - self.updated_at
+
+
+class ReserveCache:
+    """
+    Local cache of token/WETH pool reserves, keyed by token address.
+
+    Reads never touch the network: a miss only marks the token as tracked,
+    and a background loop refreshes every tracked pool in batched subgraph
+    queries. New misses wake it early, but only the tokens that missed are
+    queried then; tokens found to have no WETH pool are remembered for
+    settings.reserve_no_pool_ttl_seconds and not looked up again meanwhile.
+    With several workers, a pool another worker refreshed this interval is
+    read from the shared cache instead.
+    """
+
+    def __init__(self, shared: Optional[SharedCache] = None):
+        self.shared = shared or default_shared_cache
+        # token -> PoolReserves; LRU bounds both memory and refresh cost
+        self._reserves: LRUCache = LRUCache(maxsize=settings.reserve_cache_max_pairs)
+        self._tracked: LRUCache = LRUCache(maxsize=settings.reserve_cache_max_pairs)
+        # Tokens the subgraph has no WETH pool for
+        self._no_pool: TTLCache = TTLCache(maxsize=settings.reserve_cache_max_pairs, ttl=settings.reserve_no_pool_ttl_seconds)
+        # Tokens that missed since the last wakeup; the early refresh queries only these
+        self._missed: Dict[str, bool] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._task: Optional[asyncio.Task] = None
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.stale = 0
+        self.no_pool = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    # --- Reads ---
+
+    def get(self, token_address: str) -> Optional[PoolReserves]:
+        """Returns fresh reserves for a token's WETH pool, or None. Never blocks."""
+        token = token_registry.resolve_address(token_address)
+        if token is None:
+            return None # Unknown symbol: nothing the subgraph could find
+        self._tracked[token] = True
+
+        reserves = self._reserves.get(token)
+        if reserves is None:
+            if token in self._no_pool:
+                self.no_pool += 1
+                return None
+            self.misses += 1
+            if token not in self._missed:
+                self._missed[token] = True
+                if self._wakeup is not None:
+                    self._wakeup.set()
+            return None
+        if reserves.age_seconds > settings.reserve_max_age_seconds:
+            self.stale += 1
+            return None
+        self.hits += 1
+        return reserves
+
+    # --- Background refresh ---
+
+    async def start(self):
+        if self._task is None:
+            self._wakeup = asyncio.Event()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), settings.reserve_refresh_seconds)
+                # Let a burst of new tokens land in the same batch
+                await asyncio.sleep(settings.liquidity_batch_window_ms / 1000)
+                woken = True
+            except asyncio.TimeoutError:
+                woken = False
+            self._wakeup.clear()
+            missed, self._missed = list(self._missed), {}
+            if woken:
+                await self.refresh(missed)
+            else:
+                await self.refresh()
+
+    async def refresh(self, tokens: Optional[List[str]] = None):
+        """Refreshes the given tokens, or every tracked token that has a WETH pool."""
+        weth = token_registry.weth.address
+        if tokens is None:
+            tokens = [t for t in list(self._tracked) if t not in self._no_pool]
+        tokens = [t for t in tokens if t != weth]
+        batch_size = settings.liquidity_batch_max_size
+        for start in range(0, len(tokens), batch_size):
+            try:
+                await self._refresh_batch(tokens[start:start + batch_size])
+            except Exception as e:
+                self.errors += 1
+                print(f"   [Reserves] Refresh failed: {e}")
+
+    async def warm_up(self, tokens: List[str]) -> int:
+        """Tracks and loads the WETH pools of the given tokens now. Returns the number cached."""
+        tokens = [t.lower() for t in tokens if not token_registry.is_weth(t)]
+        for token in tokens:
+            self._tracked[token] = True
+        await self.refresh(tokens)
+        return sum(1 for t in tokens if t in self._reserves)
+
+    async def _refresh_batch(self, tokens: List[str]):
+        entries = await self.shared.fetch("reserves", tokens, settings.reserve_refresh_seconds, self._query_upstream)
+        for token, (_, reserves) in entries.items():
+            if reserves is None:
+                self._no_pool[token] = True
+                self._reserves.pop(token, None)
+            else:
+                self._no_pool.pop(token, None)
+                self._reserves[token] = PoolReserves(**reserves)
+
+    async def _query_upstream(self, tokens: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+        """Reserves per token; None for a token the subgraph has no WETH pool for."""
+        aliases = {f"t{i}": token for i, token in enumerate(tokens)}
+        weth = token_registry.weth.address
+        body = "".join(
+            RESERVES_QUERY % (alias, token, weth, token, weth)
+            for alias, token in aliases.items()
+        )
+        data = await query_subgraph("query {%s\n}" % body)
+        self.refreshes += 1
+
+        now = time.time()
+        results = {}
+        for alias, token in aliases.items():
+            pairs = data.get(alias)
+            if pairs is None:
+                continue # Alias failed inside an otherwise successful query
+            results[token] = asdict(self._parse(token, pairs[0], now)) if pairs else None
+        return results
+
+    @staticmethod
+    def _parse(token: str, pair: Dict[str, Any], now: float) -> PoolReserves:
+        token0_is_token = pair["token0"]["id"].lower() == token
+        reserve0, reserve1 = float(pair["reserve0"]), float(pair["reserve1"])
+        return PoolReserves(
+            pair_address=pair["id"],
+            token=token,
+            reserve_token=reserve0 if token0_is_token else reserve1,
+            reserve_weth=reserve1 if token0_is_token else reserve0,
+            reserve_usd=float(pair["reserveUSD"]),
+            updated_at=now,
+        )
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "pairs_cached": len(self._reserves),
+            "tokens_tracked": len(self._tracked),
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale": self.stale,
+            "no_pool": self.no_pool,
+            "tokens_without_pool": len(self._no_pool),
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+            "refresh_seconds": settings.reserve_refresh_seconds,
+            "max_age_seconds": settings.reserve_max_age_seconds,
+        }
+
+
+# Shared instance for the whole process
+reserve_cache = ReserveCache()
@@ -1,42 +1,66 @@
 # backend/slippage-engine/app/services/risk_scorer.py
 
-from typing import Tuple
+from typing import List, Optional, Tuple
+import numpy as np
+
+from .rule_engine import RuleEngine, CompiledRules, rule_engine as shared_rule_engine
 
 class RiskScorer:
+    def __init__(self, rules: Optional[RuleEngine] = None):
+        self.rules = rules or shared_rule_engine
+
     def get_risk_level(
         self,
         bot_activity_score: float,
         sandwich_count: int,
         avg_gas_gwei: float,
-        pool_liquidity_usd: float
+        pool_liquidity_usd: float,
+        rules: Optional[CompiledRules] = None
     ) -> Tuple[str, int]:
         """
         Determines risk level (LOW, MODERATE, HIGH, SEVERE) based on inputs.
         Returns (risk_level_string, risk_score_integer_1_to_5).
         """
-        score = 0
+        rules = rules or self.rules.default
 
         # Factor 1: Bot activity score (0-1)
-        if bot_activity_score > 0.7: score += 2
-        elif bot_activity_score > 0.4: score += 1
-
         # Factor 2: Sandwich frequency (higher count = higher score)
-        if sandwich_count > 5: score += 2
-        elif sandwich_count > 2: score += 1
-
         # Factor 3: Gas prices (high gas = more bot competition)
-        if avg_gas_gwei > 100: score += 1
-        elif avg_gas_gwei > 75: score += 0.5
-
         # Factor 4: Pool liquidity (low liquidity = higher risk)
-        if pool_liquidity_usd < 500_000: score += 1
-        elif pool_liquidity_usd < 100_000: score += 1.5
+        score = (
+            rules.bot_activity.value(bot_activity_score, "risk_points")
+            + rules.sandwiches.value(sandwich_count, "risk_points")
+            + rules.gas.value(avg_gas_gwei, "risk_points")
+            + rules.liquidity_risk.value(pool_liquidity_usd, "risk_points")
+        )
 
         # Map score to level and integer score (1-5 range)
         score = max(0, score) # Ensure minimum score is not negative
-        
-        if score < 1: return "LOW", 1
-        elif score < 2: return "LOW", 2
-        elif score < 3: return "MODERATE", 3
-        elif score < 4: return "HIGH", 4
-        else: return "SEVERE", 5
\ No newline at end of file
+        band = rules.risk_level.band(score)
+        return band["level"], int(band["score"])
+
+    def get_risk_levels(
+        self,
+        bot_activity_score: np.ndarray,
+        sandwich_count: np.ndarray,
+        avg_gas_gwei: np.ndarray,
+        pool_liquidity_usd: np.ndarray,
+        rules: Optional[CompiledRules] = None
+    ) -> Tuple[List[str], np.ndarray]:
+        """
+        Vectorized get_risk_level over equally sized arrays.
+        Returns (risk_level_strings, risk_score_integers_1_to_5).
+        """
+        rules = rules or self.rules.default
+
+        score = (
+            rules.bot_activity.values(bot_activity_score, "risk_points")
+            + rules.sandwiches.values(sandwich_count, "risk_points")
+            + rules.gas.values(avg_gas_gwei, "risk_points")
+            + rules.liquidity_risk.values(pool_liquidity_usd, "risk_points")
+        )
+        score = np.maximum(score, 0)
+
+        levels = rules.risk_level.values(score, "level")
+        scores = rules.risk_level.values(score, "score").astype(int)
+        return levels.tolist(), scores
@@ -0,0 +1,193 @@
+# backend/slippage-engine/app/services/rule_engine.py
+
+import asyncio
+import copy
+import json
+import os
+from bisect import bisect_left, bisect_right
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from ..config import settings
+from .token_registry import token_registry
+
+DEFAULT_RULES_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "data", "slippage_rules.json"))
+
+# Factors every rule table must define
+REQUIRED_FACTORS = ("liquidity", "liquidity_risk", "bot_activity", "sandwiches", "gas", "risk_level")
+
+
+class StepRule:
+    """
+    A step function over sorted breakpoints, compiled for bisection.
+
+    A value above breakpoint i (or equal to it, when upper_inclusive) falls
+    into band i + 1. Each band is a dict of outputs (label, points, ...).
+    """
+
+    __slots__ = ("breakpoints", "bands", "upper_inclusive", "_bisect", "_side", "_np_breakpoints", "_columns")
+
+    def __init__(self, name: str, spec: Dict[str, Any]):
+        breakpoints = [float(b) for b in spec["breakpoints"]]
+        bands = spec["bands"]
+        if any(nxt <= prev for prev, nxt in zip(breakpoints, breakpoints[1:])):
+            raise ValueError(f"Rule '{name}': breakpoints must be strictly ascending")
+        if len(bands) != len(breakpoints) + 1:
+            raise ValueError(f"Rule '{name}': expected {len(breakpoints) + 1} bands, got {len(bands)}")
+
+        self.breakpoints = breakpoints
+        self.bands = bands
+        self.upper_inclusive = bool(spec.get("upper_inclusive", False))
+        self._bisect = bisect_right if self.upper_inclusive else bisect_left
+        self._side = "right" if self.upper_inclusive else "left"
+        self._np_breakpoints = np.asarray(breakpoints)
+
+        # Column per output key for vectorized lookups
+        self._columns: Dict[str, np.ndarray] = {}
+        for key in bands[0]:
+            column = [band.get(key) for band in bands]
+            self._columns[key] = np.asarray(column, dtype=object if isinstance(column[0], str) else float)
+
+    def band(self, x: float) -> Dict[str, Any]:
+        return self.bands[self._bisect(self.breakpoints, x)]
+
+    def value(self, x: float, key: str) -> Any:
+        return self.bands[self._bisect(self.breakpoints, x)][key]
+
+    def values(self, xs: np.ndarray, key: str) -> np.ndarray:
+        return self._columns[key][np.searchsorted(self._np_breakpoints, xs, side=self._side)]
+
+
+class CompiledRules:
+    """One rule table compiled into bisect lookups."""
+
+    def __init__(self, table: Dict[str, Any]):
+        factors = table.get("factors", {})
+        missing = [f for f in REQUIRED_FACTORS if f not in factors]
+        if missing:
+            raise ValueError(f"Rule table is missing factors: {', '.join(missing)}")
+
+        self.liquidity = StepRule("liquidity", factors["liquidity"])
+        self.liquidity_risk = StepRule("liquidity_risk", factors["liquidity_risk"])
+        self.bot_activity = StepRule("bot_activity", factors["bot_activity"])
+        self.sandwiches = StepRule("sandwiches", factors["sandwiches"])
+        self.gas = StepRule("gas", factors["gas"])
+        self.risk_level = StepRule("risk_level", factors["risk_level"])
+
+        adjustments = table["adjustments"]
+        self.bot_activity_per_unit = float(adjustments["bot_activity_per_unit"])
+        self.sandwich_per_event = float(adjustments["sandwich_per_event"])
+        self.sandwich_max = float(adjustments["sandwich_max"])
+
+        self.clamp_min = float(table["clamp"]["min"])
+        self.clamp_max = float(table["clamp"]["max"])
+
+        # Trade price impact is added on top of the clamped MEV buffer
+        price_impact = table.get("price_impact", {})
+        self.price_impact_multiplier = float(price_impact.get("multiplier", 1.0))
+        self.price_impact_cap = float(price_impact.get("cap", 0.15))
+
+        alternatives = table["alternatives"]
+        self.low_multiplier = float(alternatives["low_multiplier"])
+        self.low_floor = float(alternatives["low_floor"])
+        self.high_multiplier = float(alternatives["high_multiplier"])
+        self.high_cap = float(alternatives["high_cap"])
+
+
+def _deep_merge(base: Dict[str, Any], override: Dict[str, Any]) -> Dict[str, Any]:
+    merged = copy.deepcopy(base)
+    for key, value in override.items():
+        if isinstance(value, dict) and isinstance(merged.get(key), dict):
+            merged[key] = _deep_merge(merged[key], value)
+        else:
+            merged[key] = copy.deepcopy(value)
+    return merged
+
+
+class RuleEngine:
+    """
+    Holds the compiled slippage/risk rule table shared by SlippageCalculator,
+    RiskScorer and ExplanationGenerator. Per-pair overrides under "pairs" are
+    merged over the defaults and compiled once at load time. Reloads swap the
+    compiled tables atomically and keep the old ones if the new file is invalid.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.slippage_rules_path or DEFAULT_RULES_PATH
+        self.version = 0
+        self.default: Optional[CompiledRules] = None
+        self._by_pair: Dict[str, CompiledRules] = {}
+        self._table: Dict[str, Any] = {}
+        self._mtime = 0.0
+        self._watch_task: Optional[asyncio.Task] = None
+        self.load()
+
+    @staticmethod
+    def _key(pair: str) -> str:
+        # Overrides may name a token by symbol or address; both map to the same key
+        return (token_registry.resolve_address(pair) or pair).upper()
+
+    def load(self):
+        with open(self.path) as f:
+            table = json.load(f)
+        self.apply(table)
+        self._mtime = os.path.getmtime(self.path)
+
+    def apply(self, table: Dict[str, Any]):
+        """Compiles and installs a rule table. Raises ValueError if it is invalid."""
+        try:
+            default = CompiledRules(table)
+            by_pair = {
+                self._key(pair): CompiledRules(_deep_merge(table, override))
+                for pair, override in (table.get("pairs") or {}).items()
+            }
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid rule table: {e!r}")
+
+        self.default, self._by_pair, self._table = default, by_pair, table
+        self.version += 1
+
+    def reload(self) -> bool:
+        try:
+            self.load()
+            print(f"   [Rules] Loaded rule table v{self.version} from {self.path}")
+            return True
+        except Exception as e:
+            print(f"   [Rules] Reload failed, keeping v{self.version}: {e}")
+            return False
+
+    def for_pair(self, pair: Optional[str] = None) -> CompiledRules:
+        if pair and self._by_pair:
+            return self._by_pair.get(self._key(pair), self.default)
+        return self.default
+
+    def table(self) -> Dict[str, Any]:
+        return {"version": self.version, "path": self.path, "rules": self._table}
+
+    # --- Hot reload ---
+
+    async def _watch(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                continue
+            if mtime != self._mtime:
+                self._mtime = mtime
+                self.reload()
+
+    def start_watching(self):
+        interval = settings.slippage_rules_reload_seconds
+        if interval > 0 and self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch(interval))
+
+    def stop_watching(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+
+
+# Shared instance for the whole process
+rule_engine = RuleEngine()
@@ -0,0 +1,458 @@
+# backend/slippage-engine/app/services/shared_cache.py
+
+import asyncio
+import hashlib
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from ..config import settings
+
+try:
+    import fcntl
+except ImportError: # Not available on Windows; the shared cache stays disabled there
+    fcntl = None
+
+MAGIC = b"SLIPSHM1"
+FILE_HEADER = struct.Struct("<8sII") # magic, slots, slot size
+SLOT_SIZE = 512
+# seq, crc, key hash, updated_at, lease_until, lease pid, key length, value length
+SLOT_HEADER = struct.Struct("<IIQddIHH")
+SLOT_DATA = SLOT_SIZE - SLOT_HEADER.size # Key and JSON value share this space
+PROBE_LIMIT = 16 # Slots checked per key before the oldest one is reused
+READ_RETRIES = 8 # Attempts at a slot that is being written before giving up on it
+LOCK_RETRIES = 20 # Non-blocking attempts at the write lock before a write is skipped
+POLL_SECONDS = 0.02 # How often a waiting worker looks for another worker's result
+BLOB_POLL_SECONDS = 0.25 # Same for large values, which take a whole upstream refresh
+
+
+def default_path() -> str:
+    name = f"slippage-engine-{settings.slippage_api_port}.cache"
+    if os.path.isdir("/dev/shm"):
+        return os.path.join("/dev/shm", name)
+    return os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "data", name))
+
+
+def key_hash(key: bytes) -> int:
+    # 0 marks an empty slot
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+
+class SharedCache:
+    """
+    Cache shared by every worker process on the host, in a memory-mapped
+    file of fixed-size slots (open addressing, keyed by a 64-bit hash).
+
+    - Reads are lock-free: each slot carries a sequence number that is odd
+      while it is being written and a CRC of its contents, so a torn read
+      is detected and retried.
+    - Writes take an exclusive flock on the file; they only happen when a
+      value is refreshed, so they are rare next to reads. The lock is only
+      ever tried without blocking, since writes run on the event loop: it is
+      held for one slot rewrite, and a write that cannot get it is skipped.
+    - Each key has a refresh lease (owner pid and expiry). fetch() lets only
+      the worker holding the lease call upstream; the others wait for its
+      result. A crashed owner's lease simply expires.
+    - Values too large for a slot (a pool graph, a price chart) are published
+      as a file next to the table, replaced atomically, with its size and
+      CRC in the key's slot; fetch_blob() elects one refresher for them.
+
+    The per-process caches stay in front of this one, so their hit path
+    is unchanged; this only sits between a local miss and the upstream.
+    When disabled, fetch() calls upstream directly and every lease is won.
+    """
+
+    def __init__(self, path: Optional[str] = None, slots: Optional[int] = None, enabled: Optional[bool] = None):
+        self.enabled = (settings.shared_cache_enabled if enabled is None else enabled) and fcntl is not None
+        self.path = path or settings.shared_cache_path or default_path()
+        self.slots = slots or settings.shared_cache_slots
+        self.pid = os.getpid()
+        self._fd: Optional[int] = None
+        self._map = None
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.upstream_keys = 0
+        self.waited = 0
+        self.wait_timeouts = 0
+        self.leases_won = 0
+        self.leases_lost = 0
+        self.evictions = 0
+        self.oversized = 0
+        self.torn_reads = 0
+        self.lock_busy = 0
+        self.blobs_published = 0
+        self.blob_reads = 0
+
+    # --- Mapping ---
+
+    def open(self):
+        """Maps the table at startup, so the one blocking lock (file setup) never runs in a request."""
+        if self.enabled:
+            self._mapped()
+
+    def _mapped(self):
+        """Opens and maps the file on first use, initializing it if no worker has yet."""
+        if self._map is not None and self.pid != os.getpid():
+            # Forked after mapping: flock is per open file, so reopen to lock against the parent
+            self.close()
+        if self._map is None:
+            self.pid = os.getpid()
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o600)
+            size = FILE_HEADER.size + self.slots * SLOT_SIZE
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            try:
+                header = os.pread(fd, FILE_HEADER.size, 0)
+                if len(header) < FILE_HEADER.size or FILE_HEADER.unpack(header) != (MAGIC, self.slots, SLOT_SIZE):
+                    # New file, or one laid out for different settings: start empty
+                    os.ftruncate(fd, 0)
+                    os.ftruncate(fd, size)
+                    os.pwrite(fd, FILE_HEADER.pack(MAGIC, self.slots, SLOT_SIZE), 0)
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+            self._map = mmap.mmap(fd, size)
+            self._fd = fd
+            print(f"   [SharedCache] Mapped {self.slots} slots at {self.path} (pid {self.pid})")
+        return self._map
+
+    def close(self):
+        if self._map is not None:
+            self._map.close()
+            os.close(self._fd)
+            self._map = self._fd = None
+
+    @contextmanager
+    def _write_lock(self):
+        """
+        Yields the map with the write lock held, or None when another worker
+        held the lock through every attempt. Never blocks the event loop.
+        """
+        mm = self._mapped()
+        for attempt in range(LOCK_RETRIES):
+            try:
+                fcntl.flock(self._fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                break
+            except BlockingIOError:
+                time.sleep(0) # Give the writing process a moment to finish
+        else:
+            self.lock_busy += 1
+            yield None
+            return
+        try:
+            yield mm
+        finally:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    # --- Slots ---
+
+    @staticmethod
+    def _offset(index: int) -> int:
+        return FILE_HEADER.size + index * SLOT_SIZE
+
+    def _read(self, mm, index: int) -> Optional[Tuple[tuple, bytes]]:
+        """(header fields, data) of a slot, or None if it kept changing under us."""
+        offset = self._offset(index)
+        for attempt in range(READ_RETRIES):
+            if attempt:
+                time.sleep(0) # Give the writing process a moment to finish
+            seq = struct.unpack_from("<I", mm, offset)[0]
+            raw = mm[offset:offset + SLOT_SIZE]
+            if seq & 1 or struct.unpack_from("<I", mm, offset)[0] != seq:
+                continue
+            fields = SLOT_HEADER.unpack_from(raw)
+            end = SLOT_HEADER.size + fields[6] + fields[7]
+            if fields[2] and (end > SLOT_SIZE or zlib.crc32(raw[8:end]) != fields[1]):
+                continue
+            return fields, raw[SLOT_HEADER.size:end]
+        self.torn_reads += 1
+        return None
+
+    def _write(self, mm, index: int, hashed: int, key: bytes, updated_at: float, lease_until: float, lease_pid: int, value: bytes):
+        """Rewrites a slot; the caller holds the write lock."""
+        offset = self._offset(index)
+        seq = struct.unpack_from("<I", mm, offset)[0] | 1 # Odd: readers back off
+        struct.pack_into("<I", mm, offset, seq)
+        struct.pack_into(f"<Q dd I HH {len(key)}s {len(value)}s", mm, offset + 8,
+                         hashed, updated_at, lease_until, lease_pid, len(key), len(value), key, value)
+        end = SLOT_HEADER.size + len(key) + len(value)
+        struct.pack_into("<I", mm, offset + 4, zlib.crc32(mm[offset + 8:offset + end]))
+        struct.pack_into("<I", mm, offset, (seq + 1) & 0xFFFFFFFF)
+
+    def _locate(self, mm, key: bytes, claim: bool) -> Tuple[Optional[int], Optional[tuple], bytes]:
+        """
+        (slot index, fields, data) of the key's slot. With claim, a missing
+        key gets the first empty slot in its probe range, or the one updated
+        longest ago; without it, a missing key returns index None.
+        """
+        hashed = key_hash(key)
+        base = hashed % self.slots
+        oldest, oldest_at = None, None
+        for i in range(PROBE_LIMIT):
+            index = (base + i) % self.slots
+            slot = self._read(mm, index)
+            if slot is None:
+                continue
+            fields, data = slot
+            if fields[2] == 0:
+                # Nothing is ever deleted, so the key cannot be further along
+                return (index, None, b"") if claim else (None, None, b"")
+            if fields[2] == hashed and data[:fields[6]] == key:
+                return index, fields, data[fields[6]:]
+            if claim and fields[4] < time.time(): # Never evict a key that is being refreshed
+                last_used = max(fields[3], fields[4])
+                if oldest_at is None or last_used < oldest_at:
+                    oldest, oldest_at = index, last_used
+        if oldest is not None:
+            self.evictions += 1
+        return oldest, None, b""
+
+    # --- Reads and writes ---
+
+    def get(self, namespace: str, key: str) -> Optional[Tuple[float, Any]]:
+        """(updated_at, value) of the last value any worker stored, or None."""
+        if not self.enabled:
+            return None
+        index, fields, value = self._locate(self._mapped(), f"{namespace}:{key}".encode(), claim=False)
+        if index is None or not fields[3]:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return fields[3], json.loads(value)
+
+    def put(self, namespace: str, key: str, value: Any, updated_at: Optional[float] = None) -> bool:
+        if not self.enabled:
+            return False
+        full_key = f"{namespace}:{key}".encode()
+        encoded = json.dumps(value, separators=(",", ":")).encode()
+        if len(full_key) + len(encoded) > SLOT_DATA:
+            self.oversized += 1
+            return False
+        with self._write_lock() as mm:
+            if mm is None:
+                return False
+            index, fields, _ = self._locate(mm, full_key, claim=True)
+            if index is None:
+                return False # Whole probe range is mid-refresh
+            lease_until, lease_pid = (fields[4], fields[5]) if fields else (0.0, 0)
+            self._write(mm, index, key_hash(full_key), full_key, updated_at or time.time(), lease_until, lease_pid, encoded)
+        return True
+
+    # --- Leases ---
+
+    def try_lease(self, namespace: str, key: str, seconds: Optional[float] = None) -> bool:
+        """Takes (or renews) the refresh lease on a key unless another live worker holds it."""
+        if not self.enabled:
+            return True
+        full_key = f"{namespace}:{key}".encode()
+        now = time.time()
+        with self._write_lock() as mm:
+            if mm is None:
+                # Renewal can wait for the next call; a lease this worker holds is still valid
+                _, fields, _ = self._locate(self._mapped(), full_key, claim=False)
+                return bool(fields and fields[4] > now and fields[5] == self.pid)
+            index, fields, value = self._locate(mm, full_key, claim=True)
+            if index is None or (fields and fields[4] > now and fields[5] != self.pid):
+                self.leases_lost += 1
+                return False
+            updated_at = fields[3] if fields else 0.0
+            lease = seconds if seconds is not None else settings.shared_cache_lease_seconds
+            self._write(mm, index, key_hash(full_key), full_key, updated_at, now + lease, self.pid, value)
+        self.leases_won += 1
+        return True
+
+    def release(self, namespace: str, key: str):
+        if not self.enabled:
+            return
+        full_key = f"{namespace}:{key}".encode()
+        with self._write_lock() as mm:
+            if mm is None:
+                return # The lease lapses on its own
+            index, fields, value = self._locate(mm, full_key, claim=False)
+            if index is not None and fields[5] == self.pid:
+                self._write(mm, index, fields[2], full_key, fields[3], 0.0, 0, value)
+
+    # --- Single-flight across workers ---
+
+    async def fetch(
+        self,
+        namespace: str,
+        keys: Iterable[str],
+        max_age: float,
+        upstream: Callable[[list], Awaitable[Dict[str, Any]]],
+        timeout: Optional[float] = None
+    ) -> Dict[str, Tuple[float, Any]]:
+        """
+        (updated_at, value) per key. Keys some worker stored within max_age
+        are read from the table. Of the rest, keys this worker wins the
+        lease for are passed to upstream(keys) -> {key: value} in one call
+        and published; keys leased elsewhere are polled until the owner
+        publishes them, its lease lapses, or the timeout passes. Keys that
+        upstream does not return are left out; upstream errors propagate.
+        """
+        if not self.enabled:
+            now = time.time()
+            return {key: (now, value) for key, value in (await upstream(list(keys))).items()}
+
+        deadline = time.time() + (timeout if timeout is not None else settings.shared_cache_wait_seconds)
+        results: Dict[str, Tuple[float, Any]] = {}
+        pending = list(dict.fromkeys(keys))
+        waiting_started = False
+        while pending:
+            now = time.time()
+            leased, waiting = [], []
+            for key in pending:
+                entry = self.get(namespace, key)
+                if entry is not None and now - entry[0] < max_age:
+                    results[key] = entry
+                elif self.try_lease(namespace, key):
+                    leased.append(key)
+                else:
+                    waiting.append(key)
+
+            if leased:
+                try:
+                    values = await upstream(leased)
+                    self.upstream_keys += len(leased)
+                    fetched_at = time.time()
+                    for key, value in values.items():
+                        self.put(namespace, key, value, fetched_at)
+                        results[key] = (fetched_at, value)
+                finally:
+                    for key in leased:
+                        self.release(namespace, key)
+
+            if waiting and not waiting_started:
+                waiting_started = True
+                self.waited += len(waiting)
+            if not waiting:
+                break
+            if time.time() >= deadline:
+                self.wait_timeouts += len(waiting)
+                break
+            pending = waiting
+            await asyncio.sleep(POLL_SECONDS)
+        return results
+
+    # --- Large values ---
+
+    def _blob_path(self, namespace: str, key: str) -> str:
+        return f"{self.path}.{key_hash(f'{namespace}:{key}'.encode()):016x}"
+
+    def put_blob(self, namespace: str, key: str, value: Any, updated_at: Optional[float] = None) -> bool:
+        """Publishes a value of any size. Blocking file I/O: run it in a thread."""
+        if not self.enabled:
+            return False
+        encoded = json.dumps(value, separators=(",", ":")).encode()
+        path = self._blob_path(namespace, key)
+        staging = f"{path}.{os.getpid()}.tmp"
+        with open(staging, "wb") as f:
+            f.write(encoded)
+        os.replace(staging, path) # Readers see the old file or the new one, never a mix
+        if not self.put(namespace, key, {"size": len(encoded), "crc": zlib.crc32(encoded)}, updated_at):
+            return False
+        self.blobs_published += 1
+        return True
+
+    def get_blob(self, namespace: str, key: str, max_age: Optional[float] = None) -> Optional[Tuple[float, Any]]:
+        """
+        (updated_at, value) of a published value, or None; also None when it
+        is older than max_age, without reading the file. Blocking file I/O:
+        run it in a thread.
+        """
+        entry = self.get(namespace, key)
+        if entry is None or (max_age is not None and time.time() - entry[0] >= max_age):
+            return None
+        updated_at, meta = entry
+        try:
+            with open(self._blob_path(namespace, key), "rb") as f:
+                encoded = f.read()
+        except OSError:
+            return None
+        if len(encoded) != meta["size"] or zlib.crc32(encoded) != meta["crc"]:
+            # Replaced by a newer value after the slot was read; its slot lands next
+            self.torn_reads += 1
+            return None
+        self.blob_reads += 1
+        return updated_at, json.loads(encoded)
+
+    async def fetch_blob(
+        self,
+        namespace: str,
+        key: str,
+        max_age: float,
+        upstream: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None
+    ) -> Optional[Tuple[float, Any]]:
+        """
+        (updated_at, value) of one large value, refreshed by one worker at a
+        time. A value some worker published within max_age is read back;
+        otherwise the lease holder calls upstream() and publishes the result,
+        and the others poll until it lands, the lease lapses (then one of
+        them takes over), or the timeout passes (None). Upstream errors
+        propagate to the worker that called it.
+        """
+        if not self.enabled:
+            return time.time(), await upstream()
+
+        deadline = time.time() + (timeout if timeout is not None else settings.shared_cache_wait_seconds)
+        waited = False
+        while True:
+            entry = await asyncio.to_thread(self.get_blob, namespace, key, max_age)
+            if entry is not None:
+                return entry
+            if self.try_lease(namespace, key):
+                try:
+                    value = await upstream()
+                    fetched_at = time.time()
+                    self.upstream_keys += 1
+                    await asyncio.to_thread(self.put_blob, namespace, key, value, fetched_at)
+                    return fetched_at, value
+                finally:
+                    self.release(namespace, key)
+            if not waited:
+                waited = True
+                self.waited += 1
+            if time.time() >= deadline:
+                self.wait_timeouts += 1
+                return None
+            await asyncio.sleep(BLOB_POLL_SECONDS)
+
+    def status(self) -> Dict[str, Any]:
+        entries = 0
+        if self.enabled:
+            mm = self._mapped()
+            hashes = np.ndarray((self.slots,), dtype=np.uint64, buffer=mm, offset=FILE_HEADER.size + 8, strides=(SLOT_SIZE,))
+            entries = int(np.count_nonzero(hashes))
+        return {
+            "enabled": self.enabled,
+            "path": self.path if self.enabled else None,
+            "pid": self.pid,
+            "slots": self.slots,
+            "entries": entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "upstream_keys": self.upstream_keys,
+            "waited": self.waited,
+            "wait_timeouts": self.wait_timeouts,
+            "leases_won": self.leases_won,
+            "leases_lost": self.leases_lost,
+            "evictions": self.evictions,
+            "oversized": self.oversized,
+            "torn_reads": self.torn_reads,
+            "lock_busy": self.lock_busy,
+            "blobs_published": self.blobs_published,
+            "blob_reads": self.blob_reads,
+        }
+
+
+# Shared instance for the whole process
+shared_cache = SharedCache()
@@ -1,23 +1,40 @@
 # backend/slippage-engine/app/services/slippage_calculator.py
 
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, List
 import httpx
+import numpy as np
 from pydantic import BaseModel # Not strictly needed for logic, but good practice for complex objects
 
 from ..config import settings
-from ..schemas import SlippageRecommendation, Explanation, ExplanationFactor # Using dataclasses from schema for cleaner returns
+from ..schemas import SlippageRecommendation, SlippageCurvePoint, Explanation, ExplanationFactor # Using dataclasses from schema for cleaner returns
 
 from .risk_scorer import RiskScorer
-from .liquidity_fetcher import LiquidityFetcher # Assumes this service exists
+from .liquidity_fetcher import LiquidityFetcher, liquidity_fetcher as shared_liquidity_fetcher
+from .token_registry import token_registry
+from .reserve_cache import PoolReserves
+from .pool_graph import Route
+from . import amm_math
 from .price_feed import PriceFeed # Assumes this service exists
 from .explanation_generator import ExplanationGenerator # Assumes this service exists
+from .rule_engine import RuleEngine, CompiledRules, rule_engine as shared_rule_engine
+from .fail_chance import FailChanceModel, TOLERANCE_GRID, regime_for, fail_chance_model as shared_fail_chance_model
 
 class SlippageCalculator:
-    def __init__(self):
-        self.risk_scorer = RiskScorer()
-        self.liquidity_fetcher = LiquidityFetcher()
-        self.price_feed = PriceFeed()
-        self.explanation_generator = ExplanationGenerator()
+    def __init__(
+        self,
+        liquidity_fetcher: Optional[LiquidityFetcher] = None,
+        price_feed: Optional[PriceFeed] = None,
+        rules: Optional[RuleEngine] = None,
+        fail_chance: Optional[FailChanceModel] = None
+    ):
+        # Thresholds for all three components come from one rule table
+        self.rules = rules or shared_rule_engine
+        self.risk_scorer = RiskScorer(self.rules)
+        # Shared instances by default so caches and batching span the whole process
+        self.liquidity_fetcher = liquidity_fetcher or shared_liquidity_fetcher
+        self.price_feed = price_feed or PriceFeed()
+        self.explanation_generator = ExplanationGenerator(self.rules)
+        self.fail_chance = fail_chance or shared_fail_chance_model
 
     async def calculate(
         self,
@@ -25,39 +42,34 @@ class SlippageCalculator:
         token_out: str,
         pair_stats: Dict[str, Any], # Data from Role 1's listener
         pool_liquidity_usd: float,
-        eth_price_usd: float
+        eth_price_usd: float,
+        input_sources: Optional[Dict[str, str]] = None, # "live" / "cached" / "default" per input
+        amount_usd: Optional[float] = None,
+        reserves: Optional[PoolReserves] = None, # Cached reserves of the token/WETH pool, if fresh
+        detailed: bool = True, # False skips the explanation and alternatives
+        route: Optional[Route] = None # Multi-hop route, priced instead of the token/WETH pool
     ) -> SlippageRecommendation:
         """
         Calculates slippage recommendation based on provided stats.
         """
+        # Per-pair overrides fall back to the default table
+        rules = self.rules.for_pair(token_out)
         
         # --- Determine Base Slippage ---
         # Lower liquidity = need more slippage buffer
-        if pool_liquidity_usd > 10_000_000:
-            base_slippage = 0.003  # 0.3%
-        elif pool_liquidity_usd > 1_000_000:
-            base_slippage = 0.005  # 0.5%
-        elif pool_liquidity_usd > 100_000:
-            base_slippage = 0.01   # 1.0%
-        else:
-            base_slippage = 0.02   # 2.0%
+        base_slippage = rules.liquidity.value(pool_liquidity_usd, "base_slippage")
 
         # --- Adjustments based on Bot Activity ---
         bot_activity_score = pair_stats.get("bot_activity_score", 0)
-        bot_adjustment = bot_activity_score * 0.005 # Up to +0.5%
+        bot_adjustment = bot_activity_score * rules.bot_activity_per_unit # Up to +0.5% by default
 
         # Adjust based on recent sandwiches
         sandwich_count = pair_stats.get("sandwiches_5min", 0)
-        sandwich_adjustment = min(sandwich_count * 0.001, 0.003) # Up to +0.3%
+        sandwich_adjustment = min(sandwich_count * rules.sandwich_per_event, rules.sandwich_max) # Up to +0.3% by default
 
         # Adjust for gas prices (higher gas = more bot competition)
         avg_gas_gwei = pair_stats.get("avg_gas_gwei", 30) # Default if missing
-        if avg_gas_gwei > 100:
-            gas_adjustment = 0.002
-        elif avg_gas_gwei > 75:
-            gas_adjustment = 0.001
-        else:
-            gas_adjustment = 0
+        gas_adjustment = rules.gas.value(avg_gas_gwei, "gas_adjustment")
 
         # --- Calculate Final Recommended Slippage ---
         recommended_slippage = (
@@ -67,37 +79,54 @@ class SlippageCalculator:
             + gas_adjustment
         )
         
-        # Clamp to reasonable range (e.g., 0.3% to 3%)
-        recommended_slippage = round(max(0.003, min(recommended_slippage, 0.03)), 4)
+        # Clamp to reasonable range (0.3% to 3% by default)
+        recommended_slippage = max(rules.clamp_min, min(recommended_slippage, rules.clamp_max))
+
+        # --- Price Impact of the Trade Itself ---
+        # Constant-product math on cached reserves (or the route's pools); no network call here
+        if route is not None:
+            trade = self.route_trade(route, amount_usd)
+        else:
+            trade = self.estimate_trade_impact(token_out, amount_usd, eth_price_usd, pool_liquidity_usd, reserves)
+        impact_adjustment = min(trade["price_impact"] * rules.price_impact_multiplier, rules.price_impact_cap)
+        recommended_slippage = round(recommended_slippage + impact_adjustment, 4)
         recommended_percent = f"{(recommended_slippage * 100):.1f}%"
 
         # --- Determine Risk Level ---
         # Uses the risk scorer service
         risk_level, risk_score = self.risk_scorer.get_risk_level(
-            bot_activity_score, sandwich_count, avg_gas_gwei, pool_liquidity_usd
+            bot_activity_score, sandwich_count, avg_gas_gwei, pool_liquidity_usd, rules
         )
 
-        # --- Generate Explanation ---
-        # Provide human-readable reasoning
-        explanation_data = self.explanation_generator.generate(
-            base_slippage, bot_adjustment, sandwich_adjustment, gas_adjustment,
-            pair_stats, pool_liquidity_usd, avg_gas_gwei, recommended_slippage
-        )
+        # Sparse responses skip the two most expensive sections
+        explanation_data, alternatives = None, []
+        if detailed:
+            # --- Generate Explanation ---
+            # Provide human-readable reasoning
+            explanation_data = self.explanation_generator.generate(
+                base_slippage, bot_adjustment, sandwich_adjustment, gas_adjustment,
+                pair_stats, pool_liquidity_usd, avg_gas_gwei, recommended_slippage, rules,
+                trade, impact_adjustment
+            )
 
-        # --- Generate Alternatives ---
-        alternative_slippage_low = round(max(0.001, recommended_slippage * 0.6), 4)
-        alternative_slippage_high = round(min(0.05, recommended_slippage * 1.5), 4)
-        alternatives = [
-            {"slippage": f"{(alternative_slippage_low * 100):.1f}%", "risk": "lower", "fail_chance": "15%"},
-            {"slippage": recommended_percent, "risk": risk_level.lower(), "fail_chance": "3%"},
-            {"slippage": f"{(alternative_slippage_high * 100):.1f}%", "risk": "higher", "fail_chance": "<1%"}
-        ]
+            # --- Generate Alternatives ---
+            alternative_slippage_low = round(max(rules.low_floor, recommended_slippage * rules.low_multiplier), 4)
+            # A large trade's own impact can push the recommendation past the usual cap
+            alternative_slippage_high = round(min(max(rules.high_cap, recommended_slippage), recommended_slippage * rules.high_multiplier), 4)
+            # Fail chance and MEV loss come from the simulated curves for this market regime
+            regime = regime_for(pair_stats, pool_liquidity_usd)
+            await self.fail_chance.ensure([regime])
+            alternatives = self.fail_chance.alternatives(
+                regime,
+                [alternative_slippage_low, recommended_slippage, alternative_slippage_high],
+                ["lower", risk_level.lower(), "higher"]
+            )
 
         # --- Structure Pool and Bot Activity Stats ---
         pool_stats = {
             "liquidity_usd": round(pool_liquidity_usd, 0),
             "volume_24h_usd": 0, # Fetch this if needed, often from subgraph
-            "your_price_impact": round( (pair_stats.get('transactions_5min', 0) * 1000) / pool_liquidity_usd , 4) if pool_liquidity_usd else 0 # Rough price impact estimate
+            **self._trade_stats(trade)
         }
         
         bot_activity_stats = {
@@ -108,6 +137,10 @@ class SlippageCalculator:
             "sandwiches_5min": pair_stats.get("sandwiches_5min", 0)
         }
         
+        # Any non-live input means the number was built from fallbacks
+        input_sources = input_sources or {}
+        degraded = any(source != "live" for source in input_sources.values())
+
         # --- Return the full recommendation object ---
         return SlippageRecommendation(
             recommended_slippage=recommended_slippage,
@@ -117,5 +150,326 @@ class SlippageCalculator:
             pool_stats=pool_stats,
             bot_activity=bot_activity_stats,
             explanation=explanation_data,
-            alternatives=alternatives
-        )
\ No newline at end of file
+            alternatives=alternatives,
+            inputs=input_sources,
+            degraded=degraded
+        )
+
+    async def calculate_batch(
+        self,
+        pair_stats: List[Dict[str, Any]],
+        pool_liquidity_usd: List[float],
+        eth_price_usd: float,
+        input_sources: Optional[List[Dict[str, str]]] = None,
+        pairs: Optional[List[str]] = None,
+        tokens_in: Optional[List[str]] = None,
+        amounts_usd: Optional[List[Optional[float]]] = None,
+        reserves: Optional[List[Optional[PoolReserves]]] = None,
+        detailed: bool = True,
+        routes: Optional[List[Optional[Route]]] = None
+    ) -> List[SlippageRecommendation]:
+        """
+        Vectorized calculate() over many items: every numeric step runs once
+        over NumPy arrays; only the per-item response objects are built in a loop.
+        Items whose pairs have rule overrides are computed in their own group.
+        """
+        n = len(pair_stats)
+        if n == 0:
+            return []
+        input_sources = input_sources or [{} for _ in range(n)]
+        pairs = pairs or [None] * n
+        tokens_in = tokens_in or ["ETH"] * n
+        amounts_usd = amounts_usd or [None] * n
+        reserves = reserves or [None] * n
+        routes = routes or [None] * n
+        # Simulate any new market regimes up front, off the event loop
+        if detailed:
+            await self.fail_chance.ensure([regime_for(s, l) for s, l in zip(pair_stats, pool_liquidity_usd)])
+
+        # Group item indices by the compiled rule table that applies to them
+        groups: Dict[int, List[int]] = {}
+        group_rules: Dict[int, CompiledRules] = {}
+        for i, pair in enumerate(pairs):
+            rules = self.rules.for_pair(pair)
+            groups.setdefault(id(rules), []).append(i)
+            group_rules[id(rules)] = rules
+
+        results: List[Optional[SlippageRecommendation]] = [None] * n
+        for key, indices in groups.items():
+            group = self._calculate_group(
+                group_rules[key],
+                [pair_stats[i] for i in indices],
+                [pool_liquidity_usd[i] for i in indices],
+                [input_sources[i] for i in indices],
+                eth_price_usd,
+                [tokens_in[i] for i in indices],
+                [pairs[i] for i in indices],
+                [amounts_usd[i] for i in indices],
+                [reserves[i] for i in indices],
+                detailed,
+                [routes[i] for i in indices]
+            )
+            for i, recommendation in zip(indices, group):
+                results[i] = recommendation
+        return results
+
+    def _calculate_group(
+        self,
+        rules: CompiledRules,
+        pair_stats: List[Dict[str, Any]],
+        pool_liquidity_usd: List[float],
+        input_sources: List[Dict[str, str]],
+        eth_price_usd: float,
+        tokens_in: List[str],
+        tokens_out: List[Optional[str]],
+        amounts_usd: List[Optional[float]],
+        reserves: List[Optional[PoolReserves]],
+        detailed: bool = True,
+        routes: Optional[List[Optional[Route]]] = None
+    ) -> List[SlippageRecommendation]:
+        n = len(pair_stats)
+        routes = routes or [None] * n
+
+        liquidity = np.asarray(pool_liquidity_usd, dtype=float)
+        bot_activity_score = np.array([float(s.get("bot_activity_score", 0)) for s in pair_stats])
+        sandwich_count = np.array([float(s.get("sandwiches_5min", 0)) for s in pair_stats])
+        avg_gas_gwei = np.array([float(s.get("avg_gas_gwei", 30)) for s in pair_stats])
+
+        # --- Base Slippage and Adjustments (same rule table as calculate) ---
+        base_slippage = rules.liquidity.values(liquidity, "base_slippage")
+        bot_adjustment = bot_activity_score * rules.bot_activity_per_unit
+        sandwich_adjustment = np.minimum(sandwich_count * rules.sandwich_per_event, rules.sandwich_max)
+        gas_adjustment = rules.gas.values(avg_gas_gwei, "gas_adjustment")
+
+        # --- Final Recommended Slippage, clamped to the configured range ---
+        recommended = np.clip(
+            base_slippage + bot_adjustment + sandwich_adjustment + gas_adjustment,
+            rules.clamp_min, rules.clamp_max
+        )
+
+        # --- Risk Levels ---
+        risk_levels, risk_scores = self.risk_scorer.get_risk_levels(
+            bot_activity_score, sandwich_count, avg_gas_gwei, liquidity, rules
+        )
+
+        # --- Price Impact of each Trade (same math as estimate_trade_impact) ---
+        trades = self._estimate_trade_impacts(tokens_out, amounts_usd, eth_price_usd, liquidity, reserves)
+        # Routed items take their route's compounded impact (see route_trade)
+        for i, route in enumerate(routes):
+            if route is not None:
+                trades["price_impact"][i] = self.route_trade(route, amounts_usd[i])["price_impact"]
+        impact_adjustment = np.minimum(trades["price_impact"] * rules.price_impact_multiplier, rules.price_impact_cap)
+
+        # --- Assemble per-item responses ---
+        # Rounding uses Python's round() so results match calculate() exactly
+        results = []
+        for i in range(n):
+            stats = pair_stats[i]
+            recommended_slippage = round(float(recommended[i]) + float(impact_adjustment[i]), 4)
+            alternative_slippage_low = round(max(rules.low_floor, recommended_slippage * rules.low_multiplier), 4)
+            alternative_slippage_high = round(min(max(rules.high_cap, recommended_slippage), recommended_slippage * rules.high_multiplier), 4)
+            recommended_percent = f"{(recommended_slippage * 100):.1f}%"
+            risk_level = risk_levels[i]
+            sources = input_sources[i]
+            impact_source = str(trades["source"][i])
+            if routes[i] is not None:
+                trade = self.route_trade(routes[i], amounts_usd[i])
+            else:
+                trade = {
+                    "price_impact": float(trades["price_impact"][i]),
+                    "expected_amount_out": float(trades["expected_amount_out"][i]) if impact_source == "reserves" else None,
+                    "amount_usd": amounts_usd[i],
+                    "source": impact_source,
+                    "reserves": reserves[i] if impact_source == "reserves" else None,
+                }
+
+            explanation_data, alternatives = None, []
+            if detailed:
+                explanation_data = self.explanation_generator.generate(
+                    float(base_slippage[i]), float(bot_adjustment[i]), float(sandwich_adjustment[i]), float(gas_adjustment[i]),
+                    stats, float(liquidity[i]), float(avg_gas_gwei[i]), recommended_slippage, rules,
+                    trade, float(impact_adjustment[i])
+                )
+                alternatives = self.fail_chance.alternatives(
+                    regime_for(stats, float(liquidity[i])),
+                    [alternative_slippage_low, recommended_slippage, alternative_slippage_high],
+                    ["lower", risk_level.lower(), "higher"]
+                )
+
+            results.append(SlippageRecommendation(
+                recommended_slippage=recommended_slippage,
+                recommended_percent=recommended_percent,
+                risk_level=risk_level,
+                risk_score=int(risk_scores[i]),
+                pool_stats={
+                    "liquidity_usd": round(float(liquidity[i]), 0),
+                    "volume_24h_usd": 0,
+                    **self._trade_stats(trade)
+                },
+                bot_activity={
+                    "level": risk_level.lower(),
+                    "score": round(float(bot_activity_score[i]), 3),
+                    "transactions_5min": stats.get("transactions_5min", 0),
+                    "suspicious_tx_count": stats.get("suspicious_tx_count", 0),
+                    "sandwiches_5min": stats.get("sandwiches_5min", 0)
+                },
+                explanation=explanation_data,
+                alternatives=alternatives,
+                inputs=sources,
+                degraded=any(source != "live" for source in sources.values())
+            ))
+        return results
+
+    # --- Slippage Curve ---
+
+    async def curve(
+        self,
+        pair: Optional[str],
+        pair_stats: Dict[str, Any],
+        pool_liquidity_usd: float,
+        recommended_slippage: float,
+        risk_level: str,
+        min_slippage: Optional[float] = None,
+        max_slippage: Optional[float] = None,
+        points: int = 50
+    ) -> List[SlippageCurvePoint]:
+        """
+        Fail chance and expected MEV loss at evenly spaced tolerances, plus
+        the recommendation itself. The range defaults to the rule table's
+        low floor up to the high alternative. All points come from one
+        interpolation over the regime's simulated curves.
+        """
+        rules = self.rules.for_pair(pair)
+        high = min(max(rules.high_cap, recommended_slippage), recommended_slippage * rules.high_multiplier)
+        low = rules.low_floor if min_slippage is None else min_slippage
+        high = high if max_slippage is None else max_slippage
+        high = min(max(high, low), float(TOLERANCE_GRID[-1]))
+
+        tolerances = np.unique(np.round(np.append(np.linspace(low, high, points), recommended_slippage), 4))
+        regime = regime_for(pair_stats, pool_liquidity_usd)
+        await self.fail_chance.ensure([regime])
+        estimates = self.fail_chance.estimate(regime, tolerances)
+
+        recommended_risk = risk_level.lower()
+        return [
+            SlippageCurvePoint(
+                slippage=slippage,
+                percent=f"{(slippage * 100):.2f}%",
+                fail_chance=round(fail, 4),
+                expected_mev_loss=round(loss, 6),
+                risk="lower" if slippage < recommended_slippage else "higher" if slippage > recommended_slippage else recommended_risk
+            )
+            for slippage, (fail, loss) in zip(tolerances.tolist(), estimates)
+        ]
+
+    # --- Trade Price Impact ---
+
+    @staticmethod
+    def buys_pool_token(token_out: Optional[str], reserves: PoolReserves) -> bool:
+        """
+        True if the trade receives the pool's token, paying WETH (or another
+        token, valued in WETH); False if it sells the pool's token for WETH.
+        Decided by token_out, since token_in need not be in the pool at all.
+        """
+        return token_out is None or token_registry.resolve_address(token_out) == reserves.token
+
+    def estimate_trade_impact(
+        self,
+        token_out: Optional[str],
+        amount_usd: Optional[float],
+        eth_price_usd: float,
+        pool_liquidity_usd: float,
+        reserves: Optional[PoolReserves] = None
+    ) -> Dict[str, Any]:
+        """
+        Price impact of the caller's own trade. Uses exact x*y=k math on the
+        cached pool reserves; without them, assumes a 50/50 pool holding
+        pool_liquidity_usd. Returns impact 0 when no trade size is given.
+        """
+        trade = {"price_impact": 0.0, "expected_amount_out": None, "amount_usd": amount_usd, "source": "none", "reserves": None}
+        if not amount_usd or amount_usd <= 0:
+            return trade
+
+        fee = settings.amm_fee
+        if reserves is not None and reserves.reserve_token > 0 and reserves.reserve_weth > 0:
+            if self.buys_pool_token(token_out, reserves):
+                reserve_in, reserve_out = reserves.reserve_weth, reserves.reserve_token
+                amount_in = amount_usd / eth_price_usd
+            else:
+                # Token price implied by the pool itself
+                reserve_in, reserve_out = reserves.reserve_token, reserves.reserve_weth
+                amount_in = amount_usd / (reserves.reserve_weth * eth_price_usd / reserves.reserve_token)
+            trade.update(
+                price_impact=amm_math.price_impact(amount_in, reserve_in, fee),
+                expected_amount_out=amm_math.get_amount_out(amount_in, reserve_in, reserve_out, fee),
+                source="reserves",
+                reserves=reserves,
+            )
+        elif pool_liquidity_usd > 0:
+            trade.update(
+                price_impact=amm_math.price_impact(amount_usd, pool_liquidity_usd / 2, fee),
+                source="liquidity_estimate",
+            )
+        return trade
+
+    def _estimate_trade_impacts(
+        self,
+        tokens_out: List[Optional[str]],
+        amounts_usd: List[Optional[float]],
+        eth_price_usd: float,
+        liquidity: np.ndarray,
+        reserves: List[Optional[PoolReserves]]
+    ) -> Dict[str, Any]:
+        """Vectorized estimate_trade_impact; the arithmetic matches it operation for operation."""
+        fee = settings.amm_fee
+        amount = np.array([a if a and a > 0 else 0.0 for a in amounts_usd], dtype=float)
+        has_reserves = np.array([r is not None and r.reserve_token > 0 and r.reserve_weth > 0 for r in reserves])
+        buys = np.array([r is None or self.buys_pool_token(t, r) for t, r in zip(tokens_out, reserves)])
+        # Placeholder reserves of 1.0 keep the masked-out lanes finite
+        reserve_token = np.array([r.reserve_token if ok else 1.0 for r, ok in zip(reserves, has_reserves)])
+        reserve_weth = np.array([r.reserve_weth if ok else 1.0 for r, ok in zip(reserves, has_reserves)])
+
+        reserve_in = np.where(buys, reserve_weth, reserve_token)
+        reserve_out = np.where(buys, reserve_token, reserve_weth)
+        amount_in = np.where(buys, amount / eth_price_usd, amount / (reserve_weth * eth_price_usd / reserve_token))
+
+        half_liquidity = np.where(liquidity > 0, liquidity / 2, 1.0)
+        from_reserves = (amount > 0) & has_reserves
+        from_liquidity = (amount > 0) & ~has_reserves & (liquidity > 0)
+
+        impact = np.where(
+            from_reserves,
+            amm_math.price_impact(amount_in, reserve_in, fee),
+            np.where(from_liquidity, amm_math.price_impact(amount, half_liquidity, fee), 0.0)
+        )
+        source = np.where(from_reserves, "reserves", np.where(from_liquidity, "liquidity_estimate", "none"))
+        return {
+            "price_impact": impact,
+            "expected_amount_out": amm_math.get_amount_out(amount_in, reserve_in, reserve_out, fee),
+            "source": source,
+        }
+
+    @staticmethod
+    def route_trade(route: Route, amount_usd: Optional[float]) -> Dict[str, Any]:
+        """
+        Price impact of a trade along a multi-hop route: each hop's
+        constant-product impact, compounded. Impact 0 when no trade size is
+        given (the route was then chosen for a nominal size).
+        """
+        trade = {"price_impact": 0.0, "expected_amount_out": None, "amount_usd": amount_usd, "source": "none", "reserves": None, "route": route}
+        if amount_usd and amount_usd > 0:
+            trade.update(price_impact=route.price_impact, expected_amount_out=route.amount_out, source="route")
+        return trade
+
+    @staticmethod
+    def _trade_stats(trade: Dict[str, Any]) -> Dict[str, Any]:
+        amount_out = trade["expected_amount_out"]
+        stats = {
+            "your_price_impact": round(trade["price_impact"], 4),
+            "expected_amount_out": round(amount_out, 6) if amount_out is not None else None,
+            "price_impact_source": trade["source"],
+        }
+        route = trade.get("route")
+        if route is not None:
+            stats["route"] = route.summary()
+        return stats
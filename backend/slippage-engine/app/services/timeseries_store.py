@@ -0,0 +1,377 @@
+# backend/slippage-engine/app/services/timeseries_store.py
+
+import asyncio
+import math
+import os
+import re
+import shutil
+import time
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+from cachetools import LRUCache
+
+from ..config import settings
+from .shared_cache import SharedCache, shared_cache as default_shared_cache
+
+DEFAULT_STORE_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "..", "data", "timeseries"))
+
+# Fixed-width columns of one record: the pair stats inputs and the
+# recommendation built from them. Missing floats are stored as NaN.
+COLUMNS = {
+    "t": np.int64, # Milliseconds since the epoch; non-decreasing within a pair
+    "bot_activity_score": np.float32,
+    "sandwiches_5min": np.int32,
+    "transactions_5min": np.int32,
+    "suspicious_tx_count": np.int32,
+    "avg_gas_gwei": np.float32,
+    "pool_liquidity_usd": np.float64,
+    "eth_price_usd": np.float64,
+    "amount_usd": np.float64,
+    "price_impact": np.float32,
+    "recommended_slippage": np.float32,
+    "risk_score": np.uint8,
+    "degraded": np.uint8,
+}
+VALUE_COLUMNS = tuple(name for name in COLUMNS if name != "t")
+ROW_BYTES = sum(np.dtype(dtype).itemsize for dtype in COLUMNS.values())
+
+AGGREGATIONS = ("last", "mean", "max")
+
+
+def _float(value: Any) -> float:
+    try:
+        return float(value) if value is not None else math.nan
+    except (TypeError, ValueError):
+        return math.nan
+
+
+def recommendation_row(
+    pair_stats: Dict[str, Any],
+    pool_liquidity_usd: float,
+    eth_price_usd: float,
+    amount_usd: Optional[float],
+    recommendation: Any
+) -> Dict[str, Any]:
+    """Flattens one calculation's inputs and SlippageRecommendation into a record."""
+    return {
+        "bot_activity_score": _float(pair_stats.get("bot_activity_score")),
+        "sandwiches_5min": int(pair_stats.get("sandwiches_5min") or 0),
+        "transactions_5min": int(pair_stats.get("transactions_5min") or 0),
+        "suspicious_tx_count": int(pair_stats.get("suspicious_tx_count") or 0),
+        "avg_gas_gwei": _float(pair_stats.get("avg_gas_gwei")),
+        "pool_liquidity_usd": _float(pool_liquidity_usd),
+        "eth_price_usd": _float(eth_price_usd),
+        "amount_usd": _float(amount_usd),
+        "price_impact": _float(recommendation.pool_stats.get("your_price_impact")),
+        "recommended_slippage": recommendation.recommended_slippage,
+        "risk_score": recommendation.risk_score,
+        "degraded": int(recommendation.degraded),
+    }
+
+
+class _Segment:
+    """
+    One pair's records for one time period: a preallocated memory-mapped
+    file per column. Files are sparse until written, and the row count is
+    recovered from the timestamp column, so there is no metadata to keep
+    in sync.
+    """
+
+    def __init__(self, directory: str, capacity: int):
+        self.directory = directory
+        self.capacity = capacity
+        create = not os.path.exists(os.path.join(directory, "t.bin"))
+        os.makedirs(directory, exist_ok=True)
+        self.columns = {
+            name: np.memmap(os.path.join(directory, f"{name}.bin"), dtype=dtype, mode="w+" if create else "r+", shape=(capacity,))
+            for name, dtype in COLUMNS.items()
+        }
+        written = np.flatnonzero(self.columns["t"])
+        self.count = int(written[-1]) + 1 if len(written) else 0
+        self.dirty = False
+
+    def append(self, t_ms: int, row: Dict[str, Any]) -> bool:
+        if self.count >= self.capacity:
+            return False
+        i = self.count
+        self.columns["t"][i] = t_ms
+        for name in VALUE_COLUMNS:
+            self.columns[name][i] = row.get(name, 0)
+        self.count += 1
+        self.dirty = True
+        return True
+
+    def refresh(self):
+        """Picks up rows another process appended since this segment was mapped."""
+        written = np.flatnonzero(self.columns["t"][self.count:])
+        if len(written):
+            self.count += int(written[-1]) + 1
+
+    def last_t(self) -> int:
+        return int(self.columns["t"][self.count - 1]) if self.count else 0
+
+    def view(self, start_ms: int, end_ms: int, names: Sequence[str]) -> Dict[str, np.ndarray]:
+        """Rows with start_ms <= t <= end_ms, as slices of the mapped files (no copy)."""
+        t = self.columns["t"][:self.count]
+        lo = int(np.searchsorted(t, start_ms, side="left"))
+        hi = int(np.searchsorted(t, end_ms, side="right"))
+        return {name: self.columns[name][lo:hi] for name in names}
+
+    def flush(self):
+        if self.dirty:
+            self.dirty = False
+            for column in self.columns.values():
+                column.flush()
+
+
+class _OpenSegments(LRUCache):
+    """Bounded set of mapped segments; evicted ones are flushed before they are unmapped."""
+
+    def popitem(self):
+        key, segment = super().popitem()
+        segment.flush()
+        return key, segment
+
+
+class TimeSeriesStore:
+    """
+    Append-only columnar history of pair stats and recommendations.
+
+    Each pair gets a directory with one segment per settings.timeseries_segment_seconds.
+    Records are rate-limited to one per pair per settings.timeseries_min_interval_ms, so a
+    segment's capacity is fixed. Writes land in the page cache and are flushed
+    to disk by a background loop, which also drops segments past retention.
+    Memory stays bounded: the OS pages mapped files in and out, and at most
+    settings.timeseries_max_open_segments are mapped at once.
+
+    With several workers, only the one holding the writer lease records and
+    expires; the others read the same files and skip recording.
+    """
+
+    def __init__(self, root: Optional[str] = None, shared: Optional[SharedCache] = None):
+        self.root = root or settings.timeseries_path or DEFAULT_STORE_PATH
+        self.shared = shared or default_shared_cache
+        self.writer = not self.shared.enabled
+        self.segment_ms = settings.timeseries_segment_seconds * 1000
+        self.capacity = max(1, self.segment_ms // max(1, settings.timeseries_min_interval_ms))
+        self._segments: _OpenSegments = _OpenSegments(maxsize=settings.timeseries_max_open_segments)
+        self._last_t: Dict[str, int] = {}
+        self._expired_before = 0 # Segment id below which everything is already deleted
+        self._task: Optional[asyncio.Task] = None
+
+        # Counters
+        self.records = 0
+        self.rate_limited = 0
+        self.not_writer = 0
+        self.dropped = 0
+        self.flushes = 0
+        self.segments_expired = 0
+        self.errors = 0
+
+    # --- Lifecycle ---
+
+    async def start(self):
+        if self._task is None and settings.timeseries_enabled:
+            self._claim_writer()
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        self.flush()
+        if self.writer and self.shared.enabled:
+            self.shared.release("timeseries", "writer")
+
+    def _claim_writer(self):
+        """Takes or renews the writer lease; lasts a few flush intervals past a crash."""
+        if not self.shared.enabled:
+            return
+        was_writer = self.writer
+        self.writer = self.shared.try_lease("timeseries", "writer", settings.timeseries_flush_seconds * 3)
+        if self.writer and not was_writer:
+            # Segments mapped while another worker wrote have stale row counts
+            self.flush()
+            self._segments.clear()
+            self._last_t.clear()
+            print(f"   [TimeSeries] Recording in this worker (pid {os.getpid()})")
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.timeseries_flush_seconds)
+            try:
+                self._claim_writer()
+                # msync can block; snapshot the open segments here and flush them off the event loop
+                await asyncio.to_thread(self._flush_segments, list(self._segments.values()))
+                if self.writer:
+                    self.expire()
+            except Exception as e:
+                self.errors += 1
+                print(f"   [TimeSeries] Flush failed: {e}")
+
+    # --- Layout ---
+
+    @staticmethod
+    def pair_key(pair: str) -> str:
+        return re.sub(r"[^a-z0-9_.-]", "_", pair.lower())
+
+    def _segment(self, pair: str, segment_id: int, create: bool) -> Optional[_Segment]:
+        key = (pair, segment_id)
+        segment = self._segments.get(key)
+        if segment is None:
+            directory = os.path.join(self.root, pair, str(segment_id))
+            if not create and not os.path.isdir(directory):
+                return None
+            segment = self._segments[key] = _Segment(directory, self.capacity)
+        return segment
+
+    def _segment_ids(self, pair: str) -> List[int]:
+        try:
+            return sorted(int(name) for name in os.listdir(os.path.join(self.root, pair)) if name.isdigit())
+        except FileNotFoundError:
+            return []
+
+    # --- Writes ---
+
+    def record(self, pair: str, row: Dict[str, Any], t_ms: Optional[int] = None) -> bool:
+        """Appends one record unless the pair already has one within the rate-limit interval."""
+        if not settings.timeseries_enabled:
+            return False
+        if not self.writer:
+            self.not_writer += 1
+            return False
+        pair = self.pair_key(pair)
+        t_ms = int(time.time() * 1000) if t_ms is None else int(t_ms)
+
+        last = self._last_t.get(pair)
+        if last is not None and t_ms - last < settings.timeseries_min_interval_ms:
+            self.rate_limited += 1
+            return False
+        try:
+            segment = self._segment(pair, t_ms // self.segment_ms, create=True)
+            if last is None:
+                # First write since startup: keep time non-decreasing across restarts
+                last = segment.last_t()
+                if t_ms < last:
+                    self.dropped += 1
+                    return False
+            if not segment.append(t_ms, row):
+                self.dropped += 1
+                return False
+        except OSError as e:
+            self.errors += 1
+            print(f"   [TimeSeries] Write failed for {pair}: {e}")
+            return False
+        self._last_t[pair] = t_ms
+        self.records += 1
+        return True
+
+    def flush(self):
+        self._flush_segments(list(self._segments.values()))
+
+    def _flush_segments(self, segments: List[_Segment]):
+        for segment in segments:
+            segment.flush()
+        self.flushes += 1
+
+    def expire(self, now_ms: Optional[int] = None):
+        """Deletes segments that ended before the retention window."""
+        now_ms = int(time.time() * 1000) if now_ms is None else now_ms
+        oldest = (now_ms - int(settings.timeseries_retention_days * 86_400_000)) // self.segment_ms
+        if oldest <= self._expired_before:
+            return # Nothing new has aged out since the last pass
+        self._expired_before = oldest
+        for pair in self.pairs():
+            for segment_id in self._segment_ids(pair):
+                if segment_id >= oldest:
+                    break
+                self._segments.pop((pair, segment_id), None)
+                shutil.rmtree(os.path.join(self.root, pair, str(segment_id)), ignore_errors=True)
+                self.segments_expired += 1
+
+    # --- Reads ---
+
+    def pairs(self) -> List[str]:
+        try:
+            return sorted(name for name in os.listdir(self.root) if os.path.isdir(os.path.join(self.root, name)))
+        except FileNotFoundError:
+            return []
+
+    def query(self, pair: str, start_ms: int, end_ms: int, columns: Optional[Sequence[str]] = None) -> Dict[str, np.ndarray]:
+        """
+        Records with start_ms <= t <= end_ms. A range inside one segment is
+        returned as views of the mapped files; spanning segments concatenates.
+        """
+        pair = self.pair_key(pair)
+        names = ["t"] + [c for c in (columns or VALUE_COLUMNS) if c in COLUMNS and c != "t"]
+        pieces = []
+        for segment_id in range(start_ms // self.segment_ms, end_ms // self.segment_ms + 1):
+            segment = self._segment(pair, segment_id, create=False)
+            if segment is not None and not self.writer:
+                segment.refresh()
+            if segment is not None and segment.count:
+                piece = segment.view(start_ms, end_ms, names)
+                if len(piece["t"]):
+                    pieces.append(piece)
+        if not pieces:
+            return {name: np.empty(0, dtype=COLUMNS[name]) for name in names}
+        if len(pieces) == 1:
+            return pieces[0]
+        return {name: np.concatenate([p[name] for p in pieces]) for name in names}
+
+    @staticmethod
+    def downsample(data: Dict[str, np.ndarray], resolution_ms: int, agg: str = "last") -> Dict[str, np.ndarray]:
+        """
+        One row per resolution_ms bucket, stamped with the bucket start.
+        "last" keeps the latest record, "mean" averages and "max" takes the
+        peak; risk_score and degraded always take the peak.
+        """
+        t = data["t"]
+        if not len(t) or resolution_ms <= 0:
+            return data
+        buckets = t // resolution_ms
+        starts = np.flatnonzero(np.concatenate(([True], buckets[1:] != buckets[:-1])))
+        ends = np.append(starts[1:], len(t))
+
+        result = {"t": buckets[starts] * resolution_ms}
+        for name, column in data.items():
+            if name == "t":
+                continue
+            if name in ("risk_score", "degraded") or agg == "max":
+                result[name] = np.fmax.reduceat(column, starts) # Ignores NaN
+            elif agg == "mean":
+                with np.errstate(invalid="ignore"):
+                    sums = np.add.reduceat(np.nan_to_num(column.astype(np.float64)), starts)
+                    counts = np.add.reduceat((~np.isnan(column)).astype(np.int64), starts) if column.dtype.kind == "f" else ends - starts
+                    result[name] = np.where(counts > 0, sums / np.maximum(counts, 1), np.nan)
+            else:
+                result[name] = column[ends - 1]
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "enabled": settings.timeseries_enabled,
+            "running": self._task is not None,
+            "writer": self.writer,
+            "path": self.root,
+            "pairs": len(self._last_t),
+            "open_segments": len(self._segments),
+            "records": self.records,
+            "rate_limited": self.rate_limited,
+            "not_writer": self.not_writer,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "segments_expired": self.segments_expired,
+            "errors": self.errors,
+            "row_bytes": ROW_BYTES,
+            "segment_rows": self.capacity,
+        }
+
+
+# Shared instance for the whole process
+timeseries_store = TimeSeriesStore()
@@ -0,0 +1,243 @@
+# backend/slippage-engine/app/services/token_registry.py
+
+import asyncio
+import json
+import os
+from dataclasses import dataclass
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+from ..config import settings
+
+DEFAULT_TOKENS_PATH = os.path.normpath(os.path.join(os.path.dirname(__file__), "..", "data", "tokens.json"))
+
+HEX_DIGITS = frozenset("0123456789abcdef")
+
+# The listener names pairs by symbol, sorted and joined ("PEPE-WETH"), and always calls WETH "WETH"
+LISTENER_WETH_SYMBOL = "WETH"
+
+
+@dataclass(frozen=True)
+class Token:
+    symbol: str
+    name: str
+    address: str # Lowercase
+    decimals: int
+    coingecko_id: Optional[str] = None
+    market_data: bool = False # Quoted and charted by the market data refresher
+
+
+def is_address(value: str) -> bool:
+    return len(value) == 42 and value[:2] in ("0x", "0X") and HEX_DIGITS.issuperset(value[2:].lower())
+
+
+class _Index(NamedTuple):
+    tokens: Tuple[Token, ...]
+    by_symbol: Dict[str, Token] # Upper-case symbol or alias
+    by_address: Dict[str, Token]
+    by_coingecko_id: Dict[str, Token]
+    market: Tuple[Token, ...]
+    weth: Token
+
+
+def _build_index(table: Dict[str, Any]) -> _Index:
+    """Validates a token table and builds its lookup maps. Raises ValueError if it is invalid."""
+    tokens, by_symbol, by_address, by_coingecko_id = [], {}, {}, {}
+    for i, entry in enumerate(table.get("tokens") or []):
+        try:
+            token = Token(
+                symbol=str(entry["symbol"]).upper(),
+                name=str(entry.get("name") or entry["symbol"]),
+                address=str(entry["address"]).lower(),
+                decimals=int(entry["decimals"]),
+                coingecko_id=entry.get("coingecko_id") or None,
+                market_data=bool(entry.get("market_data", False)),
+            )
+        except (KeyError, TypeError, ValueError) as e:
+            raise ValueError(f"Invalid token #{i}: {e!r}")
+        if not is_address(token.address):
+            raise ValueError(f"Invalid address for {token.symbol}: {token.address}")
+        if not 0 <= token.decimals <= 36:
+            raise ValueError(f"Invalid decimals for {token.symbol}: {token.decimals}")
+
+        # Duplicates would make a lookup ambiguous, so they reject the whole table
+        for symbol in [token.symbol, *(str(a).upper() for a in entry.get("aliases") or [])]:
+            if symbol in by_symbol:
+                raise ValueError(f"Duplicate symbol {symbol}")
+            by_symbol[symbol] = token
+        if token.address in by_address:
+            raise ValueError(f"Duplicate address {token.address}")
+        by_address[token.address] = token
+        if token.coingecko_id:
+            if token.coingecko_id in by_coingecko_id:
+                raise ValueError(f"Duplicate coingecko_id {token.coingecko_id}")
+            by_coingecko_id[token.coingecko_id] = token
+        tokens.append(token)
+
+    weth = by_symbol.get("WETH")
+    if weth is None:
+        raise ValueError("Token table must define WETH (as a symbol or alias)")
+    market = tuple(t for t in tokens if t.market_data and t.coingecko_id)
+    return _Index(tuple(tokens), by_symbol, by_address, by_coingecko_id, market, weth)
+
+
+class TokenRegistry:
+    """
+    Token metadata shared by every router and service, loaded from a data
+    file (bundled app/data/tokens.json by default).
+
+    Lookups by symbol or alias, address (any case) and CoinGecko id are
+    single dict reads, so the table can hold thousands of tokens. Reloads
+    build new indexes and swap them in one assignment; an invalid file
+    keeps the previous table.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or settings.token_registry_path or DEFAULT_TOKENS_PATH
+        self.version = 0
+        self._index: Optional[_Index] = None
+        self._mtime = 0.0
+        self._watch_task: Optional[asyncio.Task] = None
+        self.load()
+
+    def load(self):
+        with open(self.path) as f:
+            table = json.load(f)
+        self.apply(table)
+        self._mtime = os.path.getmtime(self.path)
+
+    def apply(self, table: Dict[str, Any]):
+        """Indexes and installs a token table. Raises ValueError if it is invalid."""
+        self._index = _build_index(table)
+        self.version += 1
+
+    def reload(self) -> bool:
+        try:
+            self.load()
+            print(f"   [Tokens] Loaded {len(self._index.tokens)} tokens (v{self.version}) from {self.path}")
+            return True
+        except Exception as e:
+            print(f"   [Tokens] Reload failed, keeping v{self.version}: {e}")
+            return False
+
+    # --- Lookups ---
+
+    def by_symbol(self, symbol: str) -> Optional[Token]:
+        return self._index.by_symbol.get(symbol.upper())
+
+    def by_address(self, address: str) -> Optional[Token]:
+        return self._index.by_address.get(address.lower())
+
+    def by_coingecko_id(self, coingecko_id: str) -> Optional[Token]:
+        return self._index.by_coingecko_id.get(coingecko_id.lower())
+
+    def resolve(self, value: str) -> Optional[Token]:
+        """The token for an address or a symbol, if the registry knows it."""
+        return self.by_address(value) if is_address(value) else self.by_symbol(value)
+
+    def resolve_address(self, value: str) -> Optional[str]:
+        """
+        Lowercase address for an address (known or not) or a known symbol.
+        None for a symbol the registry cannot resolve.
+        """
+        if is_address(value):
+            return value.lower()
+        token = self.by_symbol(value)
+        return token.address if token is not None else None
+
+    def is_weth(self, token: str) -> bool:
+        weth = self._index.weth
+        return token.lower() == weth.address or self._index.by_symbol.get(token.upper()) is weth
+
+    # --- Listener pair ids ---
+
+    def listener_pair(self, token: str) -> Optional[str]:
+        """
+        The listener's id for a token's WETH pair ("PEPE-WETH"), for a
+        token address or symbol. None for WETH itself or a token the
+        registry does not know, which the listener cannot name either.
+        """
+        known = self.resolve(token)
+        if known is None or known is self._index.weth:
+            return None
+        return "-".join(sorted((known.symbol, LISTENER_WETH_SYMBOL)))
+
+    def pair_key(self, pair: str) -> str:
+        """
+        One key for a pair however it is named: the non-WETH token's
+        address for an address, a symbol or a listener WETH pair id
+        ("PEPE-WETH"); anything else upper-cased, as the listener does.
+        """
+        if "-" in pair:
+            symbols = pair.upper().split("-")
+            if len(symbols) == 2 and LISTENER_WETH_SYMBOL in symbols:
+                other = symbols[1] if symbols[0] == LISTENER_WETH_SYMBOL else symbols[0]
+                known = self.by_symbol(other)
+                if known is not None and known is not self._index.weth:
+                    return known.address
+            return pair.upper()
+        address = self.resolve_address(pair)
+        return address if address is not None else pair.upper()
+
+    @property
+    def weth(self) -> Token:
+        return self._index.weth
+
+    @property
+    def market_tokens(self) -> Tuple[Token, ...]:
+        """Tokens the market data refresher quotes and charts."""
+        return self._index.market
+
+    def tokens(self, offset: int = 0, limit: Optional[int] = None) -> List[Token]:
+        end = offset + limit if limit is not None else None
+        return list(self._index.tokens[offset:end])
+
+    def __len__(self) -> int:
+        return len(self._index.tokens)
+
+    # --- Hot reload ---
+
+    async def _watch(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                mtime = os.path.getmtime(self.path)
+            except OSError:
+                continue
+            if mtime != self._mtime:
+                self._mtime = mtime
+                self.reload()
+
+    def start_watching(self):
+        interval = settings.token_registry_reload_seconds
+        if interval > 0 and self._watch_task is None:
+            self._watch_task = asyncio.create_task(self._watch(interval))
+
+    def stop_watching(self):
+        if self._watch_task is not None:
+            self._watch_task.cancel()
+            self._watch_task = None
+
+    def status(self) -> Dict[str, Any]:
+        index = self._index
+        return {
+            "version": self.version,
+            "path": self.path,
+            "tokens": len(index.tokens),
+            "symbols": len(index.by_symbol),
+            "coingecko_ids": len(index.by_coingecko_id),
+            "market_tokens": [t.symbol for t in index.market],
+            "weth": index.weth.address,
+        }
+
+
+# Shared instance for the whole process
+token_registry = TokenRegistry()
+
+
+def is_weth(token: str) -> bool:
+    return token_registry.is_weth(token)
+
+
+def pool_token(token_in: str, token_out: str) -> str:
+    """The non-WETH side of a trade, whose token/WETH pool prices it."""
+    return token_in if is_weth(token_out) else token_out
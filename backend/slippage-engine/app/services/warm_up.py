@@ -0,0 +1,112 @@
+# backend/slippage-engine/app/services/warm_up.py
+
+import asyncio
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from ..config import settings
+
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+TIMED_OUT = "timed_out"
+
+Step = Callable[[], Awaitable[Any]]
+
+
+class WarmUp:
+    """
+    Startup phase that fills the process's caches before it takes traffic.
+
+    Every step (prices, liquidity, market data, ...) runs concurrently in
+    the background, so the app starts serving liveness checks at once.
+    The phase ends when every step has finished, failed or run past
+    settings.warmup_timeout_seconds; a failed step only means the first
+    requests fall back to defaults, so it does not hold readiness back
+    for longer than the timeout. /health/ready reports 503 until then.
+    """
+
+    def __init__(self):
+        self._steps: Dict[str, Step] = {}
+        self._state: Dict[str, Dict[str, Any]] = {}
+        self._task: Optional[asyncio.Task] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.stopping = False
+
+    # --- Lifecycle ---
+
+    async def start(self, steps: Dict[str, Step]):
+        self._steps = dict(steps)
+        self._state = {name: {"state": PENDING} for name in self._steps}
+        self.started_at = time.monotonic()
+        self.finished_at = None
+        self.stopping = False
+        if not settings.warmup_enabled or not self._steps:
+            self.finished_at = self.started_at
+            return
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        # Fail readiness first so the load balancer drains this instance
+        self.stopping = True
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        await asyncio.gather(*(self._run_step(name, step) for name, step in self._steps.items()))
+        self.finished_at = time.monotonic()
+        failed = [name for name, state in self._state.items() if state["state"] != DONE]
+        print(
+            f"   [WarmUp] Finished in {self.finished_at - self.started_at:.1f}s"
+            + (f" ({', '.join(failed)} did not complete)" if failed else "")
+        )
+
+    async def _run_step(self, name: str, step: Step):
+        state = self._state[name]
+        state["state"] = RUNNING
+        started = time.monotonic()
+        try:
+            state["result"] = await asyncio.wait_for(step(), settings.warmup_timeout_seconds)
+            state["state"] = DONE
+        except asyncio.TimeoutError:
+            state["state"] = TIMED_OUT
+        except Exception as e:
+            state["state"] = FAILED
+            state["error"] = str(e)
+            print(f"   [WarmUp] {name} failed: {e}")
+        state["seconds"] = round(time.monotonic() - started, 3)
+
+    # --- Reads ---
+
+    @property
+    def finished(self) -> bool:
+        return self.finished_at is not None
+
+    @property
+    def ready(self) -> bool:
+        return not self.stopping and (self.finished or not settings.readiness_requires_warmup)
+
+    def status(self) -> Dict[str, Any]:
+        elapsed = None
+        if self.started_at is not None:
+            elapsed = (self.finished_at or time.monotonic()) - self.started_at
+        return {
+            "enabled": settings.warmup_enabled,
+            "finished": self.finished,
+            "elapsed_seconds": round(elapsed, 2) if elapsed is not None else None,
+            "completed": sum(1 for state in self._state.values() if state["state"] not in (PENDING, RUNNING)),
+            "total": len(self._state),
+            "steps": self._state,
+            "timeout_seconds": settings.warmup_timeout_seconds,
+        }
+
+
+# Shared instance for the whole process
+warm_up = WarmUp()
@@ -0,0 +1,105 @@
+# backend/slippage-engine/benchmarks/encoding.py
+
+"""
+Response encoding micro-benchmark for the slippage engine.
+
+Builds one recommendation per market scenario with the real calculator
+(no network; inputs are fixed) and measures the CPU time each way of
+turning it into a response body costs:
+
+- response_model: what FastAPI does for a returned dataclass
+  (validate against the schema, dump to JSON-able data, render)
+- jsonable_encoder: the engine's previous path, without validation
+- json / msgpack: app.services.encoding, straight to bytes
+- sparse: calculate(detailed=False) plus encoding two fields, against
+  the full calculate() plus encoding, for clients that only need the number
+
+Run from backend/slippage-engine:
+
+    python -m benchmarks.encoding
+    python -m benchmarks.encoding --iterations 20000
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.schemas import SlippageRecommendation
+from app.services import encoding
+from app.services.slippage_calculator import SlippageCalculator
+
+PEPE = "0x6982508145454ce325ddbe47a25d4ec3d2311933"
+
+# (pair stats, pool liquidity USD, trade size USD)
+SCENARIOS: Dict[str, Tuple[Dict[str, Any], float, float]] = {
+    "calm": ({"bot_activity_score": 0.05, "sandwiches_5min": 0, "transactions_5min": 12, "suspicious_tx_count": 0, "avg_gas_gwei": 18}, 25_000_000, 500),
+    "busy": ({"bot_activity_score": 0.45, "sandwiches_5min": 3, "transactions_5min": 140, "suspicious_tx_count": 9, "avg_gas_gwei": 60}, 2_000_000, 5_000),
+    "frenzy": ({"bot_activity_score": 0.9, "sandwiches_5min": 9, "transactions_5min": 600, "suspicious_tx_count": 70, "avg_gas_gwei": 180}, 150_000, 20_000),
+}
+
+SPARSE_FIELDS = frozenset({"recommended_slippage", "risk_level"})
+
+
+def cpu_us(fn: Callable[[], Any], iterations: int) -> float:
+    """Process CPU time per call, in microseconds."""
+    fn() # Warm caches (schemas, fail-chance curves)
+    started = time.process_time()
+    for _ in range(iterations):
+        fn()
+    return (time.process_time() - started) / iterations * 1e6
+
+
+def run(iterations: int) -> List[Dict[str, Any]]:
+    calculator = SlippageCalculator()
+    adapter = TypeAdapter(SlippageRecommendation)
+    loop = asyncio.new_event_loop()
+
+    def calculate(stats, liquidity, amount, detailed=True):
+        return loop.run_until_complete(calculator.calculate(
+            "ETH", PEPE, stats, liquidity, 3000.0, {"pair_stats": "live", "liquidity": "live", "eth_price": "live"},
+            amount_usd=amount, detailed=detailed
+        ))
+
+    rows = []
+    for name, (stats, liquidity, amount) in SCENARIOS.items():
+        recommendation = calculate(stats, liquidity, amount)
+        paths = {
+            "response_model": lambda: JSONResponse(adapter.dump_python(adapter.validate_python(recommendation), mode="json")).body,
+            "jsonable_encoder": lambda: JSONResponse(jsonable_encoder(recommendation)).body,
+            "json": lambda: encoding.encode(recommendation, encoding.JSON),
+            "msgpack": lambda: encoding.encode(recommendation, encoding.MSGPACK),
+        }
+        paths["full calculate+json"] = lambda: encoding.encode(calculate(stats, liquidity, amount), encoding.JSON)
+        paths["sparse calculate+json"] = lambda: encoding.encode(
+            calculate(stats, liquidity, amount, detailed=False), encoding.JSON, SPARSE_FIELDS
+        )
+        for path, fn in paths.items():
+            rows.append({"scenario": name, "path": path, "us": cpu_us(fn, iterations), "bytes": len(fn())})
+    loop.close()
+    return rows
+
+
+def report(rows: List[Dict[str, Any]]):
+    print(f"{'scenario':<8} {'path':<22} {'cpu us':>9} {'bytes':>7} {'vs baseline':>12}")
+    baselines = {}
+    for row in rows:
+        # Encodings compare against response_model; the sparse path against the full calculation
+        if row["path"] in ("response_model", "full calculate+json"):
+            baselines[row["scenario"]] = row["us"]
+        saved = 1 - row["us"] / baselines[row["scenario"]]
+        print(f"{row['scenario']:<8} {row['path']:<22} {row['us']:>9.1f} {row['bytes']:>7} {saved:>+11.0%}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Measure the CPU cost of each response encoding path.")
+    parser.add_argument("--iterations", type=int, default=5000, help="Timed calls per path and scenario")
+    return parser
+
+
+if __name__ == "__main__":
+    report(run(build_parser().parse_args().iterations))
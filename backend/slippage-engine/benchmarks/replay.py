@@ -0,0 +1,344 @@
+# backend/slippage-engine/benchmarks/replay.py
+
+"""
+Replay benchmark for the slippage engine.
+
+Starts local stand-ins for the listener, subgraph and CoinGecko, launches
+the engine against them with uvicorn, and replays the listener's demo
+scenarios (backend/listener/demo-data/*.json) as request load. Reports
+throughput and p50/p95/p99 latency for /api/slippage/, /api/symbols and
+/api/chat/, and writes the results to JSON for comparison across versions.
+
+Run from backend/slippage-engine:
+
+    python -m benchmarks.replay
+    python -m benchmarks.replay --scenarios feeding-frenzy calm-market --requests 1000 --concurrency 32
+    python -m benchmarks.replay --latency listener=5,subgraph=150,coingecko=300 --error-rate coingecko=0.1
+    python -m benchmarks.replay --compare benchmarks/results/<previous>.json
+"""
+
+import argparse
+import asyncio
+import glob
+import itertools
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+import numpy as np
+import uvicorn
+
+from .stand_ins import (
+    ETH_PRICE_USD, TOKENS, WETH_ADDRESS, Faults, ListenerStandIn,
+    coingecko_app, normalize_tx, subgraph_app,
+)
+
+ENGINE_DIR = os.path.normpath(os.path.join(os.path.dirname(__file__), ".."))
+DEMO_DATA_DIR = os.path.normpath(os.path.join(ENGINE_DIR, "..", "listener", "demo-data"))
+RESULTS_DIR = os.path.join(ENGINE_DIR, "benchmarks", "results")
+
+ENDPOINTS = ("slippage", "symbols", "chat")
+
+CHAT_QUESTIONS = [
+    "What is MEV?",
+    "How does a sandwich attack work?",
+    "What slippage should I use for PEPE?",
+    "Is it risky to trade right now?",
+    "hello",
+]
+
+
+# --- Setup ---
+
+def parse_pairs(value: str, cast=float) -> Dict[str, Any]:
+    """Parses "listener=5,subgraph=40" into a dict."""
+    result = {}
+    for item in filter(None, value.split(",")):
+        key, _, raw = item.partition("=")
+        result[key.strip()] = cast(raw)
+    return result
+
+def load_scenarios(names: Optional[List[str]]) -> Dict[str, Dict[str, Any]]:
+    scenarios = {}
+    for path in sorted(glob.glob(os.path.join(DEMO_DATA_DIR, "*.json"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        if names and name not in names:
+            continue
+        with open(path) as f:
+            scenarios[name] = json.load(f)
+    missing = set(names or []) - set(scenarios)
+    if missing:
+        raise SystemExit(f"Unknown scenarios: {', '.join(sorted(missing))}")
+    return scenarios
+
+def slippage_body(tx: Dict[str, Any]) -> Dict[str, Any]:
+    """The request a frontend user making this trade would send."""
+    tx = normalize_tx(tx)
+    amount = float(tx["amountIn"])
+    if tx["tokenIn"]["address"] == WETH_ADDRESS:
+        return {"token_in": "ETH", "token_out": tx["tokenOut"]["address"], "amount_usd": round(amount * ETH_PRICE_USD, 2)}
+    price = TOKENS.get(tx["tokenIn"]["address"], (None, 0.0, None))[1]
+    return {"token_in": tx["tokenIn"]["address"], "token_out": "ETH", "amount_usd": round(amount * price, 2)}
+
+async def serve(app, port: int) -> Tuple[uvicorn.Server, asyncio.Task]:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning", lifespan="off"))
+    task = asyncio.create_task(server.serve())
+    while not server.started:
+        await asyncio.sleep(0.05)
+    return server, task
+
+def start_engine(port: int, upstream_ports: Dict[str, int], log_path: str) -> subprocess.Popen:
+    env = {
+        **os.environ,
+        "LISTENER_HTTP_URL": f"http://127.0.0.1:{upstream_ports['listener']}",
+        "LISTENER_WS_URL": f"http://127.0.0.1:{upstream_ports['listener']}",
+        "UNISWAP_SUBGRAPH_URL": f"http://127.0.0.1:{upstream_ports['subgraph']}/subgraph",
+        "COINGECKO_API_URL": f"http://127.0.0.1:{upstream_ports['coingecko']}/api/v3",
+        "GROQ_API_KEY": "", # Chat runs in offline mode
+    }
+    log = open(log_path, "w")
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port), "--log-level", "warning"],
+        cwd=ENGINE_DIR, env=env, stdout=log, stderr=subprocess.STDOUT,
+    )
+
+async def wait_ready(client: httpx.AsyncClient, timeout: float = 30.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            if (await client.get("/health/")).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        await asyncio.sleep(0.2)
+    raise SystemExit("Engine did not become ready; see the engine log")
+
+
+# --- Load ---
+
+def request_plan(scenario: Dict[str, Any], mix: Dict[str, int], total: int):
+    """
+    Yields (endpoint, tx) for `total` requests. The scenario's transactions
+    are replayed in order (looping), one per slippage request.
+    """
+    weights = [(endpoint, mix.get(endpoint, 0)) for endpoint in ENDPOINTS]
+    pattern = [endpoint for endpoint, weight in weights for _ in range(int(weight))]
+    txs = itertools.cycle(scenario["transactions"])
+    for endpoint in itertools.islice(itertools.cycle(pattern), total):
+        yield endpoint, next(txs) if endpoint == "slippage" else None
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    listener: ListenerStandIn,
+    scenario: Dict[str, Any],
+    mix: Dict[str, int],
+    requests: int,
+    warmup: int,
+    concurrency: int
+) -> Dict[str, Any]:
+    listener.reset()
+    plan = iter(list(request_plan(scenario, mix, warmup + requests)))
+    samples: Dict[str, List[float]] = {endpoint: [] for endpoint in ENDPOINTS}
+    errors: Dict[str, int] = {endpoint: 0 for endpoint in ENDPOINTS}
+    chat_questions = itertools.cycle(CHAT_QUESTIONS)
+    issued = 0
+    started = None
+
+    async def worker():
+        nonlocal issued, started
+        for endpoint, tx in plan:
+            measured = issued >= warmup
+            issued += 1
+            if measured and started is None:
+                started = time.perf_counter()
+
+            if endpoint == "slippage":
+                # The trade hits the mempool, then its sender asks for a recommendation
+                await listener.ingest(tx)
+                call = client.post("/api/slippage/", json=slippage_body(tx))
+            elif endpoint == "symbols":
+                call = client.get("/api/symbols")
+            else:
+                call = client.post("/api/chat/", json={"message": next(chat_questions)})
+
+            t0 = time.perf_counter()
+            try:
+                ok = (await call).status_code < 400
+            except httpx.HTTPError:
+                ok = False
+            elapsed_ms = (time.perf_counter() - t0) * 1000
+
+            if measured:
+                samples[endpoint].append(elapsed_ms)
+                errors[endpoint] += not ok
+
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    wall = time.perf_counter() - (started or time.perf_counter())
+
+    endpoints = {endpoint: summarize(samples[endpoint], errors[endpoint], wall) for endpoint in ENDPOINTS if samples[endpoint]}
+    total = sum(len(s) for s in samples.values())
+    return {
+        "name": scenario.get("name"),
+        "risk_level": scenario.get("risk_level"),
+        "requests": total,
+        "wall_seconds": round(wall, 3),
+        "throughput_rps": round(total / wall, 1) if wall else None,
+        "endpoints": endpoints,
+        "_samples": samples,
+        "_errors": errors,
+    }
+
+def summarize(samples: List[float], errors: int, wall: float) -> Dict[str, Any]:
+    latencies = np.asarray(samples)
+    p50, p95, p99 = np.percentile(latencies, [50, 95, 99])
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4),
+        "throughput_rps": round(len(samples) / wall, 1) if wall else None,
+        "mean_ms": round(float(latencies.mean()), 2),
+        "p50_ms": round(float(p50), 2),
+        "p95_ms": round(float(p95), 2),
+        "p99_ms": round(float(p99), 2),
+        "max_ms": round(float(latencies.max()), 2),
+    }
+
+
+# --- Reporting ---
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], cwd=ENGINE_DIR, text=True).strip()
+    except Exception:
+        return None
+
+def print_table(title: str, endpoints: Dict[str, Dict[str, Any]], baseline: Optional[Dict[str, Dict[str, Any]]] = None):
+    print(f"\n{title}")
+    print(f"  {'endpoint':<10} {'reqs':>6} {'err%':>6} {'rps':>8} {'p50':>9} {'p95':>9} {'p99':>9}")
+    for endpoint, stats in endpoints.items():
+        row = f"  {endpoint:<10} {stats['requests']:>6} {stats['error_rate'] * 100:>5.1f}% {stats['throughput_rps']:>8} "
+        row += " ".join(f"{stats[key]:>8.1f}ms"[-10:] for key in ("p50_ms", "p95_ms", "p99_ms"))
+        print(row)
+        base = (baseline or {}).get(endpoint)
+        if base:
+            deltas = " ".join(
+                f"{(stats[key] - base[key]) / base[key] * 100:>+8.1f}%" if base[key] else f"{'n/a':>9}"
+                for key in ("p50_ms", "p95_ms", "p99_ms")
+            )
+            print(f"  {'  vs base':<10} {'':>6} {'':>6} {'':>8} {deltas}")
+
+async def main(args: argparse.Namespace):
+    scenarios = load_scenarios(args.scenarios)
+    mix = parse_pairs(args.mix, int)
+    latency = parse_pairs(args.latency)
+    error_rate = parse_pairs(args.error_rate)
+
+    faults = {name: Faults(latency.get(name, 0.0), error_rate.get(name, 0.0)) for name in ("listener", "subgraph", "coingecko")}
+    listener = ListenerStandIn(faults["listener"])
+    ports = {"listener": args.port_base + 1, "subgraph": args.port_base + 2, "coingecko": args.port_base + 3}
+    engine_port = args.port_base
+
+    servers = [
+        await serve(listener.app, ports["listener"]),
+        await serve(subgraph_app(faults["subgraph"]), ports["subgraph"]),
+        await serve(coingecko_app(faults["coingecko"]), ports["coingecko"]),
+    ]
+
+    os.makedirs(RESULTS_DIR, exist_ok=True)
+    engine_log = os.path.join(RESULTS_DIR, "engine.log")
+    engine = start_engine(engine_port, ports, engine_log)
+
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    results: Dict[str, Any] = {}
+    all_samples: Dict[str, List[float]] = {endpoint: [] for endpoint in ENDPOINTS}
+    all_errors: Dict[str, int] = {endpoint: 0 for endpoint in ENDPOINTS}
+    total_wall = 0.0
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{engine_port}", limits=limits, timeout=30.0) as client:
+            await wait_ready(client)
+            await asyncio.sleep(args.settle) # Let startup warm-ups and the listener subscription land
+
+            for name, scenario in scenarios.items():
+                result = await run_scenario(client, listener, scenario, mix, args.requests, args.warmup, args.concurrency)
+                for endpoint in ENDPOINTS:
+                    all_samples[endpoint].extend(result["_samples"][endpoint])
+                    all_errors[endpoint] += result["_errors"][endpoint]
+                total_wall += result["wall_seconds"]
+                del result["_samples"], result["_errors"]
+                results[name] = result
+    finally:
+        engine.terminate()
+        engine.wait(timeout=10)
+        for server, task in servers:
+            server.should_exit = True
+            await task
+
+    overall = {
+        endpoint: summarize(all_samples[endpoint], all_errors[endpoint], total_wall)
+        for endpoint in ENDPOINTS if all_samples[endpoint]
+    }
+    report = {
+        "meta": {
+            "timestamp": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "config": {
+            "scenarios": list(scenarios),
+            "requests_per_scenario": args.requests,
+            "warmup": args.warmup,
+            "concurrency": args.concurrency,
+            "mix": mix,
+            "latency_ms": {name: f.latency_ms for name, f in faults.items()},
+            "error_rate": {name: f.error_rate for name, f in faults.items()},
+        },
+        "upstream_requests": {name: {"requests": f.requests, "errors": f.errors} for name, f in faults.items()},
+        "scenarios": results,
+        "overall": overall,
+    }
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+
+    for name, result in results.items():
+        print_table(
+            f"{name} ({result['throughput_rps']} req/s)",
+            result["endpoints"],
+            ((baseline or {}).get("scenarios", {}).get(name) or {}).get("endpoints")
+        )
+    print_table("overall", overall, (baseline or {}).get("overall"))
+
+    output = args.output or os.path.join(
+        RESULTS_DIR, f"replay-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{report['meta']['git_revision'] or 'nogit'}.json"
+    )
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"\nResults written to {output}")
+    print(f"Upstream calls: {report['upstream_requests']}")
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Replay demo scenarios against the slippage engine and report latency.")
+    parser.add_argument("--scenarios", nargs="*", help="Scenario file names without .json (default: all)")
+    parser.add_argument("--requests", type=int, default=400, help="Measured requests per scenario")
+    parser.add_argument("--warmup", type=int, default=40, help="Unmeasured requests per scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--mix", default="slippage=8,symbols=1,chat=1", help="Relative request weights per endpoint")
+    parser.add_argument("--latency", default="listener=5,subgraph=40,coingecko=80", help="Stand-in latency in ms")
+    parser.add_argument("--error-rate", default="", help="Stand-in error rates, e.g. coingecko=0.05")
+    parser.add_argument("--settle", type=float, default=1.0, help="Seconds to wait after the engine is ready")
+    parser.add_argument("--port-base", type=int, default=18700, help="Engine port; stand-ins use the next three")
+    parser.add_argument("--output", help="Results JSON path (default: benchmarks/results/replay-<time>-<rev>.json)")
+    parser.add_argument("--compare", help="Previous results JSON to print deltas against")
+    return parser
+
+if __name__ == "__main__":
+    asyncio.run(main(build_parser().parse_args()))
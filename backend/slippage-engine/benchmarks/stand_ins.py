@@ -0,0 +1,280 @@
+# backend/slippage-engine/benchmarks/stand_ins.py
+
+# Local stand-ins for the engine's upstreams (listener, Uniswap subgraph,
+# CoinGecko), each with configurable latency and error rate. The listener
+# stand-in is fed by replaying demo scenarios and aggregates stats the way
+# backend/listener/src/pair-aggregator.js does.
+
+import asyncio
+import random
+import re
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional
+
+import socketio
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import JSONResponse
+
+WETH_ADDRESS = "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2"
+ETH_PRICE_USD = 2500.0
+
+# Known tokens: address -> (CoinGecko id, USD price, pool reserveUSD)
+TOKENS = {
+    "0x6982508145454ce325ddbe47a25d4ec3d2311933": ("pepe", 0.0000012, 25_000_000.0),
+    "0x95ad61b0a150d79219dcf64e1e6cc01f0b64c4ce": ("shiba-inu", 0.0000095, 40_000_000.0),
+    "0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48": ("usd-coin", 1.0, 150_000_000.0),
+}
+PRICES_BY_ID = {"ethereum": ETH_PRICE_USD, **{cg_id: price for cg_id, price, _ in TOKENS.values()}}
+
+# Mirrors backend/listener/src/pair-aggregator.js CONFIG
+STATS_WINDOW_MS = 5 * 60 * 1000
+SUSPICIOUS_GAS_THRESHOLD = 50
+
+
+class Faults:
+    """Latency and error injection for one stand-in."""
+
+    def __init__(self, latency_ms: float = 0.0, error_rate: float = 0.0, jitter: float = 0.25):
+        self.latency_ms = latency_ms
+        self.error_rate = error_rate
+        self.jitter = jitter
+        self.requests = 0
+        self.errors = 0
+
+    async def apply(self):
+        self.requests += 1
+        if self.latency_ms > 0:
+            spread = self.latency_ms * self.jitter
+            await asyncio.sleep(max(0.0, random.uniform(self.latency_ms - spread, self.latency_ms + spread)) / 1000)
+        if random.random() < self.error_rate:
+            self.errors += 1
+            raise HTTPException(status_code=500, detail="Injected upstream error")
+
+
+def _with_faults(app: FastAPI, faults: Faults) -> FastAPI:
+    @app.middleware("http")
+    async def inject(request: Request, call_next):
+        try:
+            await faults.apply()
+        except HTTPException as e:
+            return JSONResponse({"error": e.detail}, status_code=e.status_code)
+        return await call_next(request)
+    return app
+
+
+# --- Listener ---
+
+def normalize_tx(tx: Dict[str, Any]) -> Dict[str, Any]:
+    """Fills fields some scenario files omit (direction, from) and lower-cases addresses."""
+    token_in = {**tx["tokenIn"], "address": tx["tokenIn"]["address"].lower()}
+    token_out = {**tx["tokenOut"], "address": tx["tokenOut"]["address"].lower()}
+    return {
+        **tx,
+        "tokenIn": token_in,
+        "tokenOut": token_out,
+        "from": tx.get("from", "unknown").lower(),
+        "direction": tx.get("direction") or ("buy" if token_in["address"] == WETH_ADDRESS else "sell"),
+        "gasPriceGwei": float(tx.get("gasPriceGwei", 0)),
+    }
+
+def _bot_activity_score(tx_count: int, suspicious: int, sandwiches: int, avg_gas: float) -> float:
+    # Same weights as PairAggregator.calculateBotActivityScore
+    score = 0.0
+    if tx_count > 0:
+        score += min(suspicious / tx_count, 1) * 0.3
+    if sandwiches >= 5:
+        score += 0.35
+    elif sandwiches >= 3:
+        score += 0.25
+    elif sandwiches >= 1:
+        score += 0.15
+    if avg_gas > 100:
+        score += 0.2
+    elif avg_gas > 75:
+        score += 0.15
+    elif avg_gas > 50:
+        score += 0.1
+    if tx_count > 100:
+        score += 0.15
+    elif tx_count > 50:
+        score += 0.1
+    elif tx_count > 20:
+        score += 0.05
+    return min(score, 1.0)
+
+
+def _count_sandwiches(txs: List[Dict[str, Any]]) -> int:
+    """
+    Simplified sandwich detector: an address that buys and later sells,
+    with another address buying in between, counts as one sandwich.
+    Single pass using running buy counts.
+    """
+    count = 0
+    total_buys = 0
+    own_buys: Dict[str, int] = {}
+    open_buys: Dict[str, tuple] = {} # address -> (total_buys, own_buys) before its first open buy
+    for tx in txs:
+        address = tx["from"]
+        if tx["direction"] == "buy":
+            open_buys.setdefault(address, (total_buys, own_buys.get(address, 0)))
+            total_buys += 1
+            own_buys[address] = own_buys.get(address, 0) + 1
+        elif address in open_buys:
+            total_before, own_before = open_buys.pop(address)
+            other_buys = (total_buys - total_before) - (own_buys[address] - own_before)
+            count += other_buys > 0
+    return count
+
+
+class ListenerStandIn:
+    """
+    Pair stats fed by replayed scenario transactions, served over the
+    listener's REST route and pushed over Socket.IO. Pairs are keyed by the
+    listener's pair ids ("SHIB-WETH"), which the engine maps to tokens.
+    """
+
+    def __init__(self, faults: Faults):
+        self.faults = faults
+        self.sio = socketio.AsyncServer(async_mode="asgi", cors_allowed_origins="*")
+        self._txs: Dict[str, deque] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self.pushes = 0
+
+        @self.sio.event
+        async def connect(sid, environ):
+            await self.sio.emit("pairs_list", {"count": len(self._stats), "pairs": [{"pair": p} for p in self._stats]}, to=sid)
+
+        @self.sio.event
+        async def subscribe(sid, data):
+            pair = (data or {}).get("pair", "").upper()
+            await self.sio.enter_room(sid, pair)
+            if pair in self._stats:
+                await self.sio.emit("pair_update", self._stats[pair], to=sid)
+
+        @self.sio.event
+        async def get_pairs(sid, *args):
+            await connect(sid, None)
+
+        rest = _with_faults(FastAPI(), faults)
+
+        @rest.get("/api/pairs/{pair}")
+        async def pair_stats(pair: str):
+            stats = self._stats.get(pair.upper())
+            if stats is None:
+                raise HTTPException(status_code=404, detail="Pair not found")
+            return stats
+
+        self.app = socketio.ASGIApp(self.sio, other_asgi_app=rest)
+
+    @staticmethod
+    def pair_key(tx: Dict[str, Any]) -> str:
+        if tx.get("pair"):
+            return tx["pair"].upper()
+        # Same naming as createPairString: symbols sorted and joined
+        return "-".join(sorted((tx["tokenIn"]["symbol"], tx["tokenOut"]["symbol"]))).upper()
+
+    def reset(self):
+        self._txs.clear()
+        self._stats.clear()
+
+    async def ingest(self, tx: Dict[str, Any]):
+        """Records a replayed transaction (stamped now) and pushes the pair's new stats."""
+        now = int(time.time() * 1000)
+        tx = normalize_tx(tx)
+        pair = self.pair_key(tx)
+        window = self._txs.setdefault(pair, deque())
+        window.append({**tx, "timestamp": now})
+        while window and window[0]["timestamp"] <= now - STATS_WINDOW_MS:
+            window.popleft()
+
+        txs = list(window)
+        suspicious = sum(1 for t in txs if t.get("isSuspicious") or t["gasPriceGwei"] > SUSPICIOUS_GAS_THRESHOLD)
+        sandwiches = _count_sandwiches(txs)
+        avg_gas = sum(t["gasPriceGwei"] for t in txs) / len(txs)
+        stats = {
+            "pair": pair,
+            "timestamp": now,
+            "transactions_5min": len(txs),
+            "suspicious_tx_count": suspicious,
+            "sandwiches_5min": sandwiches,
+            "avg_gas_gwei": round(avg_gas, 2),
+            "bot_activity_score": round(_bot_activity_score(len(txs), suspicious, sandwiches, avg_gas), 3),
+            "last_update": now,
+        }
+        self._stats[pair] = stats
+        self.pushes += 1
+        await self.sio.emit("pair_update", stats, room=pair)
+
+
+# --- Uniswap subgraph ---
+
+ALIAS_RE = re.compile(r'(\w+): pairs\(where: \{ token0_in: \["([^"]+)"')
+SKIP_RE = re.compile(r"skip: (\d+)")
+
+
+def _pool(token: str) -> Optional[Dict[str, Any]]:
+    if token not in TOKENS:
+        return None
+    _, price, reserve_usd = TOKENS[token]
+    reserve_token = reserve_usd / 2 / price
+    reserve_weth = reserve_usd / 2 / ETH_PRICE_USD
+    token_is_0 = token < WETH_ADDRESS # Uniswap orders pair tokens by address
+    return {
+        "id": f"0xpair{token[2:12]}",
+        "reserve0": str(reserve_token if token_is_0 else reserve_weth),
+        "reserve1": str(reserve_weth if token_is_0 else reserve_token),
+        "reserveUSD": str(reserve_usd),
+        "token0": {"id": token if token_is_0 else WETH_ADDRESS},
+        "token1": {"id": WETH_ADDRESS if token_is_0 else token},
+    }
+
+
+def subgraph_app(faults: Faults) -> FastAPI:
+    app = _with_faults(FastAPI(), faults)
+
+    @app.post("/subgraph")
+    async def graphql(request: Request):
+        query = (await request.json()).get("query", "")
+        if "pools: pairs" in query:
+            # Pool graph refresh: every token/WETH pool on the first page
+            skip = int(SKIP_RE.search(query).group(1))
+            return {"data": {"pools": [_pool(token) for token in TOKENS] if skip == 0 else []}}
+        if "base: pairs" in query:
+            # Warm-up query for the deepest WETH pools
+            pools = [_pool(token) for token in TOKENS]
+            return {"data": {
+                "base": [p for p in pools if p["token0"]["id"] == WETH_ADDRESS],
+                "quote": [p for p in pools if p["token1"]["id"] == WETH_ADDRESS],
+            }}
+        data = {}
+        for alias, token in ALIAS_RE.findall(query):
+            pool = _pool(token.lower())
+            data[alias] = [pool] if pool else []
+        return {"data": data}
+
+    return app
+
+
+# --- CoinGecko ---
+
+def coingecko_app(faults: Faults) -> FastAPI:
+    app = _with_faults(FastAPI(), faults)
+
+    @app.get("/api/v3/simple/price")
+    async def simple_price(ids: str, vs_currencies: str = "usd", include_24hr_change: str = "false"):
+        return {
+            asset_id: {"usd": PRICES_BY_ID[asset_id], "usd_24h_change": round(random.uniform(-5, 5), 2)}
+            for asset_id in ids.split(",") if asset_id in PRICES_BY_ID
+        }
+
+    @app.get("/api/v3/coins/{asset_id}/market_chart")
+    async def market_chart(asset_id: str, vs_currency: str = "usd", days: str = "1"):
+        if asset_id not in PRICES_BY_ID:
+            raise HTTPException(status_code=404, detail="coin not found")
+        now = int(time.time() * 1000)
+        price = PRICES_BY_ID[asset_id]
+        # 24h of 5-minute points, like CoinGecko's days=1 granularity
+        return {"prices": [[now - i * 300_000, price * (1 + random.uniform(-0.02, 0.02))] for i in range(288, -1, -1)]}
+
+    return app
@@ -0,0 +1,7 @@
+# backend/slippage-engine/tests/conftest.py
+
+import os
+import sys
+
+# Lets `pytest` run from anywhere; the app is imported as the top-level package "app"
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
@@ -0,0 +1,126 @@
+# backend/slippage-engine/tests/test_mempool_analytics.py
+
+import pytest
+
+from app.services.mempool_analytics import MempoolAnalytics
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+PEPE = "0x6982508145454Ce325dDbE47a25d4ec3d2311933"
+T0 = 1_700_000_000.0
+
+
+def swap(tx_hash, sender, direction, gas, amount=1.0):
+    """A decoded PEPE/WETH swap in the listener's shape."""
+    weth, pepe = {"address": WETH, "symbol": "WETH"}, {"address": PEPE, "symbol": "PEPE"}
+    return {
+        "txHash": tx_hash,
+        "from": sender,
+        "pair": "PEPE-WETH",
+        "direction": direction,
+        "tokenIn": weth if direction == "buy" else pepe,
+        "tokenOut": pepe if direction == "buy" else weth,
+        "gasPriceGwei": gas,
+        "amountIn": amount,
+    }
+
+
+@pytest.fixture
+def analytics():
+    return MempoolAnalytics(window_seconds=300)
+
+
+# --- Ring expiry ---
+
+def test_transactions_expire_after_the_window(analytics):
+    analytics.ingest(swap("0x1", "0xa", "buy", 30), now=T0)
+    assert analytics.get("PEPE-WETH", now=T0 + 299)["transactions_5min"] == 1
+    assert analytics.get("PEPE-WETH", now=T0 + 300)["transactions_5min"] == 0
+
+
+def test_only_buckets_past_the_window_expire(analytics):
+    analytics.ingest(swap("0x1", "0xa", "buy", 30), now=T0)
+    analytics.ingest(swap("0x2", "0xb", "buy", 60), now=T0 + 100)
+    analytics.ingest(swap("0x3", "0xc", "sell", 90), now=T0 + 100)
+
+    stats = analytics.get("PEPE-WETH", now=T0 + 350)
+    assert stats["transactions_5min"] == 2
+    assert stats["avg_gas_gwei"] == 75.0
+    assert stats["suspicious_tx_count"] == 2 # Over the 50 gwei threshold
+
+
+def test_window_empties_after_a_long_gap(analytics):
+    analytics.ingest(swap("0x1", "0xa", "buy", 80), now=T0)
+    stats = analytics.get("PEPE-WETH", now=T0 + 10_000)
+    assert (stats["transactions_5min"], stats["suspicious_tx_count"], stats["avg_gas_gwei"]) == (0, 0, 0.0)
+
+    # The ring keeps working after being cleared
+    analytics.ingest(swap("0x2", "0xb", "buy", 40), now=T0 + 10_001)
+    assert analytics.get("PEPE-WETH", now=T0 + 10_001)["transactions_5min"] == 1
+
+
+def test_transactions_older_than_the_window_are_dropped(analytics):
+    analytics.ingest(swap("0x1", "0xa", "buy", 30), now=T0 + 1000)
+    analytics.ingest(swap("0x2", "0xb", "buy", 30), now=T0)
+    assert analytics.get("PEPE-WETH", now=T0 + 1000)["transactions_5min"] == 1
+
+
+def test_pair_is_found_by_token_address(analytics):
+    analytics.ingest(swap("0x1", "0xa", "buy", 30), now=T0)
+    assert analytics.get(PEPE.lower(), now=T0)["transactions_5min"] == 1
+    assert analytics.get("SHIB-WETH", now=T0) is None
+
+
+# --- Sandwich detection ---
+
+def sandwiches(analytics, now=T0 + 5):
+    return analytics.get("PEPE-WETH", now=now)["sandwiches_5min"]
+
+
+def test_detects_frontrun_victim_backrun(analytics):
+    analytics.ingest(swap("0xf", "0xbot", "buy", 100), now=T0)
+    analytics.ingest(swap("0xv", "0xuser", "buy", 20, amount=5), now=T0 + 1)
+    analytics.ingest(swap("0xb", "0xbot", "sell", 95), now=T0 + 2)
+    assert sandwiches(analytics) == 1
+    assert analytics.sandwiches == 1
+
+
+def test_victim_arriving_after_the_attacker_legs(analytics):
+    analytics.ingest(swap("0xf", "0xbot", "buy", 100), now=T0)
+    analytics.ingest(swap("0xb", "0xbot", "sell", 95), now=T0 + 1)
+    analytics.ingest(swap("0xv", "0xuser", "buy", 20), now=T0 + 2)
+    assert sandwiches(analytics) == 1
+
+
+def test_victim_is_counted_once(analytics):
+    analytics.ingest(swap("0xf", "0xbot", "buy", 100), now=T0)
+    analytics.ingest(swap("0xv", "0xuser", "buy", 20), now=T0 + 1)
+    analytics.ingest(swap("0xb1", "0xbot", "sell", 95), now=T0 + 2)
+    analytics.ingest(swap("0xb2", "0xbot", "sell", 95), now=T0 + 3)
+    assert sandwiches(analytics) == 1
+
+
+@pytest.mark.parametrize("victim_gas, backrun_sender, backrun_at", [
+    (90, "0xbot", T0 + 2),    # Victim paid nearly as much gas as the attacker
+    (20, "0xother", T0 + 2),  # Buy and sell come from different senders
+    (20, "0xbot", T0 + 20),   # Backrun long after the look-back window
+])
+def test_ignores_patterns_that_are_not_sandwiches(analytics, victim_gas, backrun_sender, backrun_at):
+    analytics.ingest(swap("0xf", "0xbot", "buy", 100), now=T0)
+    analytics.ingest(swap("0xv", "0xuser", "buy", victim_gas), now=T0 + 1)
+    analytics.ingest(swap("0xb", backrun_sender, "sell", 95), now=backrun_at)
+    assert sandwiches(analytics, now=backrun_at) == 0
+
+
+def test_attacker_legs_must_have_similar_gas(analytics):
+    analytics.ingest(swap("0xf", "0xbot", "buy", 300), now=T0)
+    analytics.ingest(swap("0xv", "0xuser", "buy", 20), now=T0 + 1)
+    analytics.ingest(swap("0xb", "0xbot", "sell", 100), now=T0 + 2)
+    assert sandwiches(analytics) == 0
+
+
+def test_sandwiches_expire_with_the_window(analytics):
+    analytics.ingest(swap("0xf", "0xbot", "buy", 100), now=T0)
+    analytics.ingest(swap("0xv", "0xuser", "buy", 20), now=T0 + 1)
+    analytics.ingest(swap("0xb", "0xbot", "sell", 95), now=T0 + 2)
+    assert sandwiches(analytics, now=T0 + 301) == 1
+    assert sandwiches(analytics, now=T0 + 302) == 0
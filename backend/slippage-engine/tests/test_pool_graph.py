@@ -0,0 +1,113 @@
+# backend/slippage-engine/tests/test_pool_graph.py
+
+import pytest
+
+from app.config import settings
+from app.services import amm_math
+from app.services.pool_graph import PoolGraph, build_graph
+from app.services.token_registry import token_registry
+
+ADDRESS = {s: token_registry.resolve_address(s) for s in ("WETH", "USDC", "DAI", "PEPE", "SHIB", "FLOKI", "APE")}
+
+
+def pool(address, a, reserve_a, b, reserve_b, reserve_usd):
+    """A subgraph pair in the shape build_graph reads."""
+    return {
+        "id": address,
+        "token0": {"id": ADDRESS[a]},
+        "token1": {"id": ADDRESS[b]},
+        "reserve0": str(reserve_a),
+        "reserve1": str(reserve_b),
+        "reserveUSD": str(reserve_usd),
+    }
+
+
+# WETH at $3000, stablecoins at $1, PEPE at $0.000003
+POOLS = [
+    pool("0xusdc-weth", "USDC", 30e6, "WETH", 10_000, 60e6),
+    pool("0xdai-usdc", "DAI", 10e6, "USDC", 10e6, 20e6),
+    pool("0xpepe-weth", "PEPE", 1e12, "WETH", 1000, 6e6),
+    pool("0xshib-weth", "SHIB", 1e11, "WETH", 500, 3e6),
+    pool("0xusdc-pepe", "USDC", 1000, "PEPE", 1000 / 3e-6, 2000), # Thin direct pool
+    pool("0xfloki-ape", "FLOKI", 1e9, "APE", 1e5, 4e5), # Not connected to the rest
+]
+
+
+@pytest.fixture
+def graph():
+    g = PoolGraph()
+    g._graph = build_graph(POOLS, settings.routing_max_branching, 0.0)
+    return g
+
+
+def path(route):
+    symbols = {address: symbol for symbol, address in ADDRESS.items()}
+    return [symbols[route.hops[0].token_in]] + [symbols[hop.token_out] for hop in route.hops]
+
+
+def test_large_trade_routes_around_a_thin_direct_pool(graph):
+    route = graph.best_route("USDC", "PEPE", 10_000)
+    assert path(route) == ["USDC", "WETH", "PEPE"]
+    assert [hop.pool for hop in route.hops] == ["0xusdc-weth", "0xpepe-weth"]
+
+
+def test_small_trade_takes_the_direct_pool(graph):
+    # Fees of two hops cost more than the direct pool's impact at this size
+    route = graph.best_route("USDC", "PEPE", 1)
+    assert path(route) == ["USDC", "PEPE"]
+
+
+def test_three_hop_route(graph):
+    assert path(graph.best_route("DAI", "PEPE", 10_000)) == ["DAI", "USDC", "WETH", "PEPE"]
+    # Capped at two hops, only the thin pool reaches PEPE from USDC
+    assert path(graph.best_route("DAI", "PEPE", 10_000, max_hops=2)) == ["DAI", "USDC", "PEPE"]
+
+
+def test_route_has_the_most_output(graph):
+    route = graph.best_route("SHIB", "USDC", 5_000)
+    assert path(route) == ["SHIB", "WETH", "USDC"]
+
+    fee = settings.amm_fee
+    pools = {p["id"]: p for p in POOLS}
+    amount = route.amount_in
+    unaffected = 1.0
+    for hop in route.hops:
+        p = pools[hop.pool]
+        reserve0, reserve1 = float(p["reserve0"]), float(p["reserve1"])
+        reserve_in, reserve_out = (reserve0, reserve1) if p["token0"]["id"] == hop.token_in else (reserve1, reserve0)
+        unaffected *= 1 - amm_math.price_impact(amount, reserve_in, fee)
+        amount = amm_math.get_amount_out(amount, reserve_in, reserve_out, fee)
+    assert route.amount_out == pytest.approx(amount)
+    assert route.price_impact == pytest.approx(1 - unaffected)
+    assert route.liquidity_usd == 3e6 # The shallower pool
+
+
+def test_amount_in_uses_graph_prices(graph):
+    route = graph.best_route("WETH", "USDC", 3_000)
+    assert route.amount_in == pytest.approx(1.0)
+    assert path(route) == ["WETH", "USDC"]
+
+
+@pytest.mark.parametrize("token_in, token_out", [
+    ("FLOKI", "PEPE"),   # No path between them
+    ("WETH", "WETH"),
+    ("NOTATOKEN", "PEPE"),
+    ("USDT", "PEPE"),    # Known token without pools in the graph
+])
+def test_no_route(graph, token_in, token_out):
+    assert graph.best_route(token_in, token_out, 1_000) is None
+
+
+def test_build_graph_keeps_the_deepest_pool_per_pair():
+    shallow = pool("0xpepe-weth-2", "PEPE", 1e10, "WETH", 10, 6e4)
+    empty = pool("0xshib-weth-empty", "SHIB", 0, "WETH", 10, 0)
+    g = build_graph(POOLS + [shallow, empty], settings.routing_max_branching, 0.0)
+    pair = tuple(sorted((ADDRESS["PEPE"], ADDRESS["WETH"])))
+    assert g.pools[pair].address == "0xpepe-weth"
+    assert len(g.pools) == len(POOLS)
+
+
+def test_build_graph_limits_branching():
+    g = build_graph(POOLS, 2, 0.0)
+    # WETH's two deepest pools only
+    assert [p.address for _, p in g.neighbours[ADDRESS["WETH"]]] == ["0xusdc-weth", "0xpepe-weth"]
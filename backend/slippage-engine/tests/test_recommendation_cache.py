@@ -0,0 +1,136 @@
+# backend/slippage-engine/tests/test_recommendation_cache.py
+
+import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.config import settings
+from app.routers import slippage
+from app.services.liquidity_fetcher import liquidity_fetcher
+from app.services.pair_stats_cache import pair_stats_cache
+from app.services.price_cache import price_cache
+from app.services.recommendation_cache import RecommendationCache, etag_matches, trade_amount
+from app.services.reserve_cache import PoolReserves, reserve_cache
+
+PEPE = "0x6982508145454Ce325dDbE47a25d4ec3d2311933"
+STATS = {"bot_activity_score": 0.3, "sandwiches_5min": 1, "transactions_5min": 20, "suspicious_tx_count": 1, "avg_gas_gwei": 40}
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    cache = RecommendationCache(max_entries=16)
+    monkeypatch.setattr(slippage, "recommendation_cache", cache)
+    monkeypatch.setattr(settings, "timeseries_enabled", False)
+    monkeypatch.setattr(settings, "routing_enabled", False)
+    return cache
+
+
+@pytest.fixture
+def client(cache):
+    """Only the slippage router, with every input for PEPE already in memory."""
+    app = FastAPI()
+    app.include_router(slippage.router, prefix="/api/slippage")
+    pair_stats_cache.remember(PEPE, dict(STATS))
+    liquidity_fetcher._store(PEPE.lower(), 5e6)
+    price_cache._entries["ethereum"] = (time.monotonic(), {"usd": 3000.0})
+    reserve_cache._reserves[PEPE.lower()] = PoolReserves("0xpool", PEPE.lower(), 4.2e11, 1000.0, 6e6, time.time() - 3)
+    yield TestClient(app)
+    for entries in (pair_stats_cache._stats, liquidity_fetcher._cache, liquidity_fetcher._last_known, reserve_cache._reserves):
+        entries.clear()
+    price_cache._entries.pop("ethereum", None)
+
+
+def forbid_fetching(monkeypatch):
+    """Fails the test if an input is fetched instead of read from memory."""
+    async def fetch(*args, **kwargs):
+        raise AssertionError("inputs were fetched")
+    monkeypatch.setattr(slippage, "recommendation_inputs", fetch)
+
+
+def trade(amount=500):
+    return {"token_in": "ETH", "token_out": PEPE, "amount_usd": amount}
+
+
+# --- ETag / 304 ---
+
+def test_304_is_served_from_local_inputs(client, cache, monkeypatch):
+    first = client.post("/api/slippage/", json=trade())
+    assert first.status_code == 200
+    etag = first.headers["etag"]
+
+    forbid_fetching(monkeypatch)
+    again = client.post("/api/slippage/", json=trade(), headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    assert again.content == b""
+    assert again.headers["etag"] == etag
+    assert cache.not_modified == 1
+
+
+def test_changed_inputs_get_a_new_body(client):
+    first = client.post("/api/slippage/", json=trade())
+    pair_stats_cache.remember(PEPE, {**STATS, "sandwiches_5min": 6})
+    again = client.post("/api/slippage/", json=trade(), headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 200
+    assert again.headers["etag"] != first.headers["etag"]
+
+
+def test_reserve_age_is_measured_per_response(client, monkeypatch):
+    first = client.post("/api/slippage/", json=trade())
+    assert 3 <= float(first.headers["x-reserves-age"]) < 4
+    assert "reserves_age_seconds" not in first.json()["pool_stats"]
+
+    reserve_cache._reserves[PEPE.lower()].updated_at -= 10 # Same reserves, seen 10s earlier
+    forbid_fetching(monkeypatch)
+    again = client.post("/api/slippage/", json=trade(), headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304
+    assert float(again.headers["x-reserves-age"]) >= 13
+
+
+def test_etag_depends_on_encoding_and_fields(client):
+    full = client.post("/api/slippage/", json=trade())
+    packed = client.post("/api/slippage/", json=trade(), headers={"Accept": "application/msgpack"})
+    short = client.post("/api/slippage/?fields=recommended_slippage", json=trade())
+    assert len({full.headers["etag"], packed.headers["etag"], short.headers["etag"]}) == 3
+    assert short.json() == {"recommended_slippage": full.json()["recommended_slippage"]}
+
+    # An ETag for one field selection does not validate another
+    other = client.post("/api/slippage/", json=trade(), headers={"If-None-Match": short.headers["etag"]})
+    assert other.status_code == 200
+
+
+# --- Cache key ---
+
+def test_each_exact_amount_gets_its_own_entry(client, cache):
+    first = client.post("/api/slippage/", json=trade(500))
+    nearby = client.post("/api/slippage/", json=trade(501), headers={"If-None-Match": first.headers["etag"]})
+    assert nearby.status_code == 200
+    assert nearby.headers["etag"] != first.headers["etag"]
+    assert cache.status()["entries"] == 2
+
+    client.post("/api/slippage/", json=trade(500))
+    assert (cache.hits, cache.misses) == (1, 2)
+
+
+@pytest.mark.parametrize("amount, expected", [
+    (500, 500.0),
+    (500.01, 500.01),
+    (None, None),
+    (0, None),
+    (-10, None),
+])
+def test_trade_amount(amount, expected):
+    assert trade_amount(amount) == expected
+
+
+@pytest.mark.parametrize("header, matches", [
+    ('"abc"', True),
+    ('W/"abc"', True),
+    ('"xyz", "abc"', True),
+    ("*", True),
+    ('"xyz"', False),
+    (None, False),
+])
+def test_etag_matches(header, matches):
+    assert etag_matches(header, '"abc"') is matches
@@ -0,0 +1,152 @@
+# backend/slippage-engine/tests/test_rule_engine.py
+
+import itertools
+import json
+
+import numpy as np
+import pytest
+
+from app.services.risk_scorer import RiskScorer
+from app.services.rule_engine import DEFAULT_RULES_PATH, CompiledRules, RuleEngine
+
+# --- The if/elif ladders the rule table replaced ---
+
+def baseline_base_slippage(liquidity):
+    if liquidity > 10_000_000: return 0.003
+    elif liquidity > 1_000_000: return 0.005
+    elif liquidity > 100_000: return 0.01
+    else: return 0.02
+
+def baseline_liquidity_label(liquidity):
+    if liquidity > 10_000_000: return "High"
+    elif liquidity > 1_000_000: return "Good"
+    elif liquidity > 100_000: return "Moderate"
+    return "Very Low"
+
+def baseline_gas_adjustment(gas):
+    if gas > 100: return 0.002
+    elif gas > 75: return 0.001
+    return 0
+
+def baseline_bot_label(bot):
+    if bot > 0.7: return "Very High"
+    elif bot > 0.4: return "Moderate"
+    elif bot > 0.2: return "Low"
+    return "Very Low"
+
+def baseline_risk_level(bot, sandwiches, gas, liquidity):
+    score = 0
+    if bot > 0.7: score += 2
+    elif bot > 0.4: score += 1
+
+    if sandwiches > 5: score += 2
+    elif sandwiches > 2: score += 1
+
+    if gas > 100: score += 1
+    elif gas > 75: score += 0.5
+
+    # The old ladder checked < 500k first, so its < 100k branch never ran;
+    # the rule table adds the intended 1.5 points for those pools
+    if liquidity < 100_000: score += 1.5
+    elif liquidity < 500_000: score += 1
+
+    if score < 1: return "LOW", 1
+    elif score < 2: return "LOW", 2
+    elif score < 3: return "MODERATE", 3
+    elif score < 4: return "HIGH", 4
+    else: return "SEVERE", 5
+
+
+def around(*points, eps=1e-9):
+    """Each breakpoint, and values just below and above it."""
+    return [p + d for p in points for d in (-1, -eps, 0, eps, 1) if p + d >= 0]
+
+LIQUIDITY = around(100_000, 500_000, 1_000_000, 10_000_000) + [0, 5e7]
+BOT = around(0.2, 0.4, 0.7, eps=1e-6) + [0, 0.5, 1]
+SANDWICHES = list(range(0, 9))
+GAS = around(75, 100) + [0, 30, 500]
+
+
+@pytest.fixture(scope="module")
+def rules():
+    return RuleEngine(path=DEFAULT_RULES_PATH).default
+
+
+@pytest.mark.parametrize("liquidity", LIQUIDITY)
+def test_liquidity_bands(rules, liquidity):
+    assert rules.liquidity.value(liquidity, "base_slippage") == baseline_base_slippage(liquidity)
+    assert rules.liquidity.value(liquidity, "label") == baseline_liquidity_label(liquidity)
+
+
+@pytest.mark.parametrize("gas", GAS)
+def test_gas_bands(rules, gas):
+    assert rules.gas.value(gas, "gas_adjustment") == baseline_gas_adjustment(gas)
+
+
+@pytest.mark.parametrize("bot", BOT)
+def test_bot_activity_labels(rules, bot):
+    assert rules.bot_activity.value(bot, "label") == baseline_bot_label(bot)
+
+
+def test_liquidity_risk_at_its_breakpoints(rules):
+    assert rules.liquidity_risk.value(99_999, "risk_points") == 1.5
+    assert rules.liquidity_risk.value(100_000, "risk_points") == 1
+    assert rules.liquidity_risk.value(499_999, "risk_points") == 1
+    assert rules.liquidity_risk.value(500_000, "risk_points") == 0
+
+
+def test_risk_levels_match_baseline(rules):
+    scorer = RiskScorer()
+    cases = list(itertools.product(BOT, SANDWICHES, GAS, around(100_000, 500_000)))
+    for bot, sandwiches, gas, liquidity in cases:
+        expected = baseline_risk_level(bot, sandwiches, gas, liquidity)
+        assert scorer.get_risk_level(bot, sandwiches, gas, liquidity, rules) == expected, (bot, sandwiches, gas, liquidity)
+
+    # The vectorized path agrees element for element
+    bot, sandwiches, gas, liquidity = (np.array(column, dtype=float) for column in zip(*cases))
+    levels, scores = scorer.get_risk_levels(bot, sandwiches, gas, liquidity, rules)
+    assert list(zip(levels, scores.tolist())) == [baseline_risk_level(*case) for case in cases]
+
+
+def test_vectorized_lookups_match_scalar(rules):
+    xs = np.array(LIQUIDITY)
+    assert rules.liquidity.values(xs, "base_slippage").tolist() == [rules.liquidity.value(x, "base_slippage") for x in LIQUIDITY]
+    assert rules.liquidity_risk.values(xs, "risk_points").tolist() == [rules.liquidity_risk.value(x, "risk_points") for x in LIQUIDITY]
+
+
+# --- Loading ---
+
+def load_table():
+    with open(DEFAULT_RULES_PATH) as f:
+        return json.load(f)
+
+
+def test_rejects_unsorted_breakpoints():
+    table = load_table()
+    table["factors"]["gas"]["breakpoints"] = [100, 75]
+    with pytest.raises(ValueError, match="ascending"):
+        CompiledRules(table)
+
+
+def test_invalid_reload_keeps_the_active_table(tmp_path):
+    path = tmp_path / "rules.json"
+    path.write_text(json.dumps(load_table()))
+    engine = RuleEngine(path=str(path))
+
+    table = load_table()
+    del table["factors"]["sandwiches"]
+    path.write_text(json.dumps(table))
+    assert not engine.reload()
+    assert engine.version == 1
+    assert engine.default.sandwiches.value(3, "risk_points") == 1
+
+
+def test_pair_overrides_merge_over_defaults():
+    table = load_table()
+    table["pairs"] = {"PEPE": {"clamp": {"max": 0.05}}}
+    engine = RuleEngine(path=DEFAULT_RULES_PATH)
+    engine.apply(table)
+
+    pepe = engine.for_pair("0x6982508145454Ce325dDbE47a25d4ec3d2311933")
+    assert (pepe.clamp_min, pepe.clamp_max) == (0.003, 0.05)
+    assert engine.for_pair("SHIB") is engine.default
@@ -0,0 +1,121 @@
+# backend/slippage-engine/tests/test_shared_cache.py
+
+import fcntl
+import multiprocessing
+import struct
+
+import pytest
+
+from app.services.shared_cache import FILE_HEADER, SLOT_HEADER, SLOT_SIZE, SharedCache, key_hash
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / "shared.cache")
+
+
+@pytest.fixture
+def cache(path):
+    sc = SharedCache(path=path, slots=64, enabled=True)
+    yield sc
+    sc.close()
+
+
+@pytest.fixture
+def other(path):
+    """Another reader or writer on the same table, through its own open file."""
+    sc = SharedCache(path=path, slots=64, enabled=True)
+    yield sc
+    sc.close()
+
+
+def lease_in_worker(path, seconds):
+    sc = SharedCache(path=path, slots=64, enabled=True)
+    return sc.try_lease("prices", "ethereum", seconds=seconds)
+
+
+def release_in_worker(path):
+    sc = SharedCache(path=path, slots=64, enabled=True)
+    sc.release("prices", "ethereum")
+
+
+@pytest.fixture
+def worker():
+    """A separate worker process; leases are owned per pid."""
+    with multiprocessing.get_context("fork").Pool(1) as pool:
+        yield pool
+
+
+def slot_offset(sc, namespace, key):
+    """Offset of the slot a fresh key lands in (the first of its probe range)."""
+    index = key_hash(f"{namespace}:{key}".encode()) % sc.slots
+    return FILE_HEADER.size + index * SLOT_SIZE
+
+
+def test_put_is_visible_to_other_workers(cache, other):
+    assert cache.put("prices", "ethereum", {"usd": 3000.0}, updated_at=100.0)
+    assert other.get("prices", "ethereum") == (100.0, {"usd": 3000.0})
+    assert other.get("prices", "bitcoin") is None
+
+
+def test_corrupted_slot_is_rejected(cache, other):
+    cache.put("prices", "ethereum", {"usd": 3000.0})
+    mm = cache._mapped()
+    offset = slot_offset(cache, "prices", "ethereum") + SLOT_HEADER.size + 2
+    mm[offset] ^= 0xFF # Contents no longer match the slot's CRC
+
+    assert other.get("prices", "ethereum") is None
+    assert other.torn_reads == 1
+
+
+def test_slot_mid_write_is_rejected(cache, other):
+    cache.put("prices", "ethereum", {"usd": 3000.0})
+    mm = cache._mapped()
+    offset = slot_offset(cache, "prices", "ethereum")
+    seq = struct.unpack_from("<I", mm, offset)[0]
+    struct.pack_into("<I", mm, offset, seq | 1) # Odd sequence: a writer is in the slot
+
+    assert other.get("prices", "ethereum") is None
+    assert other.torn_reads == 1
+
+    struct.pack_into("<I", mm, offset, seq + 2) # Write finished, contents unchanged
+    assert other.get("prices", "ethereum")[1] == {"usd": 3000.0}
+
+
+def test_lease_is_exclusive_until_released(cache, path, worker):
+    assert cache.try_lease("prices", "ethereum", seconds=30)
+    assert not worker.apply(lease_in_worker, (path, 30))
+    # The holder renews its own lease
+    assert cache.try_lease("prices", "ethereum", seconds=30)
+    # Another worker cannot release it
+    worker.apply(release_in_worker, (path,))
+    assert not worker.apply(lease_in_worker, (path, 30))
+
+    cache.release("prices", "ethereum")
+    assert worker.apply(lease_in_worker, (path, 30))
+    assert not cache.try_lease("prices", "ethereum", seconds=30)
+    assert (cache.leases_won, cache.leases_lost) == (2, 1)
+
+
+def test_expired_lease_can_be_taken(cache, path, worker):
+    assert cache.try_lease("prices", "ethereum", seconds=-1) # A crashed owner's lease
+    assert worker.apply(lease_in_worker, (path, 30))
+
+
+def test_lease_keeps_the_stored_value(cache, path, worker):
+    cache.put("prices", "ethereum", {"usd": 3000.0}, updated_at=100.0)
+    assert worker.apply(lease_in_worker, (path, 30))
+    assert cache.get("prices", "ethereum") == (100.0, {"usd": 3000.0})
+
+
+def test_writes_are_skipped_while_the_lock_is_busy(cache, other):
+    cache._mapped()
+    other._mapped()
+    fcntl.flock(other._fd, fcntl.LOCK_EX)
+    try:
+        assert not cache.put("prices", "ethereum", {"usd": 3000.0})
+        assert not cache.try_lease("prices", "ethereum", seconds=30)
+    finally:
+        fcntl.flock(other._fd, fcntl.LOCK_UN)
+    assert cache.lock_busy == 2
+    assert cache.put("prices", "ethereum", {"usd": 3000.0})
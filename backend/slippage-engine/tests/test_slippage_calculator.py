@@ -0,0 +1,113 @@
+# backend/slippage-engine/tests/test_slippage_calculator.py
+
+import asyncio
+import dataclasses
+import random
+import time
+
+import pytest
+
+from app.services.fail_chance import FailChanceModel
+from app.services.reserve_cache import PoolReserves
+from app.services.rule_engine import DEFAULT_RULES_PATH, RuleEngine
+from app.services.slippage_calculator import SlippageCalculator
+
+PEPE = "0x6982508145454Ce325dDbE47a25d4ec3d2311933"
+SHIB = "0x95aD61b0a150d79219dCF64E1E6Cc01f0B64C4cE"
+
+# Values on and around the rule table's breakpoints, plus a few in between
+BOT = [0, 0.2, 0.4, 0.41, 0.7, 0.71, 0.95]
+GAS = [0, 30, 75, 76, 100, 101, 180]
+LIQUIDITY = [0, 99_999, 100_000, 100_001, 499_999, 500_000, 1e6, 1e6 + 1, 1e7, 1e7 + 1, 3e7]
+
+
+@pytest.fixture(scope="module")
+def calculator():
+    rules = RuleEngine(path=DEFAULT_RULES_PATH)
+    # One override, so the batch has to split items by rule table
+    table = rules.table()["rules"]
+    rules.apply({**table, "pairs": {"SHIB": {"clamp": {"max": 0.05}, "adjustments": {"sandwich_max": 0.01}}}})
+    return SlippageCalculator(rules=rules, fail_chance=FailChanceModel(samples=2000))
+
+
+def random_items(n, seed):
+    rng = random.Random(seed)
+    items = []
+    for _ in range(n):
+        stats = {
+            "bot_activity_score": rng.choice(BOT + [rng.random()]),
+            "sandwiches_5min": rng.randint(0, 8),
+            "avg_gas_gwei": rng.choice(GAS + [rng.uniform(0, 200)]),
+            "transactions_5min": rng.randint(0, 200),
+        }
+        liquidity = rng.choice(LIQUIDITY + [rng.uniform(0, 2e7)])
+        items.append((stats, liquidity))
+    return items
+
+
+def as_dicts(recommendations):
+    return [dataclasses.asdict(r) for r in recommendations]
+
+
+async def singles(calculator, items, **kwargs):
+    return [await calculator.calculate("ETH", PEPE, stats, liquidity, 2500, **kwargs) for stats, liquidity in items]
+
+
+@pytest.mark.parametrize("detailed", [True, False])
+def test_batch_matches_single_calls(calculator, detailed):
+    items = random_items(300, seed=7)
+    expected = asyncio.run(singles(calculator, items, detailed=detailed))
+    batch = asyncio.run(calculator.calculate_batch(
+        [s for s, _ in items], [l for _, l in items], 2500, pairs=[PEPE] * len(items), detailed=detailed
+    ))
+    assert as_dicts(batch) == as_dicts(expected)
+
+
+def test_batch_matches_single_calls_per_item_trade(calculator):
+    now = time.time()
+    reserves = {
+        PEPE: PoolReserves("0xpepe", PEPE.lower(), 4.2e11, 1000.0, 5e6, now),
+        SHIB: PoolReserves("0xshib", SHIB.lower(), 9e10, 300.0, 1.5e6, now),
+    }
+    stats = {"bot_activity_score": 0.45, "sandwiches_5min": 6, "avg_gas_gwei": 90, "transactions_5min": 40}
+    cases = [
+        # token_in, token_out, amount, reserves, input sources
+        ("ETH", PEPE, 10_000, reserves[PEPE], {"pair_stats": "live"}),
+        ("USDC", PEPE, 250_000, reserves[PEPE], {"pair_stats": "cached"}),
+        ("PEPE", "ETH", 10_000, reserves[PEPE], {}),
+        ("ETH", SHIB, 10_000, reserves[SHIB], {"liquidity": "default"}),
+        ("ETH", SHIB, None, None, {}),
+        ("ETH", PEPE, 5_000, None, {}),
+    ]
+    liquidity = [5e6, 5e6, 5e6, 1.5e6, 1.5e6, 80_000]
+
+    async def run():
+        singles = [
+            await calculator.calculate(
+                token_in, token_out, stats, liq, 2500,
+                input_sources=sources, amount_usd=amount, reserves=res
+            )
+            for (token_in, token_out, amount, res, sources), liq in zip(cases, liquidity)
+        ]
+        batch = await calculator.calculate_batch(
+            [stats] * len(cases), liquidity, 2500,
+            input_sources=[sources for *_, sources in cases],
+            # Rule overrides are looked up by token_out, as the router does for both paths
+            pairs=[token_out for _, token_out, *_ in cases],
+            tokens_in=[token_in for token_in, *_ in cases],
+            amounts_usd=[amount for _, _, amount, *_ in cases],
+            reserves=[res for _, _, _, res, _ in cases],
+        )
+        return singles, batch
+
+    expected, batch = asyncio.run(run())
+    assert as_dicts(batch) == as_dicts(expected)
+    # The SHIB items used the override's higher sandwich cap
+    default = SlippageCalculator(rules=RuleEngine(path=DEFAULT_RULES_PATH), fail_chance=calculator.fail_chance)
+    token_in, token_out, amount, res, sources = cases[3]
+    unchanged = asyncio.run(default.calculate(token_in, token_out, stats, liquidity[3], 2500, amount_usd=amount, reserves=res))
+    assert batch[3].recommended_slippage == pytest.approx(unchanged.recommended_slippage + 0.003)
+
+
+def test_empty_batch(calculator):
+    assert asyncio.run(calculator.calculate_batch([], [], 2500)) == []
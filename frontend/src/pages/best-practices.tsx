@@ -19,6 +19,7 @@ export default function BestPractices() {
   ]);
   const [inputValue, setInputValue] = useState('');
   const [isTyping, setIsTyping] = useState(false);
+  const [isStreaming, setIsStreaming] = useState(false);
   const messagesEndRef = useRef<HTMLDivElement>(null);
 
   const scrollToBottom = () => {
@@ -29,25 +30,73 @@ export default function BestPractices() {
     scrollToBottom();
   }, [messages, isTyping]);
 
-  const callBackendAPI = async (prompt: string): Promise<string> => {
+  // Reads the /api/chat/stream SSE response: the `offline` answer renders at once,
+  // `token` events replace it with the LLM answer as it is generated, `done` settles the final text
+  const streamBackendAPI = async (prompt: string, onText: (text: string) => void): Promise<void> => {
+    const failure = "SYSTEM FAILURE: Unable to connect to neural core. Ensure backend logic is active.";
+    let received = false;
     try {
-      const response = await fetch('http://localhost:8000/api/chat/', {
+      const response = await fetch('http://localhost:8000/api/chat/stream', {
         method: 'POST',
         headers: {
           'Content-Type': 'application/json',
+          'Accept': 'text/event-stream',
         },
         body: JSON.stringify({ message: prompt }),
       });
 
-      if (!response.ok) {
+      if (!response.ok || !response.body) {
         throw new Error(`Server error: ${response.status}`);
       }
 
-      const data = await response.json();
-      return data.content; // The backend returns { role: "assistant", content: "..." }
+      const reader = response.body.getReader();
+      const decoder = new TextDecoder();
+      let buffer = '';
+      let llmText = '';
+
+      const handleEvent = (block: string) => {
+        let event = 'message';
+        let data = '';
+        for (const line of block.split('\n')) {
+          if (line.startsWith('event:')) event = line.slice(6).trim();
+          else if (line.startsWith('data:')) data += line.slice(5).trim();
+        }
+        if (!data) return;
+        const { content } = JSON.parse(data);
+
+        if (event === 'offline') {
+          onText(content);
+        } else if (event === 'token') {
+          llmText += content;
+          onText(llmText);
+        } else if (event === 'done') {
+          onText(content);
+        } else {
+          return;
+        }
+        received = true;
+      };
+
+      while (true) {
+        const { value, done } = await reader.read();
+        if (done) break;
+        buffer += decoder.decode(value, { stream: true });
+
+        let boundary = buffer.indexOf('\n\n');
+        while (boundary !== -1) {
+          handleEvent(buffer.slice(0, boundary));
+          buffer = buffer.slice(boundary + 2);
+          boundary = buffer.indexOf('\n\n');
+        }
+      }
+
     } catch (error) {
       console.error("Chat API Error:", error);
-      return "SYSTEM FAILURE: Unable to connect to neural core. Ensure backend logic is active.";
+    }
+
+    // Keep whatever arrived before a dropped connection; only an empty answer becomes the failure notice
+    if (!received) {
+      onText(failure);
     }
   };
 
@@ -65,19 +114,28 @@ export default function BestPractices() {
     setMessages((prev) => [...prev, newUserMessage]);
     setInputValue('');
     setIsTyping(true);
+    setIsStreaming(true);
+
+    // Stream from Local Python Backend; the bot message appears with the first event and updates in place
+    const botMessageId = (Date.now() + 1).toString();
+    await streamBackendAPI(newUserMessage.text, (text) => {
+      setIsTyping(false);
+      setMessages((prev) => {
+        if (!prev.some((message) => message.id === botMessageId)) {
+          const newBotMessage: Message = {
+            id: botMessageId,
+            text,
+            sender: 'bot',
+            timestamp: new Date(),
+          };
+          return [...prev, newBotMessage];
+        }
+        return prev.map((message) => (message.id === botMessageId ? { ...message, text } : message));
+      });
+    });
 
-    // Call Local Python Backend
-    const responseText = await callBackendAPI(newUserMessage.text);
-
-    const newBotMessage: Message = {
-      id: (Date.now() + 1).toString(),
-      text: responseText,
-      sender: 'bot',
-      timestamp: new Date(),
-    };
-
-    setMessages((prev) => [...prev, newBotMessage]);
     setIsTyping(false);
+    setIsStreaming(false);
   };
 
   return (
@@ -172,7 +230,7 @@ export default function BestPractices() {
               />
               <button
                 type="submit"
-                disabled={!inputValue.trim() || isTyping}
+                disabled={!inputValue.trim() || isTyping || isStreaming}
                 className="px-6 py-4 text-xs font-bold bg-emerald-900/20 text-emerald-500 hover:bg-emerald-500 hover:text-black disabled:opacity-30 disabled:hover:bg-transparent disabled:hover:text-emerald-500 transition-all duration-200 border-l border-emerald-900/30 uppercase tracking-widest"
               >
                 SEND